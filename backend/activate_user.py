@@ -1,5 +1,5 @@
 from app import create_app, mongo
-from app.models import User
+from app.models import User, touch
 from bson import ObjectId
 
 app = create_app()
@@ -11,7 +11,7 @@ def activate_user(email):
             # Update role and ensure no blocking fields exist
             mongo.db.users.update_one(
                 {"email": email},
-                {"$set": {"role": "admin", "is_active": True}}
+                {"$set": touch({"role": "admin", "is_active": True})}
             )
             print(f"✅ User {email} has been activated and promoted to ADMIN.")
         else:
@@ -1,25 +1,28 @@
 from flask import Flask
 from flask_cors import CORS
 from flask_pymongo import PyMongo
-from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 from flask_socketio import SocketIO
 from werkzeug.middleware.proxy_fix import ProxyFix
 from config import Config
+from app import fastjson
 import os
 
 mongo = PyMongo()
-bcrypt = Bcrypt()
+# Read-only client for public spectator routes (see app.spectator)
+spectator_mongo = PyMongo()
 jwt = JWTManager()
-socketio = SocketIO(cors_allowed_origins="*")
+socketio = SocketIO(cors_allowed_origins="*", json=fastjson)
 
 # Global scheduler reference
 scheduler = None
 
-def create_app(config_class=Config):
+def create_app(config_class=Config, background_services=True):
+    """Build the app. One-off scripts pass background_services=False to skip the scheduler and event bus."""
     global scheduler
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.json = fastjson.FastJSONProvider(app)
 
     # Trust reverse proxy headers (Railway load balancer)
     app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_prefix=1)
@@ -46,15 +49,24 @@ def create_app(config_class=Config):
     print(f"📢 [DIAGNOSTIC] App starting. MONGO_URI = {masked_uri}")
     
     mongo.init_app(app)
-    bcrypt.init_app(app)
+    from app.spectator import init_spectator_reads
+    init_spectator_reads(app, spectator_mongo)
     jwt.init_app(app)
     socketio.init_app(app)
+    from app.compression import init_compression
+    init_compression(app)
 
     # Verify DB connection
     with app.app_context():
         try:
             mongo.db.command('ping')
             print("✅ MongoDB connected successfully!")
+
+            from app.indexes import ensure_indexes
+            ensure_indexes(mongo.db)
+
+            from app.migrations import run_migrations
+            run_migrations(mongo)
             
             # Automatic Admin Bootstrap if admin@example.com doesn't exist
             from app.models import User
@@ -75,7 +87,7 @@ def create_app(config_class=Config):
             print(f"   Using URI: {app.config['MONGO_URI']}")
         
         # Start scheduler (only in main process, not reloader)
-        if os.environ.get('WERKZEUG_RUN_MAIN') == 'true' or not app.debug:
+        if background_services and (os.environ.get('WERKZEUG_RUN_MAIN') == 'true' or not app.debug):
             from app.scheduler import create_scheduler
             scheduler = create_scheduler(mongo)
             scheduler.start()
@@ -90,4 +102,8 @@ def create_app(config_class=Config):
     # Import events to register them with socketio
     from app import events
 
+    if background_services and config_class.EVENT_BUS_ENABLED:
+        from app.event_bus import start_event_bus
+        start_event_bus(mongo)
+
     return app
@@ -0,0 +1,210 @@
+"""
+Columnar store of a tournament's finalized games for the analytics endpoints.
+
+Standings, the sudden death tie check, the daily backup report and player
+history all reduce the same finalized games. Each process keeps, per
+tournament, one row per finalized game (day, round, court, scores) and one
+row per player appearance (game row, player index, own and opponent score),
+held as NumPy arrays, so those reductions are bincounts instead of Python
+loops over game dicts.
+
+The store follows the tournament's change_version. When it moves, only games
+stamped (updated_at) or deleted (tombstones) since the last sync are fetched.
+A restore stamps restored_at on the tournament, which forces a full reload
+because restored games keep their original updated_at. Syncs always read
+from the primary, so a lagging spectator secondary cannot leave games out,
+and a snapshot never moves back to an older change_version.
+"""
+import threading
+from datetime import datetime, timedelta
+import numpy as np
+from app.cache import named_cache
+from app.spectator import primary
+
+# Re-read writes this far behind the last sync, covering clock skew between
+# workers and writes that were in flight while the previous sync ran.
+SYNC_OVERLAP = timedelta(seconds=5)
+
+GAME_FIELDS = {
+    "status": 1, "team1_player_ids": 1, "team2_player_ids": 1, "score1": 1, "score2": 1,
+    "day_index": 1, "round_number": 1, "court": 1
+}
+
+
+class GameColumns:
+    """An immutable snapshot of a tournament's finalized games.
+
+    Games are ordered by (day, round, _id). Appearances are grouped by game,
+    with game i's players at offsets[i]:offsets[i + 1]; players are integer
+    indexes into player_ids.
+    """
+
+    def __init__(self, records, player_ids):
+        self.player_ids = player_ids
+        self.n_players = len(player_ids)
+        records = sorted(records, key=lambda r: (r[1], r[2], r[0]))
+        self.game_ids = [r[0] for r in records]
+        self.day = np.fromiter((r[1] for r in records), np.int32, len(records))
+        self.round = np.fromiter((r[2] for r in records), np.int32, len(records))
+        self.court = [r[3] for r in records]
+        self.score1 = np.fromiter((r[4] for r in records), np.int32, len(records))
+        self.score2 = np.fromiter((r[5] for r in records), np.int32, len(records))
+        team1 = [r[6] for r in records]
+        team2 = [r[7] for r in records]
+
+        sizes = np.fromiter((len(a) + len(b) for a, b in zip(team1, team2)), np.int64, len(records))
+        self.offsets = np.concatenate(([0], np.cumsum(sizes)))
+        self.app_game = np.repeat(np.arange(len(records)), sizes)
+        self.app_player = np.fromiter(
+            (p for a, b in zip(team1, team2) for p in a + b), np.int32, int(self.offsets[-1])
+        )
+        team1_sizes = np.fromiter((len(a) for a in team1), np.int64, len(records))
+        # Appearance position within its game decides the side: team1 players come first
+        position = np.arange(len(self.app_game)) - self.offsets[:-1][self.app_game]
+        self.app_team1 = position < team1_sizes[self.app_game]
+        self.app_own = np.where(self.app_team1, self.score1[self.app_game], self.score2[self.app_game])
+        self.app_opp = np.where(self.app_team1, self.score2[self.app_game], self.score1[self.app_game])
+        self.app_day = self.day[self.app_game]
+        self.n_days = int(self.day.max()) + 1 if len(records) else 0
+
+    def _sum(self, weights, mask=None):
+        players = self.app_player if mask is None else self.app_player[mask]
+        weights = weights if mask is None else weights[mask]
+        return np.bincount(players, weights=weights, minlength=self.n_players).astype(np.int64)
+
+    def player_totals(self, day_index=None):
+        """Per-player games_played, wins, total_points and margin arrays, optionally for one day."""
+        mask = None if day_index is None else self.app_day == day_index
+        ones = np.ones(len(self.app_player), np.int64)
+        return {
+            "games_played": self._sum(ones, mask),
+            "wins": self._sum((self.app_own > self.app_opp).astype(np.int64), mask),
+            "total_points": self._sum(self.app_own.astype(np.int64), mask),
+            "margin": self._sum((self.app_own - self.app_opp).astype(np.int64), mask),
+        }
+
+    def daily_totals(self):
+        """player_totals broken down by day: each array is shaped (players, days)."""
+        cell = self.app_player.astype(np.int64) * max(self.n_days, 1) + self.app_day
+        size = self.n_players * max(self.n_days, 1)
+
+        def by_day(weights):
+            return np.bincount(cell, weights=weights, minlength=size).astype(np.int64).reshape(
+                self.n_players, max(self.n_days, 1)
+            )
+
+        return {
+            "games_played": by_day(None),
+            "wins": by_day((self.app_own > self.app_opp).astype(np.int64)),
+            "total_points": by_day(self.app_own.astype(np.int64)),
+            "margin": by_day((self.app_own - self.app_opp).astype(np.int64)),
+        }
+
+    def day_results(self, day_index):
+        """{(user_id, round_number): (own, opp)} for the day; a player's first game wins per round."""
+        results = {}
+        for i in np.flatnonzero(self.app_day == day_index).tolist():
+            key = (self.player_ids[self.app_player[i]], int(self.round[self.app_game[i]]))
+            results.setdefault(key, (int(self.app_own[i]), int(self.app_opp[i])))
+        return results
+
+    def player_games(self, user_id):
+        """The player's games in order, each with partner and opponent ids and both scores."""
+        try:
+            index = self.player_ids.index(user_id)
+        except ValueError:
+            return []
+        games = []
+        for i in np.flatnonzero(self.app_player == index).tolist():
+            g = int(self.app_game[i])
+            start, end = int(self.offsets[g]), int(self.offsets[g + 1])
+            same_side = self.app_team1[start:end] == self.app_team1[i]
+            players = [self.player_ids[p] for p in self.app_player[start:end].tolist()]
+            games.append({
+                "game_id": self.game_ids[g],
+                "day_index": int(self.day[g]),
+                "round_number": int(self.round[g]),
+                "court": self.court[g],
+                "partner_ids": [p for p, same in zip(players, same_side) if same and p != user_id],
+                "opponent_ids": [p for p, same in zip(players, same_side) if not same],
+                "player_score": int(self.app_own[i]),
+                "opponent_score": int(self.app_opp[i]),
+            })
+        return games
+
+
+class GameStore:
+    """The mutable per-tournament record set behind GameColumns snapshots."""
+
+    def __init__(self, tournament_id):
+        self.tournament_id = tournament_id
+        self.records = {}  # game _id -> (id, day, round, court, score1, score2, team1 idx, team2 idx)
+        self.player_ids = []
+        self.player_index = {}
+        self.version = None
+        self.restored_at = None
+        self.synced_at = None
+        self.columns = None
+        self.lock = threading.Lock()
+
+    def _player(self, user_id):
+        user_id = str(user_id)
+        index = self.player_index.get(user_id)
+        if index is None:
+            index = self.player_index[user_id] = len(self.player_ids)
+            self.player_ids.append(user_id)
+        return index
+
+    def _apply(self, doc):
+        if doc.get('status') != 'finalized':
+            self.records.pop(doc['_id'], None)
+            return
+        self.records[doc['_id']] = (
+            str(doc['_id']),
+            doc.get('day_index', 0) or 0,
+            doc.get('round_number', 0) or 0,
+            doc.get('court'),
+            int(doc.get('score1', 0) or 0),
+            int(doc.get('score2', 0) or 0),
+            [self._player(pid) for pid in doc.get('team1_player_ids', [])],
+            [self._player(pid) for pid in doc.get('team2_player_ids', [])],
+        )
+
+    def sync(self, mongo, tournament):
+        """Bring the store up to the tournament's change_version and return a snapshot."""
+        with self.lock:
+            version = getattr(tournament, 'change_version', None)
+            restored_at = getattr(tournament, 'restored_at', None)
+            if self.columns is not None and restored_at == self.restored_at and (
+                version == self.version or (version is not None and version < self.version)
+            ):
+                # Unchanged, or the caller read an older copy of the tournament (e.g. from a secondary)
+                return self.columns
+
+            started = datetime.utcnow()
+            query = {"tournament_id": self.tournament_id}
+            if self.synced_at is None or restored_at != self.restored_at:
+                self.records = {}
+                query["status"] = "finalized"
+            else:
+                since = self.synced_at - SYNC_OVERLAP
+                query["updated_at"] = {"$gte": since}
+                for tombstone in mongo.db.deletions.find(
+                    {"collection": "games", "deleted_at": {"$gte": since}}, {"doc_id": 1}
+                ):
+                    self.records.pop(tombstone['doc_id'], None)
+            for doc in mongo.db.games.find(query, GAME_FIELDS):
+                self._apply(doc)
+
+            self.columns = GameColumns(list(self.records.values()), list(self.player_ids))
+            self.version = version
+            self.restored_at = restored_at
+            self.synced_at = started
+            return self.columns
+
+
+def game_columns(mongo, tournament):
+    """The tournament's finalized games as a GameColumns snapshot, synced to its change_version."""
+    tournament_id = str(tournament._id)
+    store = named_cache('game_columns').get_or_compute(tournament_id, lambda: GameStore(tournament_id))
+    return store.sync(primary(mongo), tournament)
@@ -0,0 +1,623 @@
+"""
+Full-database backup export and import helpers.
+
+Backups are produced as a stream so the server never holds the whole
+database (or its JSON encoding) in memory at once:
+- json: the original single-document layout {"meta": ..., "collections": {...}}
+- ndjson: one meta line, then per collection a {"collection": ...} header line
+  followed by one {"collection": ..., "doc": ...} line per document
+- bson: a tar of gzipped raw BSON per collection in mongodump's directory
+  layout, lossless for ObjectIds and datetimes and much smaller than JSON
+The JSON formats can optionally be gzip-compressed on the fly.
+
+Incremental backups (meta.kind == 'incremental') carry only documents whose
+updated_at is at or after meta.since, plus the ids deleted since then
+(recorded as tombstones in the deletions collection).
+
+Restores parse the upload incrementally and load it through staging
+collections, so a bad or interrupted restore never empties the live data.
+"""
+import codecs
+import gzip
+import io
+import json
+import tarfile
+import tempfile
+import time
+import zlib
+from datetime import datetime
+from bson import ObjectId, decode_file_iter, json_util
+from bson.codec_options import CodecOptions
+from bson.errors import InvalidBSON
+from bson.raw_bson import RawBSONDocument
+from pymongo import DeleteOne, ReplaceOne
+from app import fastjson
+from app.models import Game
+
+BACKUP_SOURCE = 'bags_brats_db_backup'
+BACKUP_VERSION = '1.1'
+BACKUP_COLLECTIONS = ['users', 'tournaments', 'games', 'teams']
+BACKUP_FORMATS = ('json', 'ndjson', 'bson')
+BSON_META_MEMBER = 'bags_brats_meta.json'
+# Fields the models store as datetimes; JSON backups carry them as ISO strings
+DATETIME_FIELDS = ('created_at', 'checked_in_at', 'completed_at', 'restored_at', 'start_time', 'end_time')
+
+
+def _dump(value):
+    # ObjectIds become hex strings and datetimes ISO 8601 with a Z suffix (see _restore_datetimes)
+    return fastjson.dumps(value)
+
+
+def build_meta(created_by, since=None):
+    now = datetime.utcnow()
+    # MongoDB keeps datetimes to the millisecond. Flooring means a write later in this
+    # millisecond (stored with an updated_at below a microsecond marker) is still in the next incremental.
+    now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+    meta = {
+        "version": BACKUP_VERSION,
+        "created_at": now.isoformat(),
+        "created_by": created_by,
+        "source": BACKUP_SOURCE,
+        "kind": "incremental" if since else "full"
+    }
+    if since:
+        meta["since"] = since.isoformat()
+    return meta
+
+
+def _since(meta):
+    return datetime.fromisoformat(meta['since']) if meta.get('since') else None
+
+
+def iter_collection(mongo, name, batch_size, since=None):
+    """Yield documents of a collection, fetched in cursor batches.
+
+    With since, only documents created or modified at or after it are returned.
+    """
+    query = {"updated_at": {"$gte": since}} if since else {}
+    cursor = mongo.db[name].find(query).batch_size(batch_size)
+    try:
+        for doc in cursor:
+            yield doc
+    finally:
+        cursor.close()
+
+
+def iter_deleted_ids(mongo, name, since, batch_size):
+    """Yield ids of documents deleted from a collection at or after since."""
+    cursor = mongo.db.deletions.find(
+        {"collection": name, "deleted_at": {"$gte": since}}, {"doc_id": 1}
+    ).batch_size(batch_size)
+    try:
+        for tombstone in cursor:
+            yield str(tombstone['doc_id'])
+    finally:
+        cursor.close()
+
+
+def iter_backup_json(mongo, meta, batch_size):
+    """Yield the backup as chunks of a single JSON document (restore-compatible)."""
+    since = _since(meta)
+    yield '{"meta":' + _dump(meta) + ',"collections":{'
+    for i, name in enumerate(BACKUP_COLLECTIONS):
+        yield ('' if i == 0 else '],') + _dump(name) + ':[\n'
+        first = True
+        for doc in iter_collection(mongo, name, batch_size, since):
+            yield ('' if first else ',\n') + _dump(doc)
+            first = False
+    yield ']}'
+    if since:
+        yield ',"deleted":{'
+        for i, name in enumerate(BACKUP_COLLECTIONS):
+            yield ('' if i == 0 else '],') + _dump(name) + ':['
+            yield ','.join(_dump(_id) for _id in iter_deleted_ids(mongo, name, since, batch_size))
+        yield ']}'
+    yield '}\n'
+
+
+def iter_backup_ndjson(mongo, meta, batch_size):
+    """Yield the backup as newline-delimited JSON records."""
+    since = _since(meta)
+    yield _dump({"meta": meta}) + '\n'
+    for name in BACKUP_COLLECTIONS:
+        # Header line so empty collections are still restored (as empty)
+        yield _dump({"collection": name}) + '\n'
+        for doc in iter_collection(mongo, name, batch_size, since):
+            yield _dump({"collection": name, "doc": doc}) + '\n'
+        if since:
+            for _id in iter_deleted_ids(mongo, name, since, batch_size):
+                yield _dump({"deleted": name, "_id": _id}) + '\n'
+
+
+def iter_gzip(chunks, level=6, flush_bytes=64 * 1024):
+    """Gzip-compress a stream of text chunks, emitting compressed blocks as they fill."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    pending = []
+    pending_size = 0
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            pending.append(data)
+            pending_size += len(data)
+        if pending_size >= flush_bytes:
+            yield b''.join(pending)
+            pending = []
+            pending_size = 0
+    pending.append(compressor.flush())
+    yield b''.join(pending)
+
+
+def iter_encoded(chunks, flush_bytes=64 * 1024):
+    """UTF-8 encode a stream of text chunks, coalescing small pieces into larger writes."""
+    pending = []
+    pending_size = 0
+    for chunk in chunks:
+        data = chunk.encode('utf-8')
+        pending.append(data)
+        pending_size += len(data)
+        if pending_size >= flush_bytes:
+            yield b''.join(pending)
+            pending = []
+            pending_size = 0
+    if pending:
+        yield b''.join(pending)
+
+
+class _ChunkSink:
+    """File-like sink that collects written bytes until drained."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _add_tar_member(tar, name, fileobj, size):
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mtime = int(time.time())
+    tar.addfile(info, fileobj)
+
+
+def iter_backup_bson(mongo, meta, batch_size, spool_bytes=16 * 1024 * 1024):
+    """Yield a tar archive laid out like a gzipped mongodump directory.
+
+    Members are dump/<db>/<collection>.bson.gz and .metadata.json.gz, so the
+    extracted archive restores with `mongorestore --gzip --dir dump`. Documents
+    are copied as RawBSONDocument bytes, skipping any decode/encode and keeping
+    ObjectIds and datetimes intact. bags_brats_meta.json carries the backup meta.
+    """
+    raw_options = CodecOptions(document_class=RawBSONDocument)
+    db_name = mongo.db.name
+    sink = _ChunkSink()
+    with tarfile.open(fileobj=sink, mode='w|') as tar:
+        meta_bytes = json.dumps(dict(meta, format='bson'), indent=2).encode('utf-8')
+        _add_tar_member(tar, BSON_META_MEMBER, io.BytesIO(meta_bytes), len(meta_bytes))
+        yield sink.drain()
+
+        for name in BACKUP_COLLECTIONS:
+            collection = mongo.db.get_collection(name, codec_options=raw_options)
+            # Spool each compressed collection so its size is known for the tar header
+            with tempfile.SpooledTemporaryFile(max_size=spool_bytes) as spool:
+                with gzip.GzipFile(fileobj=spool, mode='wb') as gz:
+                    cursor = collection.find().batch_size(batch_size)
+                    try:
+                        for doc in cursor:
+                            gz.write(doc.raw)
+                    finally:
+                        cursor.close()
+                size = spool.tell()
+                spool.seek(0)
+                _add_tar_member(tar, f"dump/{db_name}/{name}.bson.gz", spool, size)
+            yield sink.drain()
+
+            indexes = json_util.dumps({
+                "collectionName": name,
+                "type": "collection",
+                "indexes": list(mongo.db[name].list_indexes())
+            }).encode('utf-8')
+            metadata = gzip.compress(indexes)
+            _add_tar_member(tar, f"dump/{db_name}/{name}.metadata.json.gz", io.BytesIO(metadata), len(metadata))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def stream_backup(mongo, meta, fmt='json', compress=False, batch_size=500):
+    """Return (byte chunk generator, mimetype, file extension) for a backup download."""
+    if fmt == 'bson':
+        # Archive members are already gzip-compressed
+        return iter_backup_bson(mongo, meta, batch_size), 'application/x-tar', 'tar'
+    if fmt == 'ndjson':
+        chunks = iter_backup_ndjson(mongo, meta, batch_size)
+        mimetype, ext = 'application/x-ndjson', 'ndjson'
+    else:
+        chunks = iter_backup_json(mongo, meta, batch_size)
+        mimetype, ext = 'application/json', 'json'
+
+    if compress:
+        return iter_gzip(chunks), 'application/gzip', ext + '.gz'
+    return iter_encoded(chunks), mimetype, ext
+
+
+class _JsonStreamReader:
+    """Minimal incremental reader over a JSON text stream.
+
+    Only the structural characters of the backup layout are walked by hand;
+    every value (meta, documents) is decoded with json's raw_decode once it
+    is fully buffered, so memory stays bounded by the largest single value.
+    """
+
+    def __init__(self, stream, chunk_size=64 * 1024):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        if self.eof:
+            return False
+        data = self.stream.read(self.chunk_size)
+        if not data:
+            self.eof = True
+            self.buf = self.buf[self.pos:] + self.text_decoder.decode(b'', final=True)
+        else:
+            self.buf = self.buf[self.pos:] + self.text_decoder.decode(data)
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                raise ValueError("Invalid backup file: unexpected end of file")
+
+    def expect(self, chars):
+        char = self.peek()
+        if char not in chars:
+            raise ValueError(f"Invalid backup file: expected one of {chars!r}, found {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                if self._fill():
+                    continue
+                raise ValueError(f"Invalid backup file: {str(e)}")
+            # A number or literal ending exactly at the buffer edge may be truncated
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_json_groups(reader):
+    """Walk a {"name": [value, ...], ...} object, yielding (name, None) per group then (name, value)."""
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.expect('}')
+        return
+    while True:
+        name = reader.value()
+        reader.expect(':')
+        reader.expect('[')
+        yield name, None
+        if reader.peek() != ']':
+            while True:
+                yield name, reader.value()
+                if reader.expect(',]') == ']':
+                    break
+        else:
+            reader.expect(']')
+        if reader.expect(',}') == '}':
+            break
+
+
+def _iter_json_records(stream):
+    reader = _JsonStreamReader(stream)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        if key == 'meta':
+            yield ('meta', reader.value())
+        elif key == 'collections':
+            for name, doc in _iter_json_groups(reader):
+                yield ('collection', name) if doc is None else ('doc', name, doc)
+        elif key == 'deleted':
+            for name, _id in _iter_json_groups(reader):
+                if _id is not None:
+                    yield ('deleted', name, _id)
+        else:
+            reader.value()
+        if reader.expect(',}') == '}':
+            break
+
+
+def _iter_ndjson_records(stream):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid backup file: {str(e)}")
+        if 'meta' in record:
+            yield ('meta', record['meta'])
+        elif 'deleted' in record:
+            yield ('deleted', record['deleted'], record.get('_id'))
+        elif 'collection' in record:
+            if 'doc' in record:
+                yield ('doc', record['collection'], record['doc'])
+            else:
+                yield ('collection', record['collection'])
+
+
+def _iter_bson_records(stream):
+    raw_options = CodecOptions(document_class=RawBSONDocument)
+    with tarfile.open(fileobj=stream, mode='r|') as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+            basename = member.name.rsplit('/', 1)[-1]
+            if basename == BSON_META_MEMBER:
+                yield ('meta', json.loads(tar.extractfile(member).read().decode('utf-8')))
+                continue
+            if basename.endswith('.bson.gz'):
+                name = basename[:-len('.bson.gz')]
+                data = gzip.GzipFile(fileobj=tar.extractfile(member))
+            elif basename.endswith('.bson'):
+                name = basename[:-len('.bson')]
+                data = tar.extractfile(member)
+            else:
+                continue
+            yield ('collection', name)
+            for doc in decode_file_iter(data, codec_options=raw_options):
+                yield ('doc', name, doc)
+
+
+def iter_backup_records(file_storage):
+    """Incrementally parse an uploaded backup (.json, .ndjson, optionally .gz, or a BSON .tar).
+
+    Yields ('meta', meta), ('collection', name), ('doc', name, doc) and, for
+    incremental backups, ('deleted', name, _id) records.
+    Raises ValueError with a user-facing message if the file cannot be parsed.
+    """
+    filename = file_storage.filename or ''
+    stream = file_storage.stream
+    if filename.endswith('.tar'):
+        records = _iter_bson_records(stream)
+        try:
+            yield from records
+        except (tarfile.TarError, InvalidBSON, OSError, EOFError, json.JSONDecodeError) as e:
+            raise ValueError(f"Invalid backup archive: {str(e)}")
+        return
+    if filename.endswith('.gz'):
+        stream = gzip.GzipFile(fileobj=stream)
+        filename = filename[:-3]
+
+    records = _iter_ndjson_records(stream) if filename.endswith('.ndjson') else _iter_json_records(stream)
+    try:
+        yield from records
+    except (OSError, EOFError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid backup file: {str(e)}")
+
+
+def staging_name(name):
+    return f"_restore_{name}"
+
+
+def _drop_staging(mongo):
+    for name in BACKUP_COLLECTIONS:
+        mongo.db.drop_collection(staging_name(name))
+
+
+def _restore_id(doc):
+    """Turn the serialized _id back into an ObjectId (string ids from JSON backups)."""
+    _id = doc.get('_id')
+    if isinstance(_id, str) and ObjectId.is_valid(_id):
+        doc['_id'] = ObjectId(_id)
+    elif _id is None:
+        doc.pop('_id', None)
+    return doc
+
+
+def _restore_doc(doc, restored_at):
+    """Rebuild types lost to JSON; raw BSON documents are inserted untouched."""
+    if isinstance(doc, RawBSONDocument):
+        return doc
+    return _restore_datetimes(_restore_id(doc), restored_at)
+
+
+def _restore_datetimes(doc, restored_at):
+    """Turn ISO strings in DATETIME_FIELDS and updated_at back into datetimes.
+
+    updated_at must be a real datetime so later incremental backups can
+    range-query it; documents without a usable one get restored_at.
+    """
+    for field in DATETIME_FIELDS:
+        value = doc.get(field)
+        if isinstance(value, str):
+            doc[field] = Game.parse_time(value) or value
+    updated_at = Game.parse_time(doc.get('updated_at'))
+    doc['updated_at'] = updated_at if isinstance(updated_at, datetime) else restored_at
+    return doc
+
+
+def _check_meta(meta, previous):
+    """Validate a backup's meta against the previously applied backup in a chain."""
+    if meta.get('source') != BACKUP_SOURCE:
+        raise ValueError("Invalid backup format: not a Bags & Brats backup file")
+    kind = meta.get('kind', 'full')
+    if previous is None:
+        if kind != 'full':
+            raise ValueError("Incremental backups must be restored on top of a full backup")
+        return
+    if kind != 'incremental':
+        raise ValueError("Only incremental backups can follow the full backup in a restore chain")
+    try:
+        since = datetime.fromisoformat(meta['since'])
+        previous_created = datetime.fromisoformat(previous['created_at'])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("Invalid incremental backup: missing or invalid 'since' marker")
+    if since > previous_created:
+        raise ValueError(
+            f"Incremental backup since {meta['since']} does not follow the backup "
+            f"created at {previous['created_at']} (gap in the chain)"
+        )
+
+
+def restore_backup(mongo, chain, preserve_user_id, batch_size=500):
+    """Restore a full backup, plus any incremental backups, through staging collections.
+
+    chain is a list of record iterators (see iter_backup_records): a full
+    backup first, then incremental backups in the order they were taken.
+    The full backup is inserted into _restore_<name> collections in bounded
+    unordered batches; each increment is then replayed onto the staging
+    collections (upserting changed documents, removing deleted ones). Indexes
+    are built on the staging collections, and only once every file has been
+    read and validated is each staging collection renamed over its live
+    counterpart. A failure at any earlier point leaves the live collections
+    untouched. The preserved user's live document always replaces whatever
+    the backups hold for that account.
+
+    Returns (meta of the last applied backup, stats). Raises ValueError for
+    invalid backups or chains.
+    """
+    from app.indexes import ensure_indexes
+    from app.models import Team
+
+    preserve_id = ObjectId(preserve_user_id)
+    restored_at = datetime.utcnow()
+    previous = None
+    meta = {}
+    stats = {}
+    staged = []
+    buffers = {}
+
+    def flush(name):
+        ops = buffers.get(name)
+        if not ops:
+            return
+        if previous is None:
+            mongo.db[staging_name(name)].insert_many(ops, ordered=False)
+        else:
+            mongo.db[staging_name(name)].bulk_write(ops, ordered=False)
+        buffers[name] = []
+
+    _drop_staging(mongo)
+    try:
+        for records in chain:
+            meta = {}
+            for record in records:
+                kind = record[0]
+                if kind == 'meta':
+                    meta = record[1] or {}
+                    _check_meta(meta, previous)
+                    continue
+                if not meta:
+                    raise ValueError("Invalid backup format: meta must precede collection data")
+
+                name = record[1]
+                if name not in BACKUP_COLLECTIONS:
+                    continue
+                if previous is None and name not in staged:
+                    staged.append(name)
+                    stats[name] = 0
+                    buffers[name] = []
+                    mongo.db.create_collection(staging_name(name))
+                if name not in staged or kind == 'collection':
+                    continue
+
+                if kind == 'deleted':
+                    _id = _restore_id({'_id': record[2]}).get('_id')
+                    if _id is not None and _id != preserve_id:
+                        buffers[name].append(DeleteOne({'_id': _id}))
+                else:
+                    doc = _restore_doc(record[2], restored_at)
+                    # Skip the current admin from the backup — we keep the live one
+                    if name == 'users' and doc.get('_id') == preserve_id:
+                        continue
+                    if previous is None:
+                        buffers[name].append(doc)
+                        stats[name] += 1
+                    elif '_id' in doc:
+                        buffers[name].append(ReplaceOne({'_id': doc['_id']}, doc, upsert=True))
+                if len(buffers[name]) >= batch_size:
+                    flush(name)
+
+            if not meta:
+                raise ValueError("Invalid backup format: missing backup meta")
+            if previous is None and not staged:
+                raise ValueError("Invalid backup format: missing 'collections' key")
+            for name in staged:
+                flush(name)
+            previous = meta
+
+        if previous is None:
+            raise ValueError("No backup file provided")
+
+        for name in staged:
+            if previous.get('kind') == 'incremental':
+                stats[name] = mongo.db[staging_name(name)].count_documents({})
+        if 'users' in staged:
+            live_admin = mongo.db.users.find_one({"_id": preserve_id})
+            if live_admin:
+                mongo.db[staging_name('users')].insert_one(live_admin)
+                stats['users'] += 1  # +1 for preserved admin
+
+        # Backups taken before games carried player_ids still restore queryable
+        if 'games' in staged:
+            Game.backfill_player_ids(mongo.db[staging_name('games')], batch_size)
+            # BSON archives of games saved before times were native carry start/end times as strings
+            Game.backfill_native_times(mongo.db[staging_name('games')], batch_size)
+        # ...and before games referenced their teams
+        if 'games' in staged and 'teams' in staged:
+            games = mongo.db[staging_name('games')]
+            teams = mongo.db[staging_name('teams')]
+            Game.backfill_team_ids(games, teams, batch_size)
+            Team.backfill_stats(games, teams, batch_size)
+        # Jump change_version past any live value so version-keyed caches never serve pre-restore data,
+        # and stamp restored_at so incremental caches (app.analytics) reload from scratch
+        if 'tournaments' in staged:
+            mongo.db[staging_name('tournaments')].update_many(
+                {}, {"$set": {"change_version": time.time_ns() // 1_000_000, "restored_at": restored_at}}
+            )
+
+        for name in staged:
+            ensure_indexes(mongo.db, name, target_name=staging_name(name))
+    except Exception:
+        _drop_staging(mongo)
+        raise
+
+    # Each rename is atomic; the swap window between collections is only metadata operations
+    for name in staged:
+        mongo.db[staging_name(name)].rename(name, dropTarget=True)
+
+    return meta, stats
+
+
+def is_backup_filename(filename):
+    if filename.endswith('.tar'):
+        return True
+    name = filename[:-3] if filename.endswith('.gz') else filename
+    return name.endswith('.json') or name.endswith('.ndjson')
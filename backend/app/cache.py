@@ -0,0 +1,104 @@
+"""
+In-process caches for derived tournament data.
+
+Entries are keyed by the tournament's change_version, which every write to the
+tournament, its games or its teams increments (live score ticks bump the
+separate score_version instead; caches showing in-progress scores key on both).
+A cached value can therefore
+never be stale: once the data changes, lookups use a new key and old entries
+simply age out of the LRU. Each worker process keeps its own caches.
+"""
+import threading
+from collections import OrderedDict
+from config import Config
+
+_MISSING = object()
+
+
+class LRUCache:
+    """A small thread-safe least-recently-used cache with hit/miss counters."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._computing = {}  # key -> lock held while one caller computes it
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """Cached value for key, computing it on a miss.
+
+        Concurrent misses on one key (e.g. every client reconnecting at once)
+        wait for a single compute instead of each running their own.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._lock:
+            key_lock = self._computing.get(key)
+            owner = key_lock is None
+            if owner:
+                key_lock = self._computing[key] = threading.Lock()
+        try:
+            with key_lock:
+                with self._lock:
+                    value = self._data.get(key, _MISSING)
+                if value is _MISSING:
+                    value = compute()
+                    self.set(key, value)
+        finally:
+            # Only the caller that created the lock removes it, and only if it is still the current one
+            if owner:
+                with self._lock:
+                    if self._computing.get(key) is key_lock:
+                        del self._computing[key]
+        return value
+
+    def discard(self, predicate):
+        """Remove every entry whose key matches predicate."""
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def named_cache(name, maxsize=None):
+    """Return the process-wide cache registered under name, creating it on first use."""
+    with _caches_lock:
+        if name not in _caches:
+            _caches[name] = LRUCache(maxsize or Config.CACHE_MAX_ENTRIES)
+        return _caches[name]
+
+
+def cache_stats():
+    with _caches_lock:
+        return {name: cache.stats() for name, cache in _caches.items()}
@@ -0,0 +1,111 @@
+"""
+Career statistics across tournaments.
+
+When a tournament completes, each player's final line is written to
+tournament_results (one document per player and tournament, with their
+final rank). career_stats then holds one document per player, totalled from
+their tournament_results. The career leaderboard and player career pages
+read only these two small collections, never the raw games.
+
+Both collections are derived. rebuild_career_stats regenerates them from
+every completed tournament, e.g. after a restore.
+"""
+from datetime import datetime
+from pymongo import DeleteOne, UpdateOne
+from app.models import Tournament
+from app.utils import compute_standings
+
+CAREER_STATS = ['games_played', 'wins', 'total_points', 'margin']
+# Leaderboard orderings; each has a matching index on career_stats
+LEADERBOARD_SORTS = {
+    'total_points': [('total_points', -1), ('wins', -1), ('margin', -1)],
+    'wins': [('wins', -1), ('total_points', -1), ('margin', -1)],
+    'margin': [('margin', -1), ('total_points', -1), ('wins', -1)],
+    'games_played': [('games_played', -1), ('total_points', -1), ('wins', -1)],
+}
+
+
+def roll_up_tournament(mongo, tournament):
+    """Record every player's final standings line for the tournament and refresh their careers.
+
+    Idempotent: rolling up the same tournament again replaces its results.
+    """
+    tournament_id = str(tournament._id)
+    completed_at = getattr(tournament, 'completed_at', None) or datetime.utcnow()
+    standings = compute_standings(mongo, tournament)
+    # Players from a previous roll-up of this tournament may no longer be in it
+    previous = mongo.db.tournament_results.distinct("user_id", {"tournament_id": tournament_id})
+
+    mongo.db.tournament_results.delete_many({"tournament_id": tournament_id})
+    if standings:
+        mongo.db.tournament_results.insert_many([
+            {
+                "user_id": row['user_id'],
+                "tournament_id": tournament_id,
+                "tournament_name": tournament.name,
+                "completed_at": completed_at,
+                "rank": rank,
+                "players": len(standings),
+                **{stat: row[stat] for stat in CAREER_STATS}
+            }
+            for rank, row in enumerate(standings, 1)
+        ], ordered=False)
+    refresh_careers(mongo, previous + [row['user_id'] for row in standings])
+    return len(standings)
+
+
+def refresh_careers(mongo, user_ids):
+    """Re-total career_stats for the given players from their tournament_results."""
+    user_ids = list(set(user_ids))
+    if not user_ids:
+        return
+    totals = {
+        row['_id']: row for row in mongo.db.tournament_results.aggregate([
+            {"$match": {"user_id": {"$in": user_ids}}},
+            {"$group": {
+                "_id": "$user_id",
+                "tournaments_played": {"$sum": 1},
+                "titles": {"$sum": {"$cond": [{"$eq": ["$rank", 1]}, 1, 0]}},
+                "best_rank": {"$min": "$rank"},
+                "last_played_at": {"$max": "$completed_at"},
+                **{stat: {"$sum": f"${stat}"} for stat in CAREER_STATS}
+            }}
+        ])
+    }
+    ops = []
+    now = datetime.utcnow()
+    for user_id in user_ids:
+        row = totals.get(user_id)
+        if row is None:
+            # No completed tournament counts them any more (their results were rolled up again)
+            ops.append(DeleteOne({"_id": user_id}))
+            continue
+        row.pop('_id')
+        ops.append(UpdateOne({"_id": user_id}, {"$set": {**row, "updated_at": now}}, upsert=True))
+    mongo.db.career_stats.bulk_write(ops, ordered=False)
+
+
+def rebuild_career_stats(mongo):
+    """Regenerate tournament_results and career_stats from every completed tournament."""
+    mongo.db.tournament_results.delete_many({})
+    mongo.db.career_stats.delete_many({})
+    count = 0
+    for data in mongo.db.tournaments.find({"status": "completed"}):
+        roll_up_tournament(mongo, Tournament(data))
+        count += 1
+    return count
+
+
+def career_view(mongo, user_id):
+    """A player's career totals and per-tournament lines, most recent first, or None."""
+    totals = mongo.db.career_stats.find_one({"_id": user_id})
+    if not totals:
+        return None
+    totals.pop('_id')
+    totals.pop('updated_at', None)
+    tournaments = []
+    for row in mongo.db.tournament_results.find({"user_id": user_id}).sort('completed_at', -1):
+        row.pop('_id')
+        row.pop('user_id')
+        tournaments.append(row)
+    return {"user_id": user_id, **totals, "tournaments": tournaments}
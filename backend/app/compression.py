@@ -0,0 +1,111 @@
+"""
+Negotiated response compression.
+
+JSON responses of at least COMPRESSION_MIN_BYTES are compressed with brotli or
+gzip, whichever the client's Accept-Encoding prefers (brotli wins ties, and is
+only offered when the brotli package is installed). Smaller bodies go out as
+they are: below a packet or two, compressing costs more than it saves.
+
+init_compression registers this for every response. Views served through
+app.response_cache pass the cache entry's variants dict instead, so each
+encoding of a cached body is compressed once per tournament change rather
+than once per request. Streamed responses (backups) are wrapped with
+iter_compressed by the route itself.
+"""
+import zlib
+from flask import request
+from config import Config
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/x-ndjson', 'text/csv', 'text/plain', 'text/html'}
+
+
+def encodings():
+    """Encodings this server can produce, in order of preference."""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def negotiate():
+    """The best encoding the current request accepts, or None for identity."""
+    accepted = request.accept_encodings
+    best, best_quality = None, 0
+    for encoding in encodings():
+        quality = accepted.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=Config.COMPRESSION_BROTLI_QUALITY)
+    compressor = zlib.compressobj(Config.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)  # gzip container
+    return compressor.compress(data) + compressor.flush()
+
+
+def iter_compressed(chunks, encoding, flush_bytes=64 * 1024):
+    """Compress a stream of byte chunks, emitting compressed blocks as they fill."""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=Config.COMPRESSION_BROTLI_QUALITY)
+        process, finish = compressor.process, compressor.finish
+    else:
+        compressor = zlib.compressobj(Config.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+        process, finish = compressor.compress, compressor.flush
+    pending = []
+    pending_size = 0
+    for chunk in chunks:
+        data = process(chunk)
+        if data:
+            pending.append(data)
+            pending_size += len(data)
+        if pending_size >= flush_bytes:
+            yield b''.join(pending)
+            pending = []
+            pending_size = 0
+    pending.append(finish())
+    yield b''.join(pending)
+
+
+def _compressible(response):
+    return (
+        response.status_code == 200
+        and not response.direct_passthrough
+        and not response.is_streamed
+        and 'Content-Encoding' not in response.headers
+        and response.mimetype in COMPRESSIBLE_MIMETYPES
+        and (response.content_length or 0) >= Config.COMPRESSION_MIN_BYTES
+    )
+
+
+def compress_response(response, variants=None):
+    """Compress response in place if it qualifies and the client accepts an encoding.
+
+    variants, if given, maps encoding -> compressed body for this exact body;
+    a cached variant is reused and a new one is stored there.
+    """
+    if not _compressible(response):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate()
+    if encoding is None:
+        return response
+    body = variants.get(encoding) if variants is not None else None
+    if body is None:
+        body = compress(response.get_data(), encoding)
+        if variants is not None:
+            variants[encoding] = body
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_compression(app):
+    if Config.COMPRESSION_MIN_BYTES < 0:
+        print("ℹ️ Response compression disabled")
+        return
+    app.after_request(compress_response)
+    print(f"✅ Response compression: {', '.join(encodings())} above {Config.COMPRESSION_MIN_BYTES} bytes")
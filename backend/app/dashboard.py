@@ -0,0 +1,131 @@
+"""
+Player-facing views.
+
+The standalone player endpoints and the composite /player/dashboard endpoint
+share these builders. Each builder takes data the caller has already loaded,
+so the dashboard can build every section from one tournament read, one user
+read and one query for the player's games.
+"""
+from datetime import datetime
+import pytz
+from config import Config
+from app.models import Game
+from app.utils import get_user_names
+
+OPEN_GAME_STATUSES = ["upcoming", "active"]
+
+
+def server_time():
+    return datetime.utcnow().isoformat() + 'Z'
+
+
+def player_games_filter(tournament, user_id):
+    """Query for the games a player is on in the tournament."""
+    return {"tournament_id": str(tournament._id), "player_ids": user_id}
+
+
+def tournament_view(mongo, tournament):
+    """The active tournament plus today's check-in flags."""
+    data = tournament.to_dict()
+
+    # Add is_tournament_day flag so frontend knows whether to show check-in
+    tz = pytz.timezone(Config.TOURNAMENT_TIMEZONE)
+    today = datetime.now(tz).strftime('%Y-%m-%d')
+    data['is_tournament_day'] = today in (tournament.dates or [])
+    data['today'] = today
+
+    # Check if check-in is currently open (either manual override or time window)
+    from app.scheduler import is_checkin_window_open
+    is_open, _ = is_checkin_window_open(mongo, tournament)
+    data['check_in_currently_open'] = is_open
+    data['server_time'] = server_time()
+    return data
+
+
+def current_game_view(mongo, game_data, names=None):
+    """A player's open game enriched with player names, or None.
+
+    names (player id -> name) may be passed in when building many games at once.
+    """
+    if not game_data:
+        return None
+    team1_ids = game_data.get('team1_player_ids', [])
+    team2_ids = game_data.get('team2_player_ids', [])
+    if names is None:
+        names = get_user_names(mongo, team1_ids + team2_ids)
+    game_obj = Game(game_data).to_dict()
+    game_obj['team1_player_names'] = [names.get(pid, "Unknown") for pid in team1_ids]
+    game_obj['team2_player_names'] = [names.get(pid, "Unknown") for pid in team2_ids]
+    game_obj['server_time'] = server_time()
+    return game_obj
+
+
+def day_summary_view(tournament, user_id, player_games):
+    """Session state and completed games for the tournament's current day.
+
+    player_games may include other days; they are ignored.
+    """
+    if not tournament:
+        return {"state": "no_tournament", "games": [], "rounds_total": 0, "rounds_completed": 0}
+
+    rounds_total = tournament.rounds_per_day
+    player_games = sorted(
+        (g for g in player_games if g.get('day_index', 0) == tournament.current_day_index),
+        key=lambda g: g.get('round_number', 0)
+    )
+
+    # Count completed rounds
+    rounds_with_games = set(g.get('round_number') for g in player_games)
+    finalized_rounds = set(g.get('round_number') for g in player_games if g.get('status') == 'finalized')
+
+    # Determine state
+    active_game = next((g for g in player_games if g.get('status') in OPEN_GAME_STATUSES), None)
+
+    if active_game:
+        state = "active"
+    elif len(finalized_rounds) >= rounds_total:
+        state = "day_complete"
+    elif len(finalized_rounds) > 0:
+        state = "between_rounds"
+    else:
+        state = "waiting"
+
+    # Build game summaries (for completed games only, to show between rounds)
+    game_summaries = []
+    for g in player_games:
+        if g.get('status') == 'finalized':
+            is_team1 = user_id in g.get('team1_player_ids', [])
+            my_score = g.get('score1') if is_team1 else g.get('score2')
+            opp_score = g.get('score2') if is_team1 else g.get('score1')
+            won = my_score > opp_score if my_score is not None and opp_score is not None else None
+
+            game_summaries.append({
+                "round": g.get('round_number'),
+                "my_score": my_score,
+                "opponent_score": opp_score,
+                "won": won
+            })
+
+    return {
+        "state": state,
+        "games": game_summaries,
+        "rounds_total": rounds_total,
+        "rounds_completed": len(finalized_rounds),
+        "current_round": max(rounds_with_games) if rounds_with_games else 0
+    }
+
+
+def standings_window(standings, user_id, neighbours):
+    """The player's standings row with up to `neighbours` rows either side.
+
+    Rows carry their 1-based rank. rank is None if the player has no finalized games yet.
+    """
+    index = next((i for i, row in enumerate(standings) if row['user_id'] == user_id), None)
+    if index is None:
+        return {"rank": None, "total": len(standings), "rows": []}
+    start = max(0, index - neighbours)
+    rows = [
+        dict(row, rank=rank)
+        for rank, row in enumerate(standings[start:index + neighbours + 1], start + 1)
+    ]
+    return {"rank": index + 1, "total": len(standings), "rows": rows}
@@ -0,0 +1,217 @@
+"""
+Change-stream event bus.
+
+With EVENT_BUS_ENABLED, each process watches a MongoDB change stream on games,
+tournaments, teams and users. It turns document changes into the socket events
+clients listen for, so every write reaches clients, including writes no route
+broadcasts (schedule edits, check-ins, restores). While the bus runs, the
+routes' broadcast_* calls (app.events) only drop cached responses.
+
+Changes are collected for EVENT_BUS_BATCH_SECONDS, then flushed per room with
+repeats coalesced:
+- one standings_updated per tournament;
+- the latest state of each game;
+- one tournament_updated carrying just the fields that changed.
+Each process emits to its own sockets and drops its own caches, so this works
+the same with several workers.
+
+Change streams need a replica set; a single-node one is enough (see README).
+If the stream cannot be opened, the bus stops and the routes' broadcasts take
+over again.
+"""
+import threading
+from pymongo.errors import OperationFailure
+from config import Config
+from app import socketio
+
+WATCHED_COLLECTIONS = ['games', 'tournaments', 'teams', 'users']
+ACTIVE_STATUSES = ["upcoming", "active", "blackout"]
+# Game updates touching only these are live scoring, routed to the station room and score feed
+LIVE_SCORE_FIELDS = {'score1', 'score2', 'updated_at'}
+# Tournament fields pushed to clients as tournament_updated (change_version bumps alone are not)
+TOURNAMENT_FIELDS = {'name', 'status', 'dates', 'current_day_index', 'current_round', 'rounds_per_day', 'check_in_open'}
+NAME_FIELDS = {'name', 'first_name', 'last_name'}
+CHECKIN_FIELDS = {'checked_in', 'checked_in_at'}
+NOT_A_REPLICA_SET = 40573
+
+_bus = None
+
+
+def running():
+    """Whether a bus is watching the change stream in this process."""
+    return _bus is not None and _bus.running
+
+
+def start_event_bus(mongo):
+    """Start this process's bus (once) and return it."""
+    global _bus
+    if _bus is None:
+        _bus = EventBus(mongo)
+        socketio.start_background_task(_bus.watch)
+        socketio.start_background_task(_bus.flush_forever)
+    return _bus
+
+
+class _Batch:
+    """Changes seen since the last flush, coalesced."""
+
+    def __init__(self):
+        self.invalidate = set()     # tournament ids whose cached responses are stale
+        self.live_invalidate = set()  # tournament ids whose live-score responses are stale
+        self.games = {}             # game id -> latest document, for player/station rooms
+        self.live_scores = {}       # game id -> latest document, score-only changes
+        self.new_games = {}         # tournament id -> inserted game documents (pairings)
+        self.standings = set()      # tournament ids
+        self.tournaments = {}       # tournament id -> changed public fields
+        self.checkins = {}          # user id -> checked_in
+        self.active_changed = False  # something affecting the active tournament, id not in the change
+        self.reset = False          # collections were replaced (restore)
+
+
+class EventBus:
+    def __init__(self, mongo):
+        self.mongo = mongo
+        self.running = False
+        self.resume_token = None
+        self.counters = {"changes": 0, "flushes": 0, "errors": 0}
+        self._batch = _Batch()
+        self._lock = threading.Lock()
+
+    def watch(self):
+        """Follow the change stream, reopening it (from the last resume token) after errors."""
+        pipeline = [{"$match": {"$or": [
+            {"ns.coll": {"$in": WATCHED_COLLECTIONS}},
+            # Restores rename staging collections over the live ones
+            {"operationType": "rename", "to.coll": {"$in": WATCHED_COLLECTIONS}},
+        ]}}]
+        while True:
+            try:
+                with self.mongo.db.watch(pipeline, full_document='updateLookup',
+                                         resume_after=self.resume_token) as stream:
+                    self.running = True
+                    print(f"✅ Event bus watching {', '.join(WATCHED_COLLECTIONS)}")
+                    for change in stream:
+                        self.resume_token = stream.resume_token
+                        self.counters["changes"] += 1
+                        with self._lock:
+                            self.collect(change)
+            except OperationFailure as e:
+                self.running = False
+                if e.code == NOT_A_REPLICA_SET:
+                    print("⚠️ Event bus disabled: change streams need a replica set")
+                    return
+                # e.g. the resume token fell off the oplog; start again from now
+                self.resume_token = None
+                self.counters["errors"] += 1
+                print(f"[EventBus] Change stream failed: {e}")
+            except Exception as e:
+                self.running = False
+                self.counters["errors"] += 1
+                print(f"[EventBus] Change stream failed: {e}")
+            socketio.sleep(Config.EVENT_BUS_RETRY_SECONDS)
+
+    def collect(self, change):
+        """Fold one change event into the pending batch."""
+        batch = self._batch
+        op = change['operationType']
+        coll = change.get('ns', {}).get('coll')
+        if op in ('rename', 'drop', 'dropDatabase', 'invalidate'):
+            batch.reset = True
+            return
+
+        doc = change.get('fullDocument')
+        fields = set(change.get('updateDescription', {}).get('updatedFields', {}))
+        if op == 'delete' or doc is None:
+            if coll in ('games', 'teams'):
+                batch.active_changed = True
+            return
+
+        if coll == 'games':
+            tournament_id = str(doc.get('tournament_id'))
+            game_id = str(doc['_id'])
+            if op == 'update' and fields <= LIVE_SCORE_FIELDS:
+                batch.live_invalidate.add(tournament_id)
+                if game_id not in batch.games:
+                    batch.live_scores[game_id] = doc
+                return
+            batch.invalidate.add(tournament_id)
+            batch.live_scores.pop(game_id, None)
+            batch.games[game_id] = doc
+            batch.standings.add(tournament_id)
+            if op == 'insert':
+                batch.new_games.setdefault(tournament_id, []).append(doc)
+        elif coll == 'teams':
+            tournament_id = str(doc.get('tournament_id'))
+            batch.invalidate.add(tournament_id)
+            batch.standings.add(tournament_id)
+        elif coll == 'tournaments':
+            tournament_id = str(doc['_id'])
+            if op == 'update' and fields <= {'score_version'}:
+                batch.live_invalidate.add(tournament_id)
+                return
+            batch.invalidate.add(tournament_id)
+            changed = TOURNAMENT_FIELDS if op != 'update' else fields & TOURNAMENT_FIELDS
+            if changed:
+                batch.tournaments.setdefault(tournament_id, {}).update({f: doc.get(f) for f in changed})
+        elif coll == 'users':
+            if op == 'update':
+                checkin_changed = bool(fields & CHECKIN_FIELDS)
+            else:
+                # New accounts only count when they arrive checked in (e.g. an admin adding a walk-in)
+                checkin_changed = op != 'insert' or bool(doc.get('checked_in'))
+            if checkin_changed:
+                batch.checkins[str(doc['_id'])] = bool(doc.get('checked_in'))
+            if op == 'update' and fields & NAME_FIELDS:
+                batch.active_changed = True
+
+    def flush_forever(self):
+        while True:
+            socketio.sleep(Config.EVENT_BUS_BATCH_SECONDS)
+            try:
+                self.flush()
+            except Exception as e:
+                self.counters["errors"] += 1
+                print(f"[EventBus] Flush failed: {e}")
+
+    def flush(self):
+        """Emit the pending batch."""
+        from app import events, response_cache
+        from app.utils import enrich_games
+
+        with self._lock:
+            batch, self._batch = self._batch, _Batch()
+        if batch.reset:
+            response_cache.clear()
+            socketio.emit('standings_updated', {})
+        if batch.active_changed or batch.checkins:
+            active = self.mongo.db.tournaments.find_one({"status": {"$in": ACTIVE_STATUSES}}, {"_id": 1})
+            active_id = str(active['_id']) if active else None
+            if active_id and batch.active_changed:
+                batch.invalidate.add(active_id)
+                batch.standings.add(active_id)
+            if active_id and batch.checkins:
+                socketio.emit('checkin_updated', [
+                    {"user_id": user_id, "checked_in": checked_in}
+                    for user_id, checked_in in batch.checkins.items()
+                ], room=active_id)
+
+        for tournament_id in batch.invalidate:
+            response_cache.invalidate(tournament_id)
+        for tournament_id in batch.live_invalidate - batch.invalidate:
+            response_cache.invalidate(tournament_id, live_only=True)
+        for tournament_id, fields in batch.tournaments.items():
+            socketio.emit('tournament_updated', {"_id": tournament_id, **fields}, room=tournament_id)
+            if 'status' in fields:
+                events.send_blackout(tournament_id, fields['status'] == 'blackout')
+        for tournament_id, docs in batch.new_games.items():
+            events.send_pairings(tournament_id, enrich_games(self.mongo, docs), players=False)
+        if batch.games:
+            events.send_games(self.mongo, list(batch.games.values()))
+        for game_id, doc in batch.live_scores.items():
+            events.send_live_score(
+                str(doc.get('tournament_id')), game_id, doc.get('score1'), doc.get('score2'),
+                station=events.station_of(doc)
+            )
+        for tournament_id in batch.standings:
+            events.send_standings_update(tournament_id)
+        self.counters["flushes"] += 1
@@ -1,29 +1,78 @@
-from flask_socketio import emit, join_room
+import threading
+from flask import current_app, request
+from flask_jwt_extended import decode_token
+from flask_socketio import emit, join_room, leave_room, rooms
+from config import Config
 from app import socketio
-from datetime import datetime
-from bson import ObjectId
-
-def serialize_for_json(data):
-    if isinstance(data, dict):
-        return {k: serialize_for_json(v) for k, v in data.items()}
-    elif isinstance(data, list):
-        return [serialize_for_json(v) for v in data]
-    elif isinstance(data, datetime):
-        return data.isoformat() + 'Z'
-    elif isinstance(data, ObjectId):
-        return str(data)
-    else:
-        return data
+from app.models import Game
+from app.response_cache import invalidate
+
+
+def user_room(user_id):
+    """Room holding every socket a player has open (phone, tablet, ...)."""
+    return f"user:{user_id}"
+
+
+def station_room(tournament_id, station):
+    """Room for one station's tablet(s): its game's live score, start and finalize."""
+    return f"station:{tournament_id}:{station}"
+
+
+def feed_room(tournament_id):
+    """Room for big-screen displays, which get live scores batched (see broadcast_live_score)."""
+    return f"feed:{tournament_id}"
+
+
+def station_of(game_data):
+    return game_data.get('court') or game_data.get('game_number')
+
 
 @socketio.on('connect')
-def handle_connect():
-    print('Client connected')
+def handle_connect(auth=None):
+    """Accept every client; a valid JWT (auth.token or ?token=) also joins the player's room.
+
+    Invalid or expired tokens connect anonymously, so the client still gets tournament room events.
+    """
+    token = (auth or {}).get('token') or request.args.get('token')
+    if not token:
+        print('Client connected')
+        return
+    try:
+        user_id = decode_token(token)[current_app.config.get('JWT_IDENTITY_CLAIM', 'sub')]
+    except Exception as e:
+        print(f"Client connected anonymously, token rejected: {e}")
+        return
+    join_room(user_room(user_id))
+    print(f'Client connected as user {user_id}')
 
 @socketio.on('join_tournament')
 def handle_join_tournament(data):
+    """Join the tournament room and reply with a tournament_snapshot (see app.snapshots).
+
+    Send last_seen_version (the version of the last snapshot received) to get only what changed.
+    """
     room = data.get('tournament_id')
     join_room(room)
     print(f'Client joined tournament room: {room}')
+    try:
+        from app import mongo, spectator_mongo
+        from app.snapshots import tournament_snapshot
+        client = spectator_mongo if spectator_mongo.db is not None else mongo
+        emit('tournament_snapshot', tournament_snapshot(client, data.get('last_seen_version')))
+    except Exception as e:
+        print(f"Tournament snapshot failed: {e}")
+
+@socketio.on('join_station')
+def handle_join_station(data):
+    """Follow a single station ({tournament_id, station}), leaving any station followed before."""
+    for room in rooms():
+        if room.startswith('station:'):
+            leave_room(room)
+    join_room(station_room(data.get('tournament_id'), data.get('station')))
+
+@socketio.on('join_score_feed')
+def handle_join_score_feed(data):
+    join_room(feed_room(data.get('tournament_id')))
 
 @socketio.on('reveal_pairings')
 def handle_reveal_pairings(data):
@@ -31,20 +80,121 @@ def handle_reveal_pairings(data):
     # But usually, it's safer to have the route broadcast via socket_io
     pass
 
+# Routes call broadcast_*. While the event bus is running it emits the same events
+# from the change stream (app.event_bus), so these only drop cached responses.
+
+def _bus_running():
+    from app import event_bus
+    return event_bus.running()
+
 def broadcast_pairings(tournament_id, pairings):
-    safe_pairings = serialize_for_json(pairings)
-    socketio.emit('pairings_revealed', safe_pairings, room=tournament_id)
+    invalidate(tournament_id)
+    if not _bus_running():
+        send_pairings(tournament_id, pairings)
+
+def broadcast_games(mongo, games):
+    """Send these games (documents as stored) to their players' rooms and their station rooms.
+
+    Sent when games start or finalize; clients replace their current game with it,
+    or clear it once its status is 'finalized'.
+    """
+    if not _bus_running():
+        send_games(mongo, games)
+
+def clear_player_games(player_ids):
+    """Tell these players (taken off a game, or whose game was deleted) they have no game."""
+    _emit_player_game(None, player_ids)
 
 def broadcast_blackout(tournament_id, is_blackout):
-    socketio.emit('blackout_status', {"is_blackout": is_blackout}, room=tournament_id)
+    invalidate(tournament_id)
+    if not _bus_running():
+        send_blackout(tournament_id, is_blackout)
 
 def broadcast_standings_update(tournament_id):
+    invalidate(tournament_id)
+    if not _bus_running():
+        send_standings_update(tournament_id)
+
+def broadcast_live_score(tournament_id, game_id, score1, score2, station=None):
+    invalidate(tournament_id, live_only=True)
+    if not _bus_running():
+        send_live_score(tournament_id, game_id, score1, score2, station)
+
+
+def send_pairings(tournament_id, pairings, players=True):
+    # Encoded by app.fastjson, which handles ObjectIds and datetimes directly
+    socketio.emit('pairings_revealed', pairings, room=tournament_id)
+    if players:
+        from app.dashboard import server_time
+        now = server_time()
+        for pairing in pairings:
+            _emit_game(dict(pairing, server_time=now), pairing)
+
+def send_games(mongo, games):
+    from app.dashboard import current_game_view
+    from app.utils import get_user_names
+    names = get_user_names(mongo, [
+        pid for g in games for pid in g.get('team1_player_ids', []) + g.get('team2_player_ids', [])
+    ])
+    for game_data in games:
+        _emit_game(current_game_view(mongo, game_data, names), game_data)
+
+def _emit_player_game(payload, player_ids):
+    if player_ids:
+        socketio.emit('player_game', payload, room=[user_room(pid) for pid in player_ids])
+
+def _emit_game(payload, game_data):
+    _emit_player_game(payload, Game.all_player_ids(
+        game_data.get('team1_player_ids'), game_data.get('team2_player_ids')
+    ))
+    room = station_room(game_data.get('tournament_id'), station_of(game_data))
+    socketio.emit('station_game', payload, room=room)
+
+def send_blackout(tournament_id, is_blackout):
+    socketio.emit('blackout_status', {"is_blackout": is_blackout}, room=tournament_id)
+
+def send_standings_update(tournament_id):
     socketio.emit('standings_updated', {}, room=tournament_id)
 
-def broadcast_live_score(tournament_id, game_id, score1, score2):
-    socketio.emit('live_score_updated', {
+# tournament_id -> {game_id: latest live score}, flushed to feed rooms by _flush_score_feed
+_score_feed = {}
+_score_feed_lock = threading.Lock()
+_score_feed_task = None
+
+
+def send_live_score(tournament_id, game_id, score1, score2, station=None):
+    """Send a live score to its station room now, and to displays with the next feed batch."""
+    global _score_feed_task
+    score = {
         "game_id": str(game_id),
+        "station": station,
         "score1": score1,
         "score2": score2
-    }, room=tournament_id)
+    }
+    socketio.emit('live_score_updated', score, room=station_room(tournament_id, station))
+    with _score_feed_lock:
+        _score_feed.setdefault(str(tournament_id), {})[str(game_id)] = score
+        if _score_feed_task is None:
+            _score_feed_task = socketio.start_background_task(_flush_score_feed)
+
+def _flush_score_feed():
+    """Every SCORE_FEED_INTERVAL_SECONDS, send displays the latest score of each game that changed.
 
+    Stops once a batch comes up empty, or on an error; send_live_score then starts it again.
+    """
+    global _score_feed_task
+    try:
+        while True:
+            socketio.sleep(Config.SCORE_FEED_INTERVAL_SECONDS)
+            with _score_feed_lock:
+                pending = dict(_score_feed)
+                _score_feed.clear()
+                if not pending:
+                    _score_feed_task = None
+                    return
+            for tournament_id, scores in pending.items():
+                socketio.emit('live_scores', list(scores.values()), room=feed_room(tournament_id))
+    except Exception as e:
+        print(f"Score feed flush failed: {e}")
+        with _score_feed_lock:
+            _score_feed_task = None
@@ -0,0 +1,49 @@
+"""
+JSON encoding for API responses, Socket.IO packets and JSON backups, backed by orjson.
+
+ObjectIds encode as their hex string. Datetimes encode as ISO 8601 with a Z
+suffix; naive datetimes are UTC throughout the app. Documents straight from
+MongoDB can therefore be encoded in one pass, with no pre-walk converting them
+first. Output is always compact and keys keep their insertion order.
+"""
+import orjson
+from bson import ObjectId
+from flask.json.provider import JSONProvider
+
+OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj):
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumpb(obj):
+    """Encode obj to JSON bytes."""
+    return orjson.dumps(obj, default=_default, option=OPTIONS)
+
+
+def dumps(obj, **kwargs):
+    """Encode obj to a JSON str. Accepts (and ignores) stdlib json.dumps keyword arguments."""
+    return dumpb(obj).decode('utf-8')
+
+
+def loads(s, **kwargs):
+    return orjson.loads(s)
+
+
+class FastJSONProvider(JSONProvider):
+    """Flask JSON provider used by jsonify and request.get_json."""
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj)
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumpb(obj), mimetype='application/json')
@@ -0,0 +1,92 @@
+"""
+MongoDB index definitions.
+
+Indexes are declared per collection so they can be built both on the live
+collections at startup and on staging collections during a restore.
+"""
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from config import Config
+
+INDEXES = {
+    'users': [
+        IndexModel([('email', ASCENDING)], name='email'),
+        IndexModel([('google_id', ASCENDING)], name='google_id', sparse=True),
+        IndexModel([('apple_id', ASCENDING)], name='apple_id', sparse=True),
+        IndexModel([('updated_at', ASCENDING)], name='updated_at'),
+        # Admin roster: keyset pagination order, and multikey prefix search
+        IndexModel([('name', ASCENDING), ('_id', ASCENDING)], name='name_id'),
+        IndexModel([('search_keys', ASCENDING)], name='search_keys'),
+    ],
+    'tournaments': [
+        IndexModel([('status', ASCENDING)], name='status'),
+        IndexModel([('updated_at', ASCENDING)], name='updated_at'),
+    ],
+    'games': [
+        IndexModel([('tournament_id', ASCENDING), ('status', ASCENDING)], name='tournament_status'),
+        # player_ids is multikey: a player's games in a tournament by status or by day
+        IndexModel(
+            [('tournament_id', ASCENDING), ('player_ids', ASCENDING), ('status', ASCENDING)],
+            name='tournament_player_status'
+        ),
+        IndexModel(
+            [('tournament_id', ASCENDING), ('player_ids', ASCENDING), ('day_index', ASCENDING)],
+            name='tournament_player_day'
+        ),
+        IndexModel(
+            [('tournament_id', ASCENDING), ('day_index', ASCENDING), ('round_number', ASCENDING)],
+            name='tournament_day_round'
+        ),
+        IndexModel([('team_ids', ASCENDING), ('status', ASCENDING)], name='team_status'),
+        # Auto-finalize: active games whose end_time has passed
+        IndexModel([('status', ASCENDING), ('end_time', ASCENDING)], name='status_end_time'),
+        IndexModel([('updated_at', ASCENDING)], name='updated_at'),
+    ],
+    'teams': [
+        IndexModel([('tournament_id', ASCENDING), ('day_index', ASCENDING)], name='tournament_day'),
+        # Big Reveal: a day's teams already in ranking order
+        IndexModel(
+            [('tournament_id', ASCENDING), ('day_index', ASCENDING), ('total_points', DESCENDING),
+             ('wins', DESCENDING), ('margin_of_victory', DESCENDING)],
+            name='tournament_day_ranking'
+        ),
+        IndexModel([('updated_at', ASCENDING)], name='updated_at'),
+    ],
+    # Career rollups (app.career): one result per player per completed tournament...
+    'tournament_results': [
+        IndexModel([('tournament_id', ASCENDING)], name='tournament_id'),
+        IndexModel([('user_id', ASCENDING), ('completed_at', DESCENDING)], name='user_completed_at'),
+    ],
+    # ...and one career line per player, indexed for each leaderboard ordering
+    'career_stats': [
+        IndexModel([('total_points', DESCENDING), ('wins', DESCENDING), ('margin', DESCENDING)],
+                   name='by_total_points'),
+        IndexModel([('wins', DESCENDING), ('total_points', DESCENDING), ('margin', DESCENDING)],
+                   name='by_wins'),
+        IndexModel([('margin', DESCENDING), ('total_points', DESCENDING), ('wins', DESCENDING)],
+                   name='by_margin'),
+        IndexModel([('games_played', DESCENDING), ('total_points', DESCENDING), ('wins', DESCENDING)],
+                   name='by_games_played'),
+    ],
+    # Tombstones for incremental backups; expire once no backup chain can need them
+    'deletions': [
+        IndexModel([('collection', ASCENDING), ('deleted_at', ASCENDING)], name='collection_deleted_at'),
+        IndexModel(
+            [('deleted_at', ASCENDING)], name='deleted_at_ttl',
+            expireAfterSeconds=Config.DELETION_TOMBSTONE_TTL_DAYS * 86400
+        ),
+    ],
+}
+
+
+def ensure_indexes(db, collection_name=None, target_name=None):
+    """Create declared indexes.
+
+    With no arguments every declared collection is indexed. Pass collection_name
+    to index a single collection, and target_name to build that collection's
+    indexes on a differently named collection (e.g. a restore staging collection).
+    """
+    names = [collection_name] if collection_name else list(INDEXES)
+    for name in names:
+        models = INDEXES.get(name)
+        if models:
+            db[target_name or name].create_indexes(models)
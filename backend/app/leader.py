@@ -0,0 +1,110 @@
+"""
+Leader election for scheduled jobs.
+
+Every worker process starts the scheduler, but only the holder of the
+scheduler lease (a document in the leases collection) runs its jobs. Each
+process tries to take or renew the lease every SCHEDULER_LEASE_RENEW_SECONDS.
+The holder keeps it by renewing; anyone else can take it only once it has gone
+SCHEDULER_LEASE_TTL_SECONDS without a renewal. If the leader dies, another
+process therefore takes over within one TTL. A process that cannot reach the
+database stops running jobs when its own lease would have expired.
+"""
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from functools import wraps
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+# The lease of this process's scheduler, if it started one
+current_lease = None
+
+
+class Lease:
+    """A named, expiring lease held by at most one process at a time."""
+
+    def __init__(self, mongo, name, ttl_seconds):
+        self.mongo = mongo
+        self.name = name
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.expires_at = None  # When our lease runs out, as of our last renewal
+        self.counters = {"acquired": 0, "renewed": 0, "lost": 0, "errors": 0, "jobs_run": 0, "jobs_skipped": 0}
+        self._lock = threading.Lock()
+
+    def is_leader(self):
+        return self.expires_at is not None and datetime.utcnow() < self.expires_at
+
+    def refresh(self):
+        """Take the lease if it is free or expired, or renew it if we hold it. Returns whether we hold it."""
+        now = datetime.utcnow()
+        with self._lock:
+            held = self.expires_at is not None  # As of our last refresh
+            try:
+                previous = self.mongo.db.leases.find_one_and_update(
+                    {"_id": self.name, "$or": [{"holder": self.holder}, {"expires_at": {"$lt": now}}]},
+                    {"$set": {"holder": self.holder, "renewed_at": now, "expires_at": now + self.ttl}},
+                    upsert=True, return_document=ReturnDocument.BEFORE
+                )
+            except DuplicateKeyError:
+                # Held by another process and not yet expired
+                self.expires_at = None
+                if held:
+                    self.counters["lost"] += 1
+                    print(f"[Leader] {self.holder} lost the {self.name} lease")
+                return False
+            except Exception as e:
+                self.counters["errors"] += 1
+                print(f"[Leader] Lease refresh failed: {e}")
+                return self.is_leader()
+
+            self.expires_at = now + self.ttl
+            if previous is None or previous.get('holder') != self.holder:
+                self.mongo.db.leases.update_one(
+                    {"_id": self.name, "holder": self.holder}, {"$set": {"acquired_at": now}}
+                )
+                self.counters["acquired"] += 1
+                print(f"[Leader] {self.holder} acquired the {self.name} lease")
+            else:
+                self.counters["renewed"] += 1
+            return True
+
+    def release(self):
+        """Give the lease up (e.g. on shutdown) so another process can take it straight away."""
+        with self._lock:
+            try:
+                self.mongo.db.leases.delete_one({"_id": self.name, "holder": self.holder})
+            except Exception as e:
+                print(f"[Leader] Lease release failed: {e}")
+            self.expires_at = None
+
+    def leader_only(self, job):
+        """Wrap a scheduled job so it only runs while this process holds the lease."""
+        @wraps(job)
+        def wrapper(*args, **kwargs):
+            if not self.is_leader():
+                self.counters["jobs_skipped"] += 1
+                return None
+            self.counters["jobs_run"] += 1
+            return job(*args, **kwargs)
+        return wrapper
+
+    def status(self):
+        return {
+            "holder": self.holder,
+            "is_leader": self.is_leader(),
+            "expires_at": self.expires_at,
+            **self.counters
+        }
+
+
+def lease_status(mongo, name):
+    """The stored lease (who holds it and until when) plus this process's view of it."""
+    lease = mongo.db.leases.find_one({"_id": name}) or {}
+    lease.pop('_id', None)
+    if lease.get('expires_at'):
+        lease['expired'] = lease['expires_at'] < datetime.utcnow()
+    this_process = current_lease.status() if current_lease and current_lease.name == name else None
+    return {"name": name, "lease": lease or None, "this_process": this_process}
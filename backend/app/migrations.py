@@ -0,0 +1,93 @@
+"""
+One-off data migrations, applied at startup.
+
+Each migration runs once per database; applied migrations are recorded in
+the migrations collection so restarts skip them.
+"""
+from datetime import datetime
+from pymongo import UpdateOne
+from app.models import User, Game, Team
+from app.career import rebuild_career_stats
+from config import Config
+
+
+def backfill_updated_at(mongo):
+    """Stamp updated_at on documents written before it was tracked.
+
+    They are stamped with the migration time so the next incremental backup
+    picks them up once.
+    """
+    now = datetime.utcnow()
+    for name in ['users', 'tournaments', 'games', 'teams']:
+        result = mongo.db[name].update_many(
+            {"updated_at": {"$exists": False}},
+            {"$set": {"updated_at": now}}
+        )
+        print(f"[Migrations] {name}: stamped updated_at on {result.modified_count} documents")
+
+
+def backfill_user_search_keys(mongo):
+    """Derive search_keys for users saved before admin roster search existed."""
+    batch_size = Config.MIGRATION_BATCH_SIZE
+    ops = []
+    updated = 0
+    for doc in mongo.db.users.find({}, {"name": 1, "first_name": 1, "last_name": 1, "email": 1}):
+        user = User(doc)
+        ops.append(UpdateOne(
+            {"_id": doc["_id"]},
+            {"$set": {"search_keys": User.search_keys(user.name, user.email)}}
+        ))
+        if len(ops) >= batch_size:
+            updated += mongo.db.users.bulk_write(ops, ordered=False).modified_count
+            ops = []
+    if ops:
+        updated += mongo.db.users.bulk_write(ops, ordered=False).modified_count
+    print(f"[Migrations] users: set search_keys on {updated} documents")
+
+
+def backfill_game_player_ids(mongo):
+    """Denormalize both rosters into games.player_ids for indexed player lookups."""
+    updated = Game.backfill_player_ids(mongo.db.games, Config.MIGRATION_BATCH_SIZE)
+    print(f"[Migrations] games: set player_ids on {updated} documents")
+
+
+def link_games_to_teams(mongo):
+    """Point games at their teams by roster, then total each team's finalized games."""
+    batch_size = Config.MIGRATION_BATCH_SIZE
+    linked = Game.backfill_team_ids(mongo.db.games, mongo.db.teams, batch_size)
+    print(f"[Migrations] games: linked {linked} documents to teams")
+    updated = Team.backfill_stats(mongo.db.games, mongo.db.teams, batch_size)
+    print(f"[Migrations] teams: computed stats for {updated} documents")
+
+
+def convert_game_times(mongo):
+    """Store game start_time/end_time as datetimes rather than the strings older code wrote."""
+    updated = Game.backfill_native_times(mongo.db.games, Config.MIGRATION_BATCH_SIZE)
+    print(f"[Migrations] games: converted start/end times on {updated} documents")
+
+
+def build_career_stats(mongo):
+    """Roll up the tournaments completed before career stats existed."""
+    count = rebuild_career_stats(mongo)
+    print(f"[Migrations] career_stats: rolled up {count} completed tournaments")
+
+
+MIGRATIONS = [
+    ('0001_backfill_updated_at', backfill_updated_at),
+    ('0002_backfill_user_search_keys', backfill_user_search_keys),
+    ('0003_backfill_game_player_ids', backfill_game_player_ids),
+    ('0004_link_games_to_teams', link_games_to_teams),
+    ('0005_build_career_stats', build_career_stats),
+    ('0006_native_game_times', convert_game_times),
+]
+
+
+def run_migrations(mongo):
+    """Apply any migrations not yet recorded in the migrations collection."""
+    applied = {m['_id'] for m in mongo.db.migrations.find({}, {'_id': 1})}
+    for name, migration in MIGRATIONS:
+        if name in applied:
+            continue
+        print(f"[Migrations] Applying {name}")
+        migration(mongo)
+        mongo.db.migrations.insert_one({"_id": name, "applied_at": datetime.utcnow()})
@@ -1,6 +1,11 @@
+import base64
+import json
+import re
 from bson import ObjectId
-from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from bson.errors import InvalidId
+from pymongo import UpdateOne
+from datetime import datetime, timedelta
+from app.passwords import hash_password, verify_password, needs_rehash
 
 class BaseModel:
     collection_name = None
@@ -8,6 +13,7 @@ class BaseModel:
     def __init__(self, data=None):
         self._id = data.get('_id') if data else None
         self.created_at = data.get('created_at', datetime.utcnow()) if data else datetime.utcnow()
+        self.updated_at = data.get('updated_at') if data else None
 
     def to_dict(self):
         data = self.__dict__.copy()
@@ -15,6 +21,76 @@ class BaseModel:
             data['_id'] = str(data['_id'])
         return data
 
+    def to_document(self):
+        """Fields written by save(); subclasses add derived, storage-only fields here."""
+        return self.to_dict()
+
+    def save(self, mongo):
+        # updated_at drives incremental backups, so every save stamps it
+        self.updated_at = datetime.utcnow()
+        data = self.to_document()
+        collection = mongo.db[self.collection_name]
+        if data.get('_id'):
+            _id = ObjectId(data.pop('_id'))
+            collection.update_one({'_id': _id}, {'$set': data})
+            return _id
+        else:
+            data.pop('_id', None)
+            res = collection.insert_one(data)
+            self._id = res.inserted_id
+            return res.inserted_id
+
+    @classmethod
+    def delete_where(cls, mongo, query):
+        """Delete matching documents, leaving tombstones for incremental backups."""
+        return delete_documents(mongo, cls.collection_name, query)
+
+
+def touch(fields=None):
+    """Return a $set payload with updated_at stamped, for raw update_one/update_many calls."""
+    data = dict(fields or {})
+    data['updated_at'] = datetime.utcnow()
+    return data
+
+
+def delete_documents(mongo, collection_name, query):
+    """Delete documents matching query and record their ids in the deletions collection.
+
+    Incremental backups replay these tombstones so deletions are not lost.
+    Returns the number of deleted documents.
+    """
+    ids = [d['_id'] for d in mongo.db[collection_name].find(query, {'_id': 1})]
+    if not ids:
+        return 0
+    res = mongo.db[collection_name].delete_many({'_id': {'$in': ids}})
+    now = datetime.utcnow()
+    mongo.db.deletions.insert_many([
+        {'collection': collection_name, 'doc_id': _id, 'deleted_at': now}
+        for _id in ids
+    ])
+    return res.deleted_count
+
+def prefix_regex(text):
+    """Anchored, case-sensitive regex so a prefix search can use an index range."""
+    return {"$regex": "^" + re.escape(text)}
+
+
+def encode_cursor(*values):
+    """Encode keyset values (str/ObjectId) as an opaque URL-safe cursor."""
+    raw = json.dumps([str(v) if isinstance(v, ObjectId) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor from encode_cursor; the trailing value is an ObjectId."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values[-1] = ObjectId(values[-1])
+        return values
+    except (ValueError, TypeError, KeyError, IndexError, InvalidId):
+        raise ValueError("Invalid cursor")
+
 class User(BaseModel):
     collection_name = 'users'
 
@@ -42,11 +118,59 @@ class User(BaseModel):
         self.has_paid = data.get('has_paid', False)  # Entry fee paid for current tournament
         self.attendance_schedule = data.get('attendance_schedule', {})
 
+    def to_document(self):
+        data = super().to_document()
+        data['search_keys'] = self.search_keys(self.name, self.email)
+        return data
+
+    @staticmethod
+    def search_keys(name, email):
+        """Lowercased name, name words and email, indexed for admin prefix search."""
+        name = (name or '').strip().lower()
+        keys = {name, (email or '').strip().lower()}
+        keys.update(name.split())
+        keys.discard('')
+        return sorted(keys)
+
+    @classmethod
+    def list_page(cls, mongo, query, projection, limit, cursor=None):
+        """Return one page of users ordered by (name, _id), and the cursor for the next page.
+
+        Cursors are opaque keyset markers, so paging stays an index range scan
+        instead of a growing skip. Raises ValueError for a malformed cursor.
+        """
+        if cursor:
+            name, last_id = decode_cursor(cursor)
+            query = {"$and": [query, {"$or": [
+                {"name": {"$gt": name}},
+                {"name": name, "_id": {"$gt": last_id}},
+            ]}]}
+        docs = list(
+            mongo.db.users.find(query, projection)
+            .sort([("name", 1), ("_id", 1)])
+            .limit(limit + 1)
+        )
+        next_cursor = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_cursor = encode_cursor(docs[-1].get('name', ''), docs[-1]['_id'])
+        return docs, next_cursor
+
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
+
+    def upgrade_password_hash(self, mongo, password):
+        """After a successful login, re-hash the password if the hasher settings changed."""
+        if not needs_rehash(self.password_hash):
+            return False
+        self.set_password(password)
+        mongo.db.users.update_one(
+            {"_id": self._id}, {"$set": touch({"password_hash": self.password_hash})}
+        )
+        return True
 
     @classmethod
     def find_by_email(cls, mongo, email):
@@ -68,17 +192,6 @@ class User(BaseModel):
         data = mongo.db.users.find_one({"apple_id": apple_id})
         return cls(data) if data else None
 
-    def save(self, mongo):
-        data = self.to_dict()
-        if data.get('_id'):
-            _id = ObjectId(data.pop('_id'))
-            mongo.db.users.update_one({'_id': _id}, {'$set': data})
-            return _id
-        else:
-            data.pop('_id', None)
-            res = mongo.db.users.insert_one(data)
-            self._id = res.inserted_id
-            return res.inserted_id
 
 class Tournament(BaseModel):
     collection_name = 'tournaments'
@@ -95,10 +208,56 @@ class Tournament(BaseModel):
         self.cancelled_dates = data.get('cancelled_dates', [])  # List of cancelled day_index values
         self.start_times = data.get('start_times', []) # List of ISO time strings for each date
         self.check_in_open = data.get('check_in_open', False)
+        # Bumped on every change to the tournament or its games/teams; keys derived caches
+        self.change_version = data.get('change_version', 0)
+        # Bumped by live score ticks only; keys the few caches that show in-progress scores
+        self.score_version = data.get('score_version', 0)
+        self.restored_at = data.get('restored_at')  # Set when the tournament was loaded from a backup
+        self.completed_at = data.get('completed_at')  # Set when status becomes 'completed'
+
+    def to_document(self):
+        data = super().to_document()
+        # Only ever $inc'd (bump_version), so a stale in-memory value never overwrites it
+        data.pop('change_version', None)
+        data.pop('score_version', None)
+        return data
+
+    def save(self, mongo):
+        _id = super().save(mongo)
+        self.bump_version(mongo, _id)
+        return _id
 
     @classmethod
-    def find_active(cls, mongo):
-        data = mongo.db.tournaments.find_one({"status": {"$in": ["upcoming", "active", "blackout"]}})
+    def bump_version(cls, mongo, tournament_id):
+        """Mark the tournament as changed so caches keyed on change_version are bypassed."""
+        if tournament_id:
+            mongo.db.tournaments.update_one(
+                {"_id": ObjectId(str(tournament_id))}, {"$inc": {"change_version": 1}}
+            )
+
+    @classmethod
+    def bump_score_version(cls, mongo, tournament_id):
+        """Mark a live score change. Standings and round status don't depend on it, so change_version stays."""
+        if tournament_id:
+            mongo.db.tournaments.update_one(
+                {"_id": ObjectId(str(tournament_id))}, {"$inc": {"score_version": 1}}
+            )
+
+    @classmethod
+    def bump_active_version(cls, mongo):
+        """bump_version for the active tournament, e.g. after a change to player names it shows."""
+        mongo.db.tournaments.update_many(
+            {"status": {"$in": ["upcoming", "active", "blackout"]}}, {"$inc": {"change_version": 1}}
+        )
+
+    @classmethod
+    def find_active(cls, mongo, persist=True, session=None):
+        """The current tournament, advanced to today's day index.
+
+        Pass persist=False when mongo may be a lagging read client; the advance is
+        then applied in memory only, so stale fields are never written back.
+        """
+        data = mongo.db.tournaments.find_one({"status": {"$in": ["upcoming", "active", "blackout"]}}, session=session)
         if not data:
             return None
         
@@ -117,26 +276,34 @@ class Tournament(BaseModel):
                     tournament.current_day_index = today_idx
                     tournament.current_round = 0
                     tournament.check_in_open = False
-                    tournament.save(mongo)
+                    if persist:
+                        tournament.save(mongo)
         except Exception as e:
             print(f"[Tournament.find_active] Error auto-advancing day: {e}")
             
         return tournament
 
+
+class TournamentScopedModel(BaseModel):
+    """Documents belonging to a tournament; writes bump the tournament's change_version."""
+
     def save(self, mongo):
-        data = self.to_dict()
-        if data.get('_id'):
-            _id = ObjectId(data.pop('_id'))
-            mongo.db.tournaments.update_one({'_id': _id}, {'$set': data})
-            return _id
-        else:
-            data.pop('_id', None)
-            res = mongo.db.tournaments.insert_one(data)
-            self._id = res.inserted_id
-            return res.inserted_id
+        _id = super().save(mongo)
+        Tournament.bump_version(mongo, self.tournament_id)
+        return _id
+
+    @classmethod
+    def delete_where(cls, mongo, query):
+        deleted = super().delete_where(mongo, query)
+        if deleted and isinstance(query.get('tournament_id'), str):
+            Tournament.bump_version(mongo, query['tournament_id'])
+        return deleted
 
-class Game(BaseModel):
+
+class Game(TournamentScopedModel):
     collection_name = 'games'
+    # Non-admins may still submit scores this long after end_time; then the scheduler finalizes the game
+    SCORE_LOCK_GRACE = timedelta(seconds=60)
 
     def __init__(self, data=None):
         super().__init__(data)
@@ -157,21 +324,124 @@ class Game(BaseModel):
         self.is_sudden_death = data.get('is_sudden_death', False)  # True if sudden death 1v1 match
         self.day_index = data.get('day_index', 0)  # Which tournament day (0-indexed)
         self.round_number = data.get('round_number', 1)  # Which round (1-indexed)
+        self.team1_id = data.get('team1_id')  # Team document IDs; None for sudden death games
+        self.team2_id = data.get('team2_id')
 
-    def save(self, mongo):
-        data = self.to_dict()
-        if data.get('_id'):
-            _id = ObjectId(data.pop('_id'))
-            mongo.db.games.update_one({'_id': _id}, {'$set': data})
-            return _id
-        else:
-            data.pop('_id', None)
-            res = mongo.db.games.insert_one(data)
-            self._id = res.inserted_id
-            return res.inserted_id
+    def to_document(self):
+        data = super().to_document()
+        data['player_ids'] = self.all_player_ids(self.team1_player_ids, self.team2_player_ids)
+        data['team_ids'] = [tid for tid in (self.team1_id, self.team2_id) if tid]
+        return data
+
+    @staticmethod
+    def all_player_ids(team1_player_ids, team2_player_ids):
+        """Both rosters as one list, stored as player_ids for multikey-indexed player lookups."""
+        return [str(pid) for pid in (team1_player_ids or []) + (team2_player_ids or [])]
+
+    @classmethod
+    def backfill_player_ids(cls, collection, batch_size=1000):
+        """Set player_ids on games in collection that lack it; returns the number updated."""
+        ops = []
+        updated = 0
+        for doc in collection.find({"player_ids": {"$exists": False}},
+                                   {"team1_player_ids": 1, "team2_player_ids": 1}):
+            ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {
+                "player_ids": cls.all_player_ids(doc.get('team1_player_ids'), doc.get('team2_player_ids'))
+            }}))
+            if len(ops) >= batch_size:
+                updated += collection.bulk_write(ops, ordered=False).modified_count
+                ops = []
+        if ops:
+            updated += collection.bulk_write(ops, ordered=False).modified_count
+        return updated
+
+    @staticmethod
+    def parse_time(value):
+        """A start_time/end_time as a naive UTC datetime.
+
+        Games stored before times were native hold strings, either
+        '%Y-%m-%dT%H:%M:%SZ' or isoformat(); unparseable values give None.
+        """
+        if value is None or isinstance(value, datetime):
+            return value
+        try:
+            return datetime.fromisoformat(value.rstrip('Z'))
+        except (AttributeError, ValueError):
+            return None
+
+    @classmethod
+    def scores_locked(cls, game_data, now=None):
+        """Whether an active game's time (plus grace) is up, locking scores for non-admins."""
+        end_time = game_data.get('end_time')
+        if game_data.get('status') != 'active' or not isinstance(end_time, datetime):
+            return False
+        return (now or datetime.utcnow()) > end_time + cls.SCORE_LOCK_GRACE
+
+    @classmethod
+    def backfill_native_times(cls, collection, batch_size=1000):
+        """Convert string start_time/end_time on games in collection to datetimes; returns the number updated."""
+        ops = []
+        updated = 0
+        for doc in collection.find(
+            {"$or": [{"start_time": {"$type": "string"}}, {"end_time": {"$type": "string"}}]},
+            {"start_time": 1, "end_time": 1}
+        ):
+            ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {
+                field: cls.parse_time(doc[field]) for field in ('start_time', 'end_time')
+                if isinstance(doc.get(field), str)
+            }}))
+            if len(ops) >= batch_size:
+                updated += collection.bulk_write(ops, ordered=False).modified_count
+                ops = []
+        if ops:
+            updated += collection.bulk_write(ops, ordered=False).modified_count
+        return updated
+
+    @classmethod
+    def backfill_team_ids(cls, collection, teams, batch_size=1000):
+        """Set team1_id/team2_id on games lacking them by matching rosters to the day's teams.
 
+        Returns the number updated. Games whose roster matches no team get None,
+        as do sudden death games (see Team.compute_stats).
+        """
+        rosters = {}  # (tournament_id, day_index) -> {sorted player ids: team id}
 
-class Team(BaseModel):
+        def team_for(tournament_id, day_index, player_ids):
+            key = (tournament_id, day_index)
+            if key not in rosters:
+                rosters[key] = {
+                    tuple(sorted(t.get('player_ids', []))): str(t['_id'])
+                    for t in teams.find({"tournament_id": tournament_id, "day_index": day_index},
+                                        {"player_ids": 1})
+                }
+            return rosters[key].get(tuple(sorted(player_ids or [])))
+
+        ops = []
+        updated = 0
+        for doc in collection.find(
+            {"team_ids": {"$exists": False}},
+            {"tournament_id": 1, "day_index": 1, "team1_player_ids": 1, "team2_player_ids": 1, "is_sudden_death": 1}
+        ):
+            day_index = doc.get('day_index', 0)
+            if doc.get('is_sudden_death'):
+                team1_id = team2_id = None
+            else:
+                team1_id = team_for(doc.get('tournament_id'), day_index, doc.get('team1_player_ids'))
+                team2_id = team_for(doc.get('tournament_id'), day_index, doc.get('team2_player_ids'))
+            ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {
+                "team1_id": team1_id,
+                "team2_id": team2_id,
+                "team_ids": [tid for tid in (team1_id, team2_id) if tid]
+            }}))
+            if len(ops) >= batch_size:
+                updated += collection.bulk_write(ops, ordered=False).modified_count
+                ops = []
+        if ops:
+            updated += collection.bulk_write(ops, ordered=False).modified_count
+        return updated
+
+
+class Team(TournamentScopedModel):
     """Persistent daily teams - teams stay the same for all rounds in a day."""
     collection_name = 'teams'
 
@@ -183,6 +453,11 @@ class Team(BaseModel):
         self.player_ids = data.get('player_ids', [])  # 2 players for normal, 1 for power
         self.is_power_team = data.get('is_power_team', False)
         self.team_number = data.get('team_number')  # For display: Team 1, Team 2, etc.
+        # Totals over the team's finalized games, maintained by refresh_stats
+        self.games_played = data.get('games_played', 0)
+        self.wins = data.get('wins', 0)
+        self.total_points = data.get('total_points', 0)
+        self.margin_of_victory = data.get('margin_of_victory', 0)
 
     @classmethod
     def find_for_day(cls, mongo, tournament_id, day_index):
@@ -192,21 +467,95 @@ class Team(BaseModel):
         }))
         return [cls(t) for t in teams]
 
+    @classmethod
+    def find_for_roster(cls, mongo, tournament_id, day_index, player_ids):
+        """The day's team with exactly these players, in any order, or None."""
+        wanted = sorted(str(pid) for pid in player_ids)
+        for team in mongo.db.teams.find({
+            'tournament_id': str(tournament_id),
+            'day_index': day_index,
+            'player_ids': {'$size': len(wanted)}
+        }):
+            if sorted(team.get('player_ids', [])) == wanted:
+                return cls(team)
+        return None
+
+    @classmethod
+    def refresh_stats(cls, mongo, team_ids):
+        """Recompute stats for the given teams from their finalized games.
+
+        Recomputing rather than incrementing keeps totals right when a finalized
+        score is corrected or a roster is swapped.
+        """
+        cls.compute_stats(mongo.db.games, mongo.db.teams, team_ids)
+
+    @classmethod
+    def compute_stats(cls, games, teams, team_ids):
+        """refresh_stats against explicit games/teams collections (e.g. restore staging).
+
+        Sudden death games carry no team ids, so they never count towards team
+        stats. They are a 1v1 tiebreak for the player standings, not a team
+        result. Big Reveal rankings from before team stats were stored keyed
+        teams by roster, so they counted a power player's sudden death game for
+        their team and listed other players' games as one-player teams.
+        """
+        team_ids = {str(tid) for tid in team_ids if tid}
+        if not team_ids:
+            return
+        stats = {
+            tid: {"games_played": 0, "wins": 0, "total_points": 0, "margin_of_victory": 0}
+            for tid in team_ids
+        }
+        for g in games.find(
+            {"team_ids": {"$in": list(team_ids)}, "status": "finalized"},
+            {"team1_id": 1, "team2_id": 1, "score1": 1, "score2": 1}
+        ):
+            score1 = int(g.get('score1', 0) or 0)
+            score2 = int(g.get('score2', 0) or 0)
+            for tid, own, opp in ((g.get('team1_id'), score1, score2), (g.get('team2_id'), score2, score1)):
+                team = stats.get(tid)
+                if team is None:
+                    continue
+                team["games_played"] += 1
+                team["total_points"] += own
+                team["margin_of_victory"] += own - opp
+                if own > opp:
+                    team["wins"] += 1
+        teams.bulk_write([
+            UpdateOne({"_id": ObjectId(tid)}, {"$set": touch(values)})
+            for tid, values in stats.items()
+        ], ordered=False)
+
+    @classmethod
+    def backfill_stats(cls, games, teams, batch_size=1000):
+        """compute_stats for every team lacking stats; returns the number of teams updated."""
+        team_ids = [str(t['_id']) for t in teams.find({"games_played": {"$exists": False}}, {'_id': 1})]
+        for start in range(0, len(team_ids), batch_size):
+            cls.compute_stats(games, teams, team_ids[start:start + batch_size])
+        return len(team_ids)
+
+    @classmethod
+    def refresh_stats_for_games(cls, mongo, games):
+        """refresh_stats for every team appearing in the given game documents."""
+        cls.refresh_stats(mongo, [
+            tid for g in games for tid in (g.get('team1_id'), g.get('team2_id'))
+        ])
+
+    @classmethod
+    def top_for_day(cls, mongo, tournament_id, day_index, limit):
+        """Best teams of a day by total points, wins, then margin of victory."""
+        return [cls(t) for t in mongo.db.teams.find({
+            'tournament_id': str(tournament_id),
+            'day_index': day_index,
+            'games_played': {'$gt': 0}
+        }).sort([
+            ('total_points', -1), ('wins', -1), ('margin_of_victory', -1)
+        ]).limit(limit)]
+
     @classmethod
     def delete_for_day(cls, mongo, tournament_id, day_index):
-        mongo.db.teams.delete_many({
+        cls.delete_where(mongo, {
             'tournament_id': str(tournament_id),
             'day_index': day_index
         })
 
-    def save(self, mongo):
-        data = self.to_dict()
-        if data.get('_id'):
-            _id = ObjectId(data.pop('_id'))
-            mongo.db.teams.update_one({'_id': _id}, {'$set': data})
-            return _id
-        else:
-            data.pop('_id', None)
-            res = mongo.db.teams.insert_one(data)
-            self._id = res.inserted_id
-            return res.inserted_id
@@ -0,0 +1,93 @@
+"""
+Password hashing.
+
+The algorithm and its cost come from Config (PASSWORD_HASHER plus the
+scrypt/bcrypt parameters). Hashes made with older settings still verify and
+can be upgraded on the next successful login (see needs_rehash).
+
+Hashing is deliberately slow, so it runs in a bounded worker pool instead of
+inline. Under eventlet, the Socket.IO server's async mode, the work goes to
+eventlet's OS thread pool, so the hub keeps serving sockets while a login
+hashes. Both scrypt and bcrypt release the GIL. At most
+PASSWORD_HASH_WORKERS hashes run at once, and further logins queue.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+from werkzeug.security import generate_password_hash, check_password_hash
+from config import Config
+
+_executor = None
+_green_slots = None
+_lock = threading.Lock()
+
+
+def _scrypt_method():
+    return f"scrypt:{Config.PASSWORD_SCRYPT_N}:{Config.PASSWORD_SCRYPT_R}:{Config.PASSWORD_SCRYPT_P}"
+
+
+def _is_bcrypt(password_hash):
+    return password_hash.startswith(('$2a$', '$2b$', '$2y$'))
+
+
+def _hash(password):
+    if Config.PASSWORD_HASHER == 'bcrypt':
+        salt = bcrypt.gensalt(rounds=Config.PASSWORD_BCRYPT_ROUNDS)
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('ascii')
+    return generate_password_hash(password, method=_scrypt_method())
+
+
+def _verify(password_hash, password):
+    if _is_bcrypt(password_hash):
+        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('ascii'))
+    # werkzeug formats: scrypt:n:r:p$salt$hash and legacy pbkdf2
+    return check_password_hash(password_hash, password)
+
+
+def _use_eventlet():
+    from app import socketio
+    return getattr(socketio, 'async_mode', None) == 'eventlet'
+
+
+def _run(fn, *args):
+    """Run fn in the bounded hashing pool and wait for its result."""
+    global _executor, _green_slots
+    if _use_eventlet():
+        from eventlet import semaphore, tpool
+        if _green_slots is None:
+            _green_slots = semaphore.Semaphore(Config.PASSWORD_HASH_WORKERS)
+        with _green_slots:
+            return tpool.execute(fn, *args)
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=Config.PASSWORD_HASH_WORKERS, thread_name_prefix='password-hash'
+                )
+    return _executor.submit(fn, *args).result()
+
+
+def hash_password(password):
+    """Hash a password with the configured hasher."""
+    return _run(_hash, password)
+
+
+def verify_password(password_hash, password):
+    """Check a password against a hash made by any supported hasher."""
+    if not password_hash or password is None:
+        return False
+    return _run(_verify, password_hash, password)
+
+
+def needs_rehash(password_hash):
+    """True if the hash was not made with the configured hasher and cost."""
+    if not password_hash:
+        return False
+    if Config.PASSWORD_HASHER == 'bcrypt':
+        if not _is_bcrypt(password_hash):
+            return True
+        try:
+            return int(password_hash.split('$')[2]) != Config.PASSWORD_BCRYPT_ROUNDS
+        except (IndexError, ValueError):
+            return True
+    return not password_hash.startswith(_scrypt_method() + '$')
@@ -0,0 +1,162 @@
+"""
+Daily backup report (the paper record sheet kept at the scorer's table).
+
+Tournament totals come from the columnar game store (app.analytics) and the
+selected day's games are indexed by (player, round), so building it is
+linear in players + games rather than players x rounds x games.
+"""
+import csv
+import io
+from datetime import datetime
+from app.models import User
+from app.analytics import game_columns
+
+
+def _format_day_date(tournament, day_index):
+    date_str = "Unknown Date"
+    if day_index < len(tournament.dates):
+        date_str = tournament.dates[day_index]
+        try:
+            dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+            date_str = dt.strftime("%B %d, %Y")
+        except Exception:
+            pass
+    return date_str
+
+
+def build_daily_backup_report(mongo, tournament, day_index):
+    """Build the daily backup report for one tournament day."""
+    users = mongo.db.users.find({}, {
+        "name": 1, "first_name": 1, "last_name": 1, "role": 1, "checked_in": 1
+    })
+
+    # Initialize players backup records
+    players_data = {}
+    checked_in = set()
+    for u in users:
+        user = User(u)
+        if user.role != 'player':
+            continue
+        uid = str(u['_id'])
+        if user.checked_in:
+            checked_in.add(uid)
+        players_data[uid] = {
+            "user_id": uid,
+            "name": user.name,
+            "daily_scores": [],
+            "daily_wins": 0,
+            "daily_points": 0,
+            "aggregate_wins": 0,
+            "aggregate_games_played": 0,
+            "aggregate_points": 0
+        }
+
+    columns = game_columns(mongo, tournament)
+    totals = columns.player_totals()
+    for i, pid in enumerate(columns.player_ids):
+        player = players_data.get(pid)
+        if player is not None:
+            player["aggregate_games_played"] = int(totals["games_played"][i])
+            player["aggregate_points"] = int(totals["total_points"][i])
+            player["aggregate_wins"] = int(totals["wins"][i])
+    day_results = columns.day_results(day_index)
+
+    rounds_count = tournament.rounds_per_day or 2
+
+    active_players = []
+    for uid, player in players_data.items():
+        daily_scores = []
+        played_today = False
+        for r in range(1, rounds_count + 1):
+            result = day_results.get((uid, r))
+            if result:
+                own_score, opp_score = result
+                won = own_score > opp_score
+                if won:
+                    player["daily_wins"] += 1
+                player["daily_points"] += own_score
+                played_today = True
+                daily_scores.append({
+                    "round": r,
+                    "score": f"{own_score}-{opp_score}",
+                    "win": won,
+                    "played": True
+                })
+            else:
+                daily_scores.append({
+                    "round": r,
+                    "score": "-",
+                    "win": False,
+                    "played": False
+                })
+        player["daily_scores"] = daily_scores
+
+        # Filter out users who have not played at all in the tournament AND didn't check in or play on this day
+        if player["aggregate_games_played"] > 0 or played_today or uid in checked_in:
+            active_players.append(player)
+
+    # Sort players by aggregate standings: Wins descending, then Games Played ascending, then Points descending
+    sorted_players = sorted(
+        active_players,
+        key=lambda x: (x['aggregate_wins'], -x['aggregate_games_played'], x['aggregate_points']),
+        reverse=True
+    )
+
+    return {
+        "tournament_name": tournament.name or "Bags & Brats Tournament",
+        "day_number": day_index + 1,
+        "date": _format_day_date(tournament, day_index),
+        "rounds_per_day": rounds_count,
+        "players": sorted_players
+    }
+
+
+def _report_header_rows(report):
+    return [
+        [f"Bags & Brats Cornhole Tournament Day {report['day_number']} Record Backup"],
+        [f"Date: {report['date']}"],
+        [f"Exported: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}"],
+        [],
+        ["Rank", "Player Name"]
+        + [f"Round {r}" for r in range(1, report['rounds_per_day'] + 1)]
+        + ["Day Wins", "Day Points", "Aggregate Wins", "Aggregate Games Played", "Aggregate Points"],
+    ]
+
+
+def _report_player_rows(report):
+    for rank, p in enumerate(report['players'], 1):
+        yield (
+            [rank, p['name']]
+            + [s['score'] for s in p['daily_scores']]
+            + [p['daily_wins'], p['daily_points'], p['aggregate_wins'],
+               p['aggregate_games_played'], p['aggregate_points']]
+        )
+
+
+def iter_daily_backup_csv(report):
+    """Yield the report as CSV text, one row at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in _report_header_rows(report):
+        writer.writerow(row)
+    yield buffer.getvalue()
+    for row in _report_player_rows(report):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+        yield buffer.getvalue()
+
+
+def daily_backup_xlsx(report):
+    """Return the report as XLSX bytes (requires openpyxl)."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(f"Day {report['day_number']}")
+    for row in _report_header_rows(report):
+        sheet.append(row)
+    for row in _report_player_rows(report):
+        sheet.append(row)
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue()
@@ -0,0 +1,109 @@
+"""
+Cache of encoded responses for public GET endpoints.
+
+A view tagged @cached_response stores its final JSON bytes per endpoint and
+query string, keyed by the active tournament's change_version. Any write to the
+tournament, its games or its teams bumps that version, so the next request
+misses and re-renders. This includes every write that emits a socket
+broadcast, so no entry can outlive the data it was rendered from. Broadcasts
+also drop the tournament's entries from this process right away (invalidate),
+so dead versions do not sit in the LRU.
+
+Live score ticks bump score_version instead of change_version. Only views
+tagged @cached_response(live_scores=True), which show in-progress scores, also
+key on it, so scoring does not drop cached standings.
+
+Spectator reads take the version and, on a miss, render the body through
+reader() inside one causally consistent session (app.spectator.read_session), so
+a lagging secondary can never cache a body older than the version it is keyed
+on. Without a spectator client both come from the primary.
+
+Each entry also keeps the body's compressed variants (app.compression), so a
+brotli or gzip encoding is produced once per change, not once per request.
+
+Only 200 responses are cached. Views whose output depends on the clock (check-in
+windows, server_time) must not be tagged.
+"""
+from functools import wraps
+from flask import g, request, make_response
+from config import Config
+from app.cache import named_cache
+from app.compression import compress_response
+from app.spectator import reader
+
+ACTIVE_STATUSES = ["upcoming", "active", "blackout"]
+
+
+def _responses():
+    return named_cache('responses', Config.RESPONSE_CACHE_MAX_ENTRIES)
+
+
+def _active_version(client, live_scores=False, session=None):
+    tournament = client.db.tournaments.find_one(
+        {"status": {"$in": ACTIVE_STATUSES}}, {"change_version": 1, "score_version": 1, "restored_at": 1},
+        session=session
+    )
+    if not tournament:
+        return None, None
+    version = (tournament.get('change_version', 0), tournament.get('restored_at'))
+    if live_scores:
+        version += (tournament.get('score_version', 0),)
+    return str(tournament['_id']), version
+
+
+def cached_response(view=None, live_scores=False):
+    """Serve the view's encoded response from cache while the active tournament is unchanged.
+
+    Use @cached_response(live_scores=True) for views that show in-progress scores.
+    """
+    if view is None:
+        return lambda view: cached_response(view, live_scores)
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        from app import mongo
+        client = reader()
+        if client is mongo:
+            return _serve(view, live_scores, client, args, kwargs)
+        # Later reads in the session see at least what the version read saw
+        with client.cx.start_session(causal_consistency=True) as session:
+            g.read_session = session
+            try:
+                return _serve(view, live_scores, client, args, kwargs, session)
+            finally:
+                g.read_session = None
+    return wrapper
+
+
+def _serve(view, live_scores, client, args, kwargs, session=None):
+    tournament_id, version = _active_version(client, live_scores, session)
+    key = (
+        tournament_id, live_scores, version, request.endpoint,
+        tuple(sorted(request.args.items(multi=True))), tuple(sorted(kwargs.items()))
+    )
+    cache = _responses()
+    cached = cache.get(key)
+    if cached is not None:
+        body, mimetype, variants = cached
+        response = make_response(body)
+        response.mimetype = mimetype
+        response.headers['X-Cache'] = 'HIT'
+        return compress_response(response, variants)
+
+    response = make_response(view(*args, **kwargs))
+    response.headers['X-Cache'] = 'MISS'
+    if response.status_code == 200 and not response.direct_passthrough:
+        variants = {}
+        cache.set(key, (response.get_data(), response.mimetype, variants))
+        compress_response(response, variants)
+    return response
+
+
+def invalidate(tournament_id, live_only=False):
+    """Drop this process's cached responses for a tournament (with live_only, just those showing live scores)."""
+    _responses().discard(lambda key: key[0] == str(tournament_id) and (key[1] or not live_only))
+
+
+def clear():
+    """Drop every cached response in this process (e.g. after a restore)."""
+    _responses().clear()
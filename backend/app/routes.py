@@ -1,12 +1,24 @@
-from flask import Blueprint, jsonify, request, Response
+from flask import Blueprint, jsonify, request, Response, stream_with_context
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-from app.models import User, Tournament, Game
-from app import mongo, bcrypt
+from app.models import User, Tournament, Game, Team, touch, prefix_regex
+from app import mongo
+from app.spectator import spectator_read, reader, read_session
+from app.response_cache import cached_response
+from app.dashboard import (
+    OPEN_GAME_STATUSES, player_games_filter, tournament_view, current_game_view,
+    day_summary_view, standings_window, server_time
+)
 from config import Config
 from bson import ObjectId
 from datetime import datetime, timedelta
-import json
-import pytz
+
+# Fields an admin roster request may select with ?fields=
+ADMIN_USER_FIELDS = {
+    'first_name', 'last_name', 'name', 'email', 'phone', 'google_id', 'apple_id',
+    'role', 'is_proxy', 'checked_in', 'checked_in_at', 'is_power_player',
+    'power_player_used', 'has_paid', 'attendance_schedule', 'attendance_history',
+    'created_at', 'updated_at',
+}
 
 bp = Blueprint('main', __name__)
 
@@ -49,6 +61,7 @@ def login():
     user = User.find_by_email(mongo, data['email'])
     if not user or not user.check_password(data['password']):
         return jsonify({"error": "Invalid credentials"}), 401
+    user.upgrade_password_hash(mongo, data['password'])
     
     access_token = create_access_token(identity=str(user._id))
     return jsonify({
@@ -90,25 +103,11 @@ def get_current_game():
     if not tournament:
         return jsonify(None), 200
         
-    game_data = mongo.db.games.find_one({
-        "tournament_id": str(tournament._id),
-        "status": {"$in": ["upcoming", "active"]},
-        "$or": [
-            {"team1_player_ids": user_id},
-            {"team2_player_ids": user_id}
-        ]
-    })
-    
-    if not game_data:
-        return jsonify(None), 200
-        
-    # Enrich with player names
-    game_obj = Game(game_data).to_dict()
-    game_obj['team1_player_names'] = [User.find_by_id(mongo, pid).name for pid in game_data.get('team1_player_ids', [])]
-    game_obj['team2_player_names'] = [User.find_by_id(mongo, pid).name for pid in game_data.get('team2_player_ids', [])]
-    game_obj['server_time'] = datetime.utcnow().isoformat() + 'Z'
+    query = player_games_filter(tournament, user_id)
+    query["status"] = {"$in": OPEN_GAME_STATUSES}
+    game_data = mongo.db.games.find_one(query)
     
-    return jsonify(game_obj), 200
+    return jsonify(current_game_view(mongo, game_data)), 200
 
 @bp.route('/player/day-summary', methods=['GET'])
 @jwt_required()
@@ -118,59 +117,61 @@ def get_day_summary():
     tournament = Tournament.find_active(mongo)
     
     if not tournament:
-        return jsonify({"state": "no_tournament", "games": [], "rounds_total": 0, "rounds_completed": 0}), 200
+        return jsonify(day_summary_view(None, user_id, [])), 200
     
-    day_index = tournament.current_day_index
-    rounds_total = tournament.rounds_per_day
+    query = player_games_filter(tournament, user_id)
+    query["day_index"] = tournament.current_day_index
+    player_games = list(mongo.db.games.find(query))
     
-    # Get all player's games for today
-    player_games = list(mongo.db.games.find({
-        "tournament_id": str(tournament._id),
-        "day_index": day_index,
-        "$or": [
-            {"team1_player_ids": user_id},
-            {"team2_player_ids": user_id}
-        ]
-    }).sort("round_number", 1))
-    
-    # Count completed rounds
-    rounds_with_games = set(g.get('round_number') for g in player_games)
-    finalized_rounds = set(g.get('round_number') for g in player_games if g.get('status') == 'finalized')
-    
-    # Determine state
-    active_game = next((g for g in player_games if g.get('status') in ['upcoming', 'active']), None)
-    
-    if active_game:
-        state = "active"
-    elif len(finalized_rounds) >= rounds_total:
-        state = "day_complete"
-    elif len(finalized_rounds) > 0:
-        state = "between_rounds"
-    else:
-        state = "waiting"
-    
-    # Build game summaries (for completed games only, to show between rounds)
-    game_summaries = []
-    for g in player_games:
-        if g.get('status') == 'finalized':
-            is_team1 = user_id in g.get('team1_player_ids', [])
-            my_score = g.get('score1') if is_team1 else g.get('score2')
-            opp_score = g.get('score2') if is_team1 else g.get('score1')
-            won = my_score > opp_score if my_score is not None and opp_score is not None else None
-            
-            game_summaries.append({
-                "round": g.get('round_number'),
-                "my_score": my_score,
-                "opponent_score": opp_score,
-                "won": won
-            })
+    return jsonify(day_summary_view(tournament, user_id, player_games)), 200
+
+@bp.route('/player/dashboard', methods=['GET'])
+@jwt_required()
+def get_player_dashboard():
+    """Everything the player dashboard shows, in one round trip.
+    
+    Combines /auth/me, /tournaments/active, /player/current-game,
+    /player/day-summary and the player's slice of /tournaments/standings
+    (their row plus ?neighbours= rows either side, default 2).
+    """
+    user_id = get_jwt_identity()
+    user = User.find_by_id(mongo, user_id)
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+    
+    user_dict = user.to_dict()
+    user_dict.pop('password_hash', None)
+    
+    tournament = Tournament.find_active(mongo)
+    if not tournament:
+        return jsonify({
+            "user": user_dict,
+            "tournament": None,
+            "current_game": None,
+            "day_summary": day_summary_view(None, user_id, []),
+            "standings": standings_window([], user_id, 0),
+            "server_time": server_time()
+        }), 200
+    
+    # One query covers both today's games and any open game
+    query = player_games_filter(tournament, user_id)
+    query["$and"] = [{"$or": [
+        {"day_index": tournament.current_day_index},
+        {"status": {"$in": OPEN_GAME_STATUSES}}
+    ]}]
+    player_games = list(mongo.db.games.find(query).sort("round_number", 1))
+    open_game = next((g for g in player_games if g.get('status') in OPEN_GAME_STATUSES), None)
+    
+    from app.utils import compute_standings
+    neighbours = max(0, min(request.args.get('neighbours', 2, type=int), 10))
     
     return jsonify({
-        "state": state,
-        "games": game_summaries,
-        "rounds_total": rounds_total,
-        "rounds_completed": len(finalized_rounds),
-        "current_round": max(rounds_with_games) if rounds_with_games else 0
+        "user": user_dict,
+        "tournament": tournament_view(mongo, tournament),
+        "current_game": current_game_view(mongo, open_game),
+        "day_summary": day_summary_view(tournament, user_id, player_games),
+        "standings": standings_window(compute_standings(mongo, tournament), user_id, neighbours),
+        "server_time": server_time()
     }), 200
 
 @bp.route('/auth/me', methods=['GET'])
@@ -204,6 +205,9 @@ def update_profile():
         user.phone = data['phone'].strip() if data['phone'] else None
     
     user.save(mongo)
+    if 'first_name' in data or 'last_name' in data or data.get('name'):
+        # Cached standings and game lists show player names
+        Tournament.bump_active_version(mongo)
     return jsonify({"msg": "Profile updated successfully", "user": user.to_dict()}), 200
 
 @bp.route('/user/password', methods=['PUT'])
@@ -369,20 +373,10 @@ def submit_score(game_id):
         return jsonify({"error": "Game not found"}), 404
         
     # Lock scores if time is up, except for admins
-    if game_data.get('end_time') and game_data.get('status') == 'active':
-        try:
-            end_time_str = game_data['end_time']
-            if end_time_str.endswith('Z'):
-                end_time = datetime.strptime(end_time_str, '%Y-%m-%dT%H:%M:%SZ')
-            else:
-                end_time = datetime.fromisoformat(end_time_str)
-                
-            if datetime.utcnow() > (end_time + timedelta(seconds=60)):
-                current_user = User.find_by_id(mongo, current_user_id)
-                if not current_user or current_user.role != 'admin':
-                    return jsonify({"error": "Time has expired. Scores are locked."}), 403
-        except Exception as e:
-            print(f"Error checking score lock: {e}")
+    if Game.scores_locked(game_data):
+        current_user = User.find_by_id(mongo, current_user_id)
+        if not current_user or current_user.role != 'admin':
+            return jsonify({"error": "Time has expired. Scores are locked."}), 403
 
     # Check if user is a participant in this game
     all_players = game_data.get('team1_player_ids', []) + game_data.get('team2_player_ids', [])
@@ -400,13 +394,15 @@ def submit_score(game_id):
     game.score2 = score2
     game.status = 'finalized'
     game.submitted_by = current_user_id
-    game.end_time = datetime.utcnow().isoformat()
+    game.end_time = datetime.utcnow().replace(microsecond=0)
     game.save(mongo)
+    Team.refresh_stats(mongo, [game.team1_id, game.team2_id])
     
     # Broadcast standings update
     try:
-        from app.events import broadcast_standings_update
+        from app.events import broadcast_standings_update, broadcast_games
         broadcast_standings_update(str(game.tournament_id))
+        broadcast_games(mongo, [game.to_dict()])
     except Exception as e:
         print(f"Standings broadcast failed: {e}")
     
@@ -434,20 +430,10 @@ def update_live_score(game_id):
         return jsonify({"error": "Game not found"}), 404
         
     # Lock scores if time is up, except for admins
-    if game_data.get('end_time') and game_data.get('status') == 'active':
-        try:
-            end_time_str = game_data['end_time']
-            if end_time_str.endswith('Z'):
-                end_time = datetime.strptime(end_time_str, '%Y-%m-%dT%H:%M:%SZ')
-            else:
-                end_time = datetime.fromisoformat(end_time_str)
-                
-            if datetime.utcnow() > (end_time + timedelta(seconds=60)):
-                current_user = User.find_by_id(mongo, current_user_id)
-                if not current_user or current_user.role != 'admin':
-                    return jsonify({"error": "Time has expired. Scores are locked."}), 403
-        except Exception as e:
-            print(f"Error checking score lock: {e}")
+    if Game.scores_locked(game_data):
+        current_user = User.find_by_id(mongo, current_user_id)
+        if not current_user or current_user.role != 'admin':
+            return jsonify({"error": "Time has expired. Scores are locked."}), 403
 
     # Check if user is a participant
     all_players = game_data.get('team1_player_ids', []) + game_data.get('team2_player_ids', [])
@@ -461,13 +447,14 @@ def update_live_score(game_id):
         
     mongo.db.games.update_one(
         {"_id": ObjectId(game_id)},
-        {"$set": {"score1": score1, "score2": score2}}
+        {"$set": touch({"score1": score1, "score2": score2})}
     )
+    Tournament.bump_score_version(mongo, game_data['tournament_id'])
     
     # Broadcast live score update to specific room
     try:
-        from app.events import broadcast_live_score
-        broadcast_live_score(str(game_data['tournament_id']), game_id, score1, score2)
+        from app.events import broadcast_live_score, station_of
+        broadcast_live_score(str(game_data['tournament_id']), game_id, score1, score2, station=station_of(game_data))
     except Exception as e:
         print(f"Live score broadcast failed: {e}")
         
@@ -475,149 +462,47 @@ def update_live_score(game_id):
 
 
 @bp.route('/tournaments/active/games', methods=['GET'])
+@spectator_read
+@cached_response(live_scores=True)
 def get_active_tournament_games():
-    tournament = Tournament.find_active(mongo)
+    db, session = reader(), read_session()
+    tournament = Tournament.find_active(db, persist=False, session=session)
     if not tournament:
         return jsonify([]), 200
         
-    games = list(mongo.db.games.find({"tournament_id": str(tournament._id)}))
+    games = list(db.db.games.find({"tournament_id": str(tournament._id)}, session=session))
     
     # Enrich with player names
-    enriched_games = []
-    for g in games:
-        game_obj = Game(g).to_dict()
-        game_obj['team1_player_names'] = []
-        for pid in g.get('team1_player_ids', []):
-            u = User.find_by_id(mongo, pid)
-            game_obj['team1_player_names'].append(u.name if u else "Unknown")
-            
-        game_obj['team2_player_names'] = []
-        for pid in g.get('team2_player_ids', []):
-            u = User.find_by_id(mongo, pid)
-            game_obj['team2_player_names'].append(u.name if u else "Unknown")
-        game_obj['server_time'] = datetime.utcnow().isoformat() + 'Z'
-        enriched_games.append(game_obj)
-        
-    return jsonify(enriched_games), 200
+    from app.utils import enrich_games
+    return jsonify(enrich_games(db, games, session)), 200
 
 @bp.route('/tournaments/active', methods=['GET'])
+@spectator_read
 def get_active_tournament():
-    tournament = Tournament.find_active(mongo)
+    db = reader()
+    tournament = Tournament.find_active(db, persist=False)
     if not tournament:
         return jsonify(None), 200
     
-    data = tournament.to_dict()
-    
-    # Add is_tournament_day flag so frontend knows whether to show check-in
-    tz = pytz.timezone(Config.TOURNAMENT_TIMEZONE)
-    today = datetime.now(tz).strftime('%Y-%m-%d')
-    data['is_tournament_day'] = today in (tournament.dates or [])
-    data['today'] = today
-    
-    # Check if check-in is currently open (either manual override or time window)
-    from app.scheduler import is_checkin_window_open
-    is_open, _ = is_checkin_window_open(mongo)
-    data['check_in_currently_open'] = is_open
-    data['server_time'] = datetime.utcnow().isoformat() + 'Z'
-    
-    return jsonify(data), 200
+    return jsonify(tournament_view(db, tournament)), 200
 
 @bp.route('/tournaments/standings', methods=['GET'])
+@spectator_read
+@cached_response
 def get_standings():
-    tournament = Tournament.find_active(mongo)
+    db, session = reader(), read_session()
+    tournament = Tournament.find_active(db, persist=False, session=session)
     if not tournament:
         return jsonify([]), 200
-        
-    games = list(mongo.db.games.find({
-        "tournament_id": str(tournament._id),
-        "status": "finalized"
-    }))
-    
-    standings = {} # {user_id: {name: "", wins: 0, games_played: 0, total_points: 0, margin: 0, daily_stats: {}}}
     
-    for game in games:
-        # Determine winning team
-        win_ids = []
-        if game['score1'] > game['score2']:
-            win_ids = game['team1_player_ids']
-        elif game['score2'] > game['score1']:
-            win_ids = game['team2_player_ids']
-            
-        all_players = [str(pid) for pid in game['team1_player_ids'] + game['team2_player_ids']]
-        win_ids = [str(pid) for pid in win_ids]
-        
-        day_index = game.get('day_index', 0)
-        
-        for pid in all_players:
-            if pid not in standings:
-                user = User.find_by_id(mongo, pid)
-                standings[pid] = {
-                    "name": user.name if user else "Unknown",
-                    "wins": 0,
-                    "games_played": 0,
-                    "total_points": 0,
-                    "margin": 0,
-                    "daily_stats": {}
-                }
-            
-            if day_index not in standings[pid]["daily_stats"]:
-                standings[pid]["daily_stats"][day_index] = {
-                    "day_index": day_index,
-                    "wins": 0,
-                    "games_played": 0,
-                    "total_points": 0,
-                    "margin": 0
-                }
-            
-            standings[pid]["games_played"] += 1
-            standings[pid]["daily_stats"][day_index]["games_played"] += 1
-            
-            if pid in [str(x) for x in game['team1_player_ids']]:
-                own_score = game['score1']
-                opp_score = game['score2']
-            else:
-                own_score = game['score2']
-                opp_score = game['score1']
-                
-            margin_val = own_score - opp_score
-            
-            standings[pid]["total_points"] += own_score
-            standings[pid]["daily_stats"][day_index]["total_points"] += own_score
-            
-            standings[pid]["margin"] += margin_val
-            standings[pid]["daily_stats"][day_index]["margin"] += margin_val
-
-            if pid in win_ids:
-                standings[pid]["wins"] += 1
-                standings[pid]["daily_stats"][day_index]["wins"] += 1
-                
-    # Convert daily_stats dict to sorted list
-    standings_list = []
-    for pid, v in standings.items():
-        daily_list = sorted(v["daily_stats"].values(), key=lambda x: x["day_index"])
-        standings_list.append({
-            "user_id": pid,
-            "name": v["name"],
-            "wins": v["wins"],
-            "games_played": v["games_played"],
-            "total_points": v["total_points"],
-            "margin": v["margin"],
-            "daily_stats": daily_list
-        })
-        
-    # Sort standings by: total_points desc, wins desc, margin desc, fewest games asc
-    sorted_standings = sorted(
-        standings_list,
-        key=lambda x: (x['total_points'], x['wins'], x['margin'], -x['games_played']),
-        reverse=True
-    )
-    
-    return jsonify(sorted_standings), 200
+    from app.utils import compute_standings
+    return jsonify(compute_standings(db, tournament, session)), 200
 
 
 @bp.route('/admin/tournament/daily-backup', methods=['GET'])
 @jwt_required()
 def get_daily_backup():
+    """Daily record backup as JSON, or as a CSV/XLSX download with ?format=csv|xlsx."""
     current_user_id = get_jwt_identity()
     current_user = User.find_by_id(mongo, current_user_id)
     if not current_user or current_user.role != 'admin':
@@ -628,142 +513,26 @@ def get_daily_backup():
         return jsonify({"error": "No active tournament"}), 404
 
     day_index = request.args.get('day_index', tournament.current_day_index, type=int)
+    fmt = request.args.get('format', 'json')
+    if fmt not in ('json', 'csv', 'xlsx'):
+        return jsonify({"error": f"Unsupported export format '{fmt}'"}), 400
 
-    # 1. Fetch all finalized games in this tournament to compute aggregate standings
-    all_finalized_games = list(mongo.db.games.find({
-        "tournament_id": str(tournament._id),
-        "status": "finalized"
-    }))
-
-    # 2. Get all players (users with role 'player')
-    all_users = list(mongo.db.users.find())
-    users_dict = {str(u['_id']): User(u) for u in all_users}
-
-    # Initialize players backup records
-    players_data = {}
-    for uid, user in users_dict.items():
-        if user.role == 'player':
-            players_data[uid] = {
-                "user_id": uid,
-                "name": user.name,
-                "daily_scores": [],
-                "daily_wins": 0,
-                "daily_points": 0,
-                "aggregate_wins": 0,
-                "aggregate_games_played": 0,
-                "aggregate_points": 0
-            }
+    from app.reports import build_daily_backup_report, daily_backup_xlsx, iter_daily_backup_csv
+    report = build_daily_backup_report(mongo, tournament, day_index)
 
-    # Calculate aggregate stats from all finalized games
-    for game in all_finalized_games:
-        win_ids = []
-        if game['score1'] > game['score2']:
-            win_ids = [str(pid) for pid in game['team1_player_ids']]
-        elif game['score2'] > game['score1']:
-            win_ids = [str(pid) for pid in game['team2_player_ids']]
-
-        team1_pids = [str(pid) for pid in game['team1_player_ids']]
-        team2_pids = [str(pid) for pid in game['team2_player_ids']]
-
-        for pid in team1_pids + team2_pids:
-            if pid in players_data:
-                players_data[pid]["aggregate_games_played"] += 1
-                if pid in team1_pids:
-                    players_data[pid]["aggregate_points"] += game['score1']
-                else:
-                    players_data[pid]["aggregate_points"] += game['score2']
-
-                if pid in win_ids:
-                    players_data[pid]["aggregate_wins"] += 1
-
-    # Calculate daily scores round-by-round for the selected day_index
-    rounds_count = tournament.rounds_per_day or 2
-
-    # Fetch finalized games specifically for this day_index
-    daily_games = list(mongo.db.games.find({
-        "tournament_id": str(tournament._id),
-        "day_index": day_index,
-        "status": "finalized"
-    }))
+    if fmt == 'json':
+        return jsonify(report), 200
 
-    for uid, player in players_data.items():
-        daily_scores = []
-        for r in range(1, rounds_count + 1):
-            # Find the game for this player in round r on this day
-            game = None
-            for g in daily_games:
-                if g['round_number'] == r:
-                    team1_pids = [str(pid) for pid in g['team1_player_ids']]
-                    team2_pids = [str(pid) for pid in g['team2_player_ids']]
-                    if uid in team1_pids or uid in team2_pids:
-                        game = g
-                        break
-
-            if game:
-                team1_pids = [str(pid) for pid in game['team1_player_ids']]
-                if uid in team1_pids:
-                    own_score = game['score1']
-                    opp_score = game['score2']
-                else:
-                    own_score = game['score2']
-                    opp_score = game['score1']
-
-                won = own_score > opp_score
-                score_str = f"{own_score}-{opp_score}"
-                if won:
-                    player["daily_wins"] += 1
-                player["daily_points"] += own_score
-
-                daily_scores.append({
-                    "round": r,
-                    "score": score_str,
-                    "win": won,
-                    "played": True
-                })
-            else:
-                daily_scores.append({
-                    "round": r,
-                    "score": "-",
-                    "win": False,
-                    "played": False
-                })
-        player["daily_scores"] = daily_scores
-
-    # Filter out users who have not played at all in the tournament AND didn't check in or play on this day
-    active_players = []
-    for uid, player in players_data.items():
-        user_obj = users_dict[uid]
-        is_checked_in = getattr(user_obj, 'checked_in', False)
-        played_today = any(s['played'] for s in player['daily_scores'])
-        
-        if player["aggregate_games_played"] > 0 or played_today or is_checked_in:
-            active_players.append(player)
-
-    # Sort players by aggregate standings: Wins descending, then Games Played ascending, then Points descending
-    sorted_players = sorted(
-        active_players,
-        key=lambda x: (x['aggregate_wins'], -x['aggregate_games_played'], x['aggregate_points']),
-        reverse=True
+    filename = f"bags_brats_day_{day_index + 1}_backup.{fmt}"
+    headers = {'Content-Disposition': f'attachment; filename="{filename}"'}
+    if fmt == 'csv':
+        return Response(iter_daily_backup_csv(report), mimetype='text/csv', headers=headers)
+    return Response(
+        daily_backup_xlsx(report),
+        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        headers=headers
     )
 
-    # Get tournament day date
-    date_str = "Unknown Date"
-    if day_index < len(tournament.dates):
-        date_str = tournament.dates[day_index]
-        try:
-            dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-            date_str = dt.strftime("%B %d, %Y")
-        except Exception:
-            pass
-
-    return jsonify({
-        "tournament_name": tournament.name or "Bags & Brats Tournament",
-        "day_number": day_index + 1,
-        "date": date_str,
-        "rounds_per_day": rounds_count,
-        "players": sorted_players
-    }), 200
-
 
 @bp.route('/admin/generate-pairings', methods=['POST'])
 @jwt_required()
@@ -833,42 +602,26 @@ def generate_sudden_death_route():
         return jsonify({"error": "Sudden Death match has already been created for today."}), 400
 
     # Calculate standings
-    games = list(mongo.db.games.find({
-        "tournament_id": str(tournament._id),
-        "status": "finalized"
-    }))
-    
-    standings = {}
-    for game in games:
-        # Determine winning team
-        win_ids = []
-        if game['score1'] > game['score2']:
-            win_ids = game['team1_player_ids']
-        elif game['score2'] > game['score1']:
-            win_ids = game['team2_player_ids']
-            
-        all_players = [str(pid) for pid in game['team1_player_ids'] + game['team2_player_ids']]
-        win_ids = [str(pid) for pid in win_ids]
-        
-        for pid in all_players:
-            if pid not in standings:
-                user = User.find_by_id(mongo, pid)
-                standings[pid] = {"name": user.name if user else "Unknown", "wins": 0, "games_played": 0, "total_points": 0}
-            
-            standings[pid]["games_played"] += 1
-            if pid in [str(pid) for pid in game['team1_player_ids']]:
-                standings[pid]["total_points"] += game['score1']
-            else:
-                standings[pid]["total_points"] += game['score2']
-
-            if pid in win_ids:
-                standings[pid]["wins"] += 1
-                
+    from app.analytics import game_columns
+    from app.utils import get_user_names
+    columns = game_columns(mongo, tournament)
+    totals = columns.player_totals()
     sorted_standings = sorted(
-        [{"user_id": str(k), **v} for k, v in standings.items()],
+        [
+            {
+                "user_id": columns.player_ids[i],
+                "wins": int(totals["wins"][i]),
+                "games_played": int(totals["games_played"][i]),
+                "total_points": int(totals["total_points"][i])
+            }
+            for i in range(columns.n_players) if totals["games_played"][i]
+        ],
         key=lambda x: (x['total_points'], x['wins'], -x['games_played']),
         reverse=True
     )
+    names = get_user_names(mongo, [row['user_id'] for row in sorted_standings[:2]])
+    for row in sorted_standings[:2]:
+        row['name'] = names.get(row['user_id'], "Unknown")
 
     if len(sorted_standings) < 2:
         return jsonify({"error": "Need at least 2 players in standings to generate sudden death."}), 400
@@ -947,24 +700,26 @@ def start_round():
     if len(games) == 0:
         return jsonify({"error": f"No upcoming games found for Round {round_number}"}), 400
     
-    now = datetime.utcnow()
-    start_time_dt = now + timedelta(seconds=15)
-    start_time = start_time_dt.strftime('%Y-%m-%dT%H:%M:%SZ')
-    end_time = (start_time_dt + timedelta(minutes=20)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    start_time = datetime.utcnow().replace(microsecond=0) + timedelta(seconds=15)
+    end_time = start_time + timedelta(minutes=20)
     
     for g in games:
         mongo.db.games.update_one(
             {"_id": g["_id"]},
-            {"$set": {
+            {"$set": touch({
                 "status": "active",
                 "start_time": start_time,
                 "end_time": end_time
-            }}
+            })}
         )
+    Tournament.bump_version(mongo, tournament._id)
     
     try:
-        from app.events import broadcast_standings_update
+        from app.events import broadcast_standings_update, broadcast_games
         broadcast_standings_update(str(tournament._id))
+        broadcast_games(mongo, [
+            dict(g, status="active", start_time=start_time, end_time=end_time) for g in games
+        ])
     except Exception as e:
         print(f"Start round broadcast failed: {e}")
     
@@ -1000,18 +755,22 @@ def stop_round():
         "status": "active"
     }))
     
+    end_time = datetime.utcnow().replace(microsecond=0)
     for g in games:
         mongo.db.games.update_one(
             {"_id": g["_id"]},
-            {"$set": {
+            {"$set": touch({
                 "status": "finalized",
-                "end_time": datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
-            }}
+                "end_time": end_time
+            })}
         )
+    Team.refresh_stats_for_games(mongo, games)
+    Tournament.bump_version(mongo, tournament._id)
     
     try:
-        from app.events import broadcast_standings_update
+        from app.events import broadcast_standings_update, broadcast_games
         broadcast_standings_update(str(tournament._id))
+        broadcast_games(mongo, [dict(g, status="finalized", end_time=end_time) for g in games])
     except Exception as e:
         print(f"Stop round broadcast failed: {e}")
     
@@ -1067,17 +826,17 @@ def reset_round():
             power_player_obj_ids = [ObjectId(pid) for pid in power_player_ids]
             mongo.db.users.update_many(
                 {"_id": {"$in": power_player_obj_ids}},
-                {"$set": {"power_player_used": False}}
+                {"$set": touch({"power_player_used": False})}
             )
             
         # Delete all teams for today
-        mongo.db.teams.delete_many({
+        Team.delete_where(mongo, {
             "tournament_id": str(tournament._id),
             "day_index": day_index
         })
         
     # Delete all games for today's round
-    mongo.db.games.delete_many({
+    Game.delete_where(mongo, {
         "tournament_id": str(tournament._id),
         "day_index": day_index,
         "round_number": round_number
@@ -1088,8 +847,11 @@ def reset_round():
     tournament.save(mongo)
     
     try:
-        from app.events import broadcast_standings_update
+        from app.events import broadcast_standings_update, clear_player_games
         broadcast_standings_update(str(tournament._id))
+        clear_player_games([
+            pid for g in games for pid in Game.all_player_ids(g.get('team1_player_ids'), g.get('team2_player_ids'))
+        ])
     except Exception as e:
         print(f"Reset round broadcast failed: {e}")
         
@@ -1114,30 +876,13 @@ def get_round_status():
     
     day_index = request.args.get('day_index', tournament.current_day_index, type=int)
     
-    rounds = []
-    for r in range(1, tournament.rounds_per_day + 1):
-        games = list(mongo.db.games.find({
-            "tournament_id": str(tournament._id),
-            "day_index": day_index,
-            "round_number": r
-        }))
-        
-        if len(games) == 0:
-            status = "pending"
-        elif all(g['status'] == 'finalized' for g in games):
-            status = "complete"
-        elif any(g['status'] == 'active' for g in games):
-            status = "active"
-        else:
-            status = "ready"  # Pairings generated but not started
-        
-        rounds.append({
-            "round_number": r,
-            "status": status,
-            "total_games": len(games),
-            "finalized_games": sum(1 for g in games if g['status'] == 'finalized'),
-            "active_games": sum(1 for g in games if g['status'] == 'active')
-        })
+    # Polled every few seconds per admin tab; recomputed only after the tournament changes
+    from app.cache import named_cache
+    from app.utils import summarize_rounds
+    rounds = named_cache('round_status').get_or_compute(
+        (str(tournament._id), day_index, tournament.change_version),
+        lambda: summarize_rounds(mongo, tournament, day_index)
+    )
     
     return jsonify({
         "tournament_id": str(tournament._id),
@@ -1164,16 +909,16 @@ def start_game(game_id):
     
     game = Game(game_data)
     game.status = 'active'
-    start_time_dt = datetime.utcnow() + timedelta(seconds=15)
-    game.start_time = start_time_dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+    game.start_time = datetime.utcnow().replace(microsecond=0) + timedelta(seconds=15)
     # 20 minutes duration
-    game.end_time = (start_time_dt + timedelta(minutes=20)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    game.end_time = game.start_time + timedelta(minutes=20)
     game.save(mongo)
     
     # Broadcast game start
     try:
-        from app.events import broadcast_standings_update
+        from app.events import broadcast_standings_update, broadcast_games
         broadcast_standings_update(str(game.tournament_id))
+        broadcast_games(mongo, [game.to_dict()])
     except Exception as e:
         print(f"Start game broadcast failed: {e}")
     
@@ -1197,27 +942,29 @@ def start_all_games():
         "status": "upcoming"
     }))
     
-    now = datetime.utcnow()
-    start_time_dt = now + timedelta(seconds=15)
-    start_time = start_time_dt.strftime('%Y-%m-%dT%H:%M:%SZ')
-    end_time = (start_time_dt + timedelta(minutes=20)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    start_time = datetime.utcnow().replace(microsecond=0) + timedelta(seconds=15)
+    end_time = start_time + timedelta(minutes=20)
     
     count = 0
     for g in games:
         mongo.db.games.update_one(
             {"_id": g["_id"]},
-            {"$set": {
+            {"$set": touch({
                 "status": "active",
                 "start_time": start_time,
                 "end_time": end_time
-            }}
+            })}
         )
         count += 1
         
     if count > 0:
+        Tournament.bump_version(mongo, tournament._id)
         try:
-            from app.events import broadcast_standings_update
+            from app.events import broadcast_standings_update, broadcast_games
             broadcast_standings_update(str(tournament._id))
+            broadcast_games(mongo, [
+                dict(g, status="active", start_time=start_time, end_time=end_time) for g in games
+            ])
         except Exception as e:
             print(f"Start all broadcast failed: {e}")
             
@@ -1243,20 +990,24 @@ def stop_all_games():
     }))
     
     count = 0
+    end_time = datetime.utcnow().replace(microsecond=0)
     for g in games:
         mongo.db.games.update_one(
             {"_id": g["_id"]},
-            {"$set": {
+            {"$set": touch({
                 "status": "finalized",
-                "end_time": datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
-            }}
+                "end_time": end_time
+            })}
         )
         count += 1
         
     if count > 0:
+        Team.refresh_stats_for_games(mongo, games)
+        Tournament.bump_version(mongo, tournament._id)
         try:
-            from app.events import broadcast_standings_update
+            from app.events import broadcast_standings_update, broadcast_games
             broadcast_standings_update(str(tournament._id))
+            broadcast_games(mongo, [dict(g, status="finalized", end_time=end_time) for g in games])
         except Exception as e:
             print(f"Stop all broadcast failed: {e}")
             
@@ -1305,7 +1056,7 @@ def toggle_checkin():
     # Update tournament check_in_open flag
     mongo.db.tournaments.update_one(
         {"_id": tournament._id},
-        {"$set": {"check_in_open": check_in_open}}
+        {"$set": touch({"check_in_open": check_in_open}), "$inc": {"change_version": 1}}
     )
     
     return jsonify({"msg": f"Check-in {'opened' if check_in_open else 'closed'}", "check_in_open": check_in_open}), 200
@@ -1313,7 +1064,10 @@ def toggle_checkin():
 @bp.route('/admin/tournament/top-teams', methods=['GET'])
 @jwt_required()
 def get_top_teams():
-    """Get top 3 teams for the current tournament day (for Big Reveal)."""
+    """Get the top teams of a tournament day (for Big Reveal).
+
+    Query params: day_index (defaults to the current day) and limit (default 3).
+    """
     current_user_id = get_jwt_identity()
     current_user = User.find_by_id(mongo, current_user_id)
     if not current_user or current_user.role != 'admin':
@@ -1323,106 +1077,216 @@ def get_top_teams():
     if not tournament:
         return jsonify({"error": "No active tournament"}), 400
     
-    day_index = tournament.current_day_index
-    
-    # Get all finalized games for today
-    games = list(mongo.db.games.find({
-        "tournament_id": str(tournament._id),
-        "day_index": day_index,
-        "status": "finalized"
-    }))
+    try:
+        day_index = int(request.args.get('day_index', tournament.current_day_index))
+        limit = max(1, int(request.args.get('limit', 3)))
+    except ValueError:
+        return jsonify({"error": "day_index and limit must be integers"}), 400
     
-    # Calculate team stats (points, wins, margin of victory)
-    team_stats = {}  # key = tuple of sorted player_ids, value = dict
+    from app.utils import get_user_names
+    # Team stats are kept up to date as games finalize (Team.refresh_stats)
+    teams = Team.top_for_day(mongo, tournament._id, day_index, limit)
+    names = get_user_names(mongo, [pid for t in teams for pid in t.player_ids])
     
-    for g in games:
-        t1_ids = tuple(sorted(g.get('team1_player_ids', [])))
-        t2_ids = tuple(sorted(g.get('team2_player_ids', [])))
-        score1 = int(g.get('score1', 0) or 0)
-        score2 = int(g.get('score2', 0) or 0)
-        
-        if t1_ids not in team_stats:
-            team_stats[t1_ids] = {"total_points": 0, "wins": 0, "margin_of_victory": 0}
-        if t2_ids not in team_stats:
-            team_stats[t2_ids] = {"total_points": 0, "wins": 0, "margin_of_victory": 0}
-            
-        # Sum points
-        team_stats[t1_ids]["total_points"] += score1
-        team_stats[t2_ids]["total_points"] += score2
-        
-        # Calculate wins
-        if score1 > score2:
-            team_stats[t1_ids]["wins"] += 1
-        elif score2 > score1:
-            team_stats[t2_ids]["wins"] += 1
-            
-        # Calculate margin of victory (point differential)
-        team_stats[t1_ids]["margin_of_victory"] += (score1 - score2)
-        team_stats[t2_ids]["margin_of_victory"] += (score2 - score1)
-    
-    # Sort by total points desc, then wins desc, then margin of victory desc
-    sorted_teams = sorted(
-        team_stats.items(),
-        key=lambda x: (x[1]["total_points"], x[1]["wins"], x[1]["margin_of_victory"]),
-        reverse=True
-    )
-    
-    # Build top 3
     top_teams = []
-    for rank, (player_ids, stats) in enumerate(sorted_teams[:3], 1):
-        player_names = []
-        for pid in player_ids:
-            u = User.find_by_id(mongo, pid)
-            if u:
-                player_names.append(u.name)
-        
+    for rank, team in enumerate(teams, 1):
         top_teams.append({
             "rank": rank,
-            "player_ids": list(player_ids),
-            "player_names": player_names,
-            "total_points": stats["total_points"],
-            "wins": stats["wins"],
-            "margin_of_victory": stats["margin_of_victory"]
+            "team_id": str(team._id),
+            "player_ids": team.player_ids,
+            "player_names": [names[pid] for pid in team.player_ids if pid in names],
+            "total_points": team.total_points,
+            "wins": team.wins,
+            "margin_of_victory": team.margin_of_victory
         })
     
     return jsonify(top_teams), 200
 
+@bp.route('/admin/tournament/complete', methods=['POST'])
+@jwt_required()
+def complete_tournament():
+    """Close the active tournament and roll its final standings into career stats."""
+    current_user_id = get_jwt_identity()
+    current_user = User.find_by_id(mongo, current_user_id)
+    if not current_user or current_user.role != 'admin':
+        return jsonify({"error": "Admin access required"}), 403
+    
+    tournament = Tournament.find_active(mongo)
+    if not tournament:
+        return jsonify({"error": "No active tournament"}), 400
+    
+    if mongo.db.games.find_one({"tournament_id": str(tournament._id), "status": "active"}):
+        return jsonify({"error": "Finalize all active games before completing the tournament."}), 400
+    
+    tournament.status = 'completed'
+    tournament.completed_at = datetime.utcnow()
+    tournament.save(mongo)
+    
+    from app.career import roll_up_tournament
+    players = roll_up_tournament(mongo, tournament)
+    
+    return jsonify({"msg": f"Tournament '{tournament.name}' completed", "players": players}), 200
+
+@bp.route('/admin/career/rebuild', methods=['POST'])
+@jwt_required()
+def rebuild_career():
+    """Regenerate every career rollup from the completed tournaments."""
+    current_user_id = get_jwt_identity()
+    current_user = User.find_by_id(mongo, current_user_id)
+    if not current_user or current_user.role != 'admin':
+        return jsonify({"error": "Admin access required"}), 403
+    
+    from app.career import rebuild_career_stats
+    count = rebuild_career_stats(mongo)
+    return jsonify({"msg": f"Rebuilt career stats from {count} completed tournaments"}), 200
+
+@bp.route('/career/leaderboard', methods=['GET'])
+@jwt_required()
+def get_career_leaderboard():
+    """All-time leaderboard across completed tournaments.
+
+    Query params: sort (total_points, wins, margin or games_played; default
+    total_points) and limit (default 25, at most 100).
+    """
+    from app.career import LEADERBOARD_SORTS
+    from app.utils import get_user_names
+    
+    sort = request.args.get('sort', 'total_points')
+    if sort not in LEADERBOARD_SORTS:
+        return jsonify({"error": f"sort must be one of: {', '.join(LEADERBOARD_SORTS)}"}), 400
+    try:
+        limit = min(max(1, int(request.args.get('limit', 25))), 100)
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    
+    rows = list(mongo.db.career_stats.find({}, {"updated_at": 0}).sort(LEADERBOARD_SORTS[sort]).limit(limit))
+    names = get_user_names(mongo, [row['_id'] for row in rows])
+    
+    leaderboard = []
+    for rank, row in enumerate(rows, 1):
+        user_id = row.pop('_id')
+        leaderboard.append({"rank": rank, "user_id": user_id, "name": names.get(user_id, "Unknown"), **row})
+    
+    return jsonify({"sort": sort, "leaderboard": leaderboard}), 200
+
+@bp.route('/career/players/<user_id>', methods=['GET'])
+@jwt_required()
+def get_player_career(user_id):
+    """A player's career totals plus one line per completed tournament they played."""
+    target_user = User.find_by_id(mongo, user_id)
+    if not target_user:
+        return jsonify({"error": "User not found"}), 404
+    
+    from app.career import CAREER_STATS, career_view
+    career = career_view(mongo, user_id) or {
+        "user_id": user_id, "tournaments_played": 0, "tournaments": [],
+        **{stat: 0 for stat in CAREER_STATS}
+    }
+    career["name"] = target_user.name
+    return jsonify(career), 200
+
+@bp.route('/admin/cache/stats', methods=['GET'])
+@jwt_required()
+def get_cache_stats():
+    """Size and hit/miss counts of this process's caches (responses, round status, game columns)."""
+    current_user_id = get_jwt_identity()
+    current_user = User.find_by_id(mongo, current_user_id)
+    if not current_user or current_user.role != 'admin':
+        return jsonify({"error": "Admin access required"}), 403
+    
+    from app.cache import cache_stats
+    return jsonify(cache_stats()), 200
+
+@bp.route('/admin/scheduler/leader', methods=['GET'])
+@jwt_required()
+def get_scheduler_leader():
+    """Which process holds the scheduler lease, and this process's lease and job counters."""
+    current_user_id = get_jwt_identity()
+    current_user = User.find_by_id(mongo, current_user_id)
+    if not current_user or current_user.role != 'admin':
+        return jsonify({"error": "Admin access required"}), 403
+    
+    from app.leader import lease_status
+    from app.scheduler import SCHEDULER_LEASE
+    return jsonify(lease_status(mongo, SCHEDULER_LEASE)), 200
+
 @bp.route('/admin/users', methods=['GET'])
 @jwt_required()
 def list_users():
+    """One page of the roster, ordered by name.
+
+    Query params: limit, cursor (next_cursor from the previous page), q (name or
+    email prefix), checked_in / has_paid / is_power_player (true|false), role,
+    and fields (comma-separated; defaults to every field except the password hash).
+    """
     current_user_id = get_jwt_identity()
     current_user = User.find_by_id(mongo, current_user_id)
     if not current_user or current_user.role != 'admin':
         return jsonify({"error": "Admin access required"}), 403
-        
-    active_tournament = Tournament.find_active(mongo)
-    users = list(mongo.db.users.find())
-    
-    user_list = []
-    for u in users:
-        user_obj = User(u)
-        user_dict = user_obj.to_dict()
-        
-        # Calculate actual attendance for past day indices of the active tournament
-        attendance_history = {}
+
+    query = {}
+    for flag in ('checked_in', 'has_paid', 'is_power_player'):
+        value = request.args.get(flag)
+        if value is None:
+            continue
+        if value not in ('true', 'false'):
+            return jsonify({"error": f"{flag} must be 'true' or 'false'"}), 400
+        # Legacy documents may lack the flag entirely, which reads as false
+        query[flag] = True if value == 'true' else {"$ne": True}
+    role = request.args.get('role')
+    if role:
+        if role not in ['admin', 'player']:
+            return jsonify({"error": "Invalid role"}), 400
+        query['role'] = role
+    search = (request.args.get('q') or '').strip().lower()
+    if search:
+        query['search_keys'] = prefix_regex(search)
+
+    fields = None
+    projection = {"password_hash": 0, "search_keys": 0}
+    if request.args.get('fields'):
+        fields = [f.strip() for f in request.args['fields'].split(',') if f.strip()]
+        unknown = [f for f in fields if f not in ADMIN_USER_FIELDS]
+        if unknown:
+            return jsonify({"error": f"Unknown fields: {', '.join(unknown)}"}), 400
+        projection = {f: 1 for f in fields if f != 'attendance_history'}
+        # Legacy users derive name from first/last, and paging sorts on name
+        projection.update({"name": 1, "first_name": 1, "last_name": 1})
+
+    limit = request.args.get('limit', Config.ADMIN_USERS_PAGE_SIZE, type=int)
+    limit = max(1, min(limit, Config.ADMIN_USERS_MAX_PAGE_SIZE))
+    try:
+        docs, next_cursor = User.list_page(mongo, query, projection, limit, request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Players seen in games for each past day index of the active tournament (one aggregation)
+    include_history = fields is None or 'attendance_history' in fields
+    past_dates = []
+    attendance_by_day = {}
+    if include_history:
+        from app.utils import get_attendance_by_day
+        active_tournament = Tournament.find_active(mongo)
         if active_tournament and active_tournament.dates:
-            for idx, dt in enumerate(active_tournament.dates):
-                if idx < active_tournament.current_day_index:
-                    # Check if player participated in any games on this day index
-                    played_game = mongo.db.games.find_one({
-                        "tournament_id": str(active_tournament._id),
-                        "day_index": idx,
-                        "$or": [
-                            {"team1_player_ids": str(user_obj._id)},
-                            {"team2_player_ids": str(user_obj._id)}
-                        ]
-                    })
-                    attendance_history[dt] = True if played_game else False
-        
-        user_dict['attendance_history'] = attendance_history
+            past_dates = list(enumerate(active_tournament.dates))[:active_tournament.current_day_index]
+            attendance_by_day = get_attendance_by_day(mongo, active_tournament)
+
+    user_list = []
+    for u in docs:
+        user_dict = User(u).to_dict()
+        user_dict.pop('password_hash', None)
+        uid = user_dict['_id']
+        if fields is not None:
+            user_dict = {f: user_dict.get(f) for f in ['_id'] + fields if f != 'attendance_history'}
+        if include_history:
+            # Calculate actual attendance for past day indices of the active tournament
+            user_dict['attendance_history'] = {
+                dt: uid in attendance_by_day.get(idx, ())
+                for idx, dt in past_dates
+            }
         user_list.append(user_dict)
-        
-    return jsonify(user_list), 200
+
+    return jsonify({"users": user_list, "next_cursor": next_cursor}), 200
 
 @bp.route('/admin/users/<user_id>/role', methods=['POST'])
 @jwt_required()
@@ -1437,7 +1301,7 @@ def update_user_role(user_id):
     if role not in ['admin', 'player']:
         return jsonify({"error": "Invalid role"}), 400
         
-    mongo.db.users.update_one({"_id": ObjectId(user_id)}, {"$set": {"role": role}})
+    mongo.db.users.update_one({"_id": ObjectId(user_id)}, {"$set": touch({"role": role})})
     return jsonify({"msg": "User role updated"}), 200
 
 @bp.route('/admin/users/<user_id>', methods=['PUT'])
@@ -1485,11 +1349,18 @@ def update_user(user_id):
         update_fields['is_power_player'] = bool(data['is_power_player'])
     if 'power_player_used' in data:
         update_fields['power_player_used'] = bool(data['power_player_used'])
+    if 'name' in update_fields or 'email' in update_fields:
+        update_fields['search_keys'] = User.search_keys(
+            update_fields.get('name', user.name), update_fields.get('email', user.email)
+        )
     
     if update_fields:
-        mongo.db.users.update_one({"_id": ObjectId(user_id)}, {"$set": update_fields})
+        mongo.db.users.update_one({"_id": ObjectId(user_id)}, {"$set": touch(update_fields)})
+        if 'name' in update_fields:
+            # Cached standings and game lists show player names
+            Tournament.bump_active_version(mongo)
     
-    return jsonify({"msg": "User updated successfully", "updated_fields": list(update_fields.keys())}), 200
+    return jsonify({"msg": "User updated successfully", "updated_fields": [k for k in update_fields if k != 'search_keys']}), 200
 
 @bp.route('/admin/users/<user_id>/game-history', methods=['GET'])
 @jwt_required()
@@ -1508,18 +1379,11 @@ def get_player_game_history(user_id):
     if not tournament:
         return jsonify({"player": target_user.to_dict(), "games": [], "summary": {}}), 200
 
-    # Find all finalized games this player was in
-    games = list(mongo.db.games.find({
-        "tournament_id": str(tournament._id),
-        "status": "finalized",
-        "$or": [
-            {"team1_player_ids": user_id},
-            {"team2_player_ids": user_id}
-        ]
-    }))
-
-    # Sort by day_index, then round_number
-    games.sort(key=lambda g: (g.get('day_index', 0), g.get('round_number', 0)))
+    # The player's finalized games, in day then round order
+    from app.analytics import game_columns
+    from app.utils import get_user_names
+    games = game_columns(mongo, tournament).player_games(user_id)
+    names = get_user_names(mongo, [pid for g in games for pid in g['partner_ids'] + g['opponent_ids']])
 
     total_points = 0
     total_wins = 0
@@ -1528,29 +1392,10 @@ def get_player_game_history(user_id):
     history = []
 
     for g in games:
-        is_team1 = user_id in [str(pid) for pid in g.get('team1_player_ids', [])]
-        
-        if is_team1:
-            player_score = g.get('score1', 0)
-            opponent_score = g.get('score2', 0)
-            partner_ids = [pid for pid in g.get('team1_player_ids', []) if str(pid) != user_id]
-            opponent_ids = g.get('team2_player_ids', [])
-        else:
-            player_score = g.get('score2', 0)
-            opponent_score = g.get('score1', 0)
-            partner_ids = [pid for pid in g.get('team2_player_ids', []) if str(pid) != user_id]
-            opponent_ids = g.get('team1_player_ids', [])
-
-        # Resolve names
-        partner_names = []
-        for pid in partner_ids:
-            u = User.find_by_id(mongo, str(pid))
-            partner_names.append(u.name if u else "Unknown")
-
-        opponent_names = []
-        for pid in opponent_ids:
-            u = User.find_by_id(mongo, str(pid))
-            opponent_names.append(u.name if u else "Unknown")
+        player_score = g['player_score']
+        opponent_score = g['opponent_score']
+        partner_names = [names.get(pid, "Unknown") for pid in g['partner_ids']]
+        opponent_names = [names.get(pid, "Unknown") for pid in g['opponent_ids']]
 
         # Determine result
         if player_score > opponent_score:
@@ -1605,7 +1450,8 @@ def delete_user(user_id):
     if not current_user or current_user.role != 'admin':
         return jsonify({"error": "Admin access required"}), 403
         
-    mongo.db.users.delete_one({"_id": ObjectId(user_id)})
+    User.delete_where(mongo, {"_id": ObjectId(user_id)})
+    Tournament.bump_active_version(mongo)
     return jsonify({"msg": "User deleted"}), 200
 
 @bp.route('/admin/users/<user_id>/reset-password', methods=['PUT'])
@@ -1742,6 +1588,32 @@ def update_game(game_id):
                 if not User.find_by_id(mongo, pid):
                     return jsonify({"error": f"Player ID '{pid}' not found"}), 400
             update_fields[team_key] = player_ids
+    if 'team1_player_ids' in update_fields or 'team2_player_ids' in update_fields:
+        game_data = mongo.db.games.find_one(
+            {"_id": ObjectId(game_id)},
+            {"tournament_id": 1, "day_index": 1, "team1_player_ids": 1, "team2_player_ids": 1,
+             "team1_id": 1, "team2_id": 1}
+        )
+        if not game_data:
+            return jsonify({"error": "Game not found"}), 404
+        update_fields['player_ids'] = Game.all_player_ids(
+            update_fields.get('team1_player_ids', game_data.get('team1_player_ids')),
+            update_fields.get('team2_player_ids', game_data.get('team2_player_ids'))
+        )
+        # Point the game at the day's team matching the new roster, if there is one
+        team_ids = {
+            'team1_id': game_data.get('team1_id'),
+            'team2_id': game_data.get('team2_id')
+        }
+        for side in ['team1', 'team2']:
+            if f'{side}_player_ids' in update_fields:
+                team = Team.find_for_roster(
+                    mongo, game_data.get('tournament_id'), game_data.get('day_index', 0),
+                    update_fields[f'{side}_player_ids']
+                )
+                team_ids[f'{side}_id'] = str(team._id) if team else None
+        update_fields.update(team_ids)
+        update_fields['team_ids'] = [tid for tid in team_ids.values() if tid]
     
     # If admin enters scores, consider it finalized unless specified otherwise
     if ('score1' in data or 'score2' in data) and 'status' not in data:
@@ -1750,14 +1622,31 @@ def update_game(game_id):
         update_fields['status'] = data['status']
     
     if update_fields:
-        mongo.db.games.update_one({"_id": ObjectId(game_id)}, {"$set": update_fields})
+        game_data = mongo.db.games.find_one_and_update(
+            {"_id": ObjectId(game_id)}, {"$set": touch(update_fields)},
+            {"tournament_id": 1, "team1_id": 1, "team2_id": 1, "team1_player_ids": 1, "team2_player_ids": 1}
+        )
+        if game_data:
+            # Both the previous and the current teams, in case the roster moved
+            Team.refresh_stats(mongo, [
+                game_data.get('team1_id'), game_data.get('team2_id'),
+                update_fields.get('team1_id'), update_fields.get('team2_id')
+            ])
+            Tournament.bump_version(mongo, game_data['tournament_id'])
         
         # Broadcast standings update
         try:
-            game_data = mongo.db.games.find_one({"_id": ObjectId(game_id)})
             if game_data:
-                from app.events import broadcast_standings_update
+                from app.events import broadcast_standings_update, broadcast_games, clear_player_games
                 broadcast_standings_update(str(game_data['tournament_id']))
+                updated = mongo.db.games.find_one({"_id": ObjectId(game_id)})
+                # Players swapped out of the game no longer have it
+                current_players = set(updated.get('player_ids', []))
+                clear_player_games([
+                    pid for pid in Game.all_player_ids(game_data.get('team1_player_ids'), game_data.get('team2_player_ids'))
+                    if pid not in current_players
+                ])
+                broadcast_games(mongo, [updated])
         except Exception as e:
             print(f"Standings broadcast failed: {e}")
         
@@ -1772,8 +1661,9 @@ def delete_all_players():
         return jsonify({"error": "Admin access required"}), 403
     
     # Delete everyone EXCEPT the current admin
-    res = mongo.db.users.delete_many({"_id": {"$ne": ObjectId(current_user_id)}})
-    return jsonify({"msg": f"Deleted {res.deleted_count} players. Your account was preserved."}), 200
+    deleted_count = User.delete_where(mongo, {"_id": {"$ne": ObjectId(current_user_id)}})
+    Tournament.bump_active_version(mongo)
+    return jsonify({"msg": f"Deleted {deleted_count} players. Your account was preserved."}), 200
 
 @bp.route('/admin/users/seed', methods=['POST'])
 @jwt_required()
@@ -1812,11 +1702,12 @@ def seed_players_ui():
             # Update existing player with full name and power player status
             mongo.db.users.update_one(
                 {"email": email},
-                {"$set": {
+                {"$set": touch({
                     "name": SEED_NAMES[char],
+                    "search_keys": User.search_keys(SEED_NAMES[char], email),
                     "is_power_player": is_power,
                     "power_player_used": False
-                }}
+                })}
             )
             updated += 1
         else:
@@ -1865,8 +1756,8 @@ def delete_all_tournaments():
     if not current_user or current_user.role != 'admin':
         return jsonify({"error": "Admin access required"}), 403
     
-    mongo.db.tournaments.delete_many({})
-    mongo.db.games.delete_many({})
+    Tournament.delete_where(mongo, {})
+    Game.delete_where(mongo, {})
     return jsonify({"msg": "All tournaments and games cleared."}), 200
 
 
@@ -1903,11 +1794,11 @@ def update_tournament_schedule():
         cancelled_dates.append(cancel_idx)
 
         # Clean up any games/teams for this day
-        mongo.db.games.delete_many({
+        Game.delete_where(mongo, {
             "tournament_id": str(tournament._id),
             "day_index": cancel_idx
         })
-        mongo.db.teams.delete_many({
+        Team.delete_where(mongo, {
             "tournament_id": str(tournament._id),
             "day_index": cancel_idx
         })
@@ -1915,7 +1806,7 @@ def update_tournament_schedule():
         # Update tournament
         mongo.db.tournaments.update_one(
             {"_id": tournament._id},
-            {"$set": {"cancelled_dates": cancelled_dates}}
+            {"$set": touch({"cancelled_dates": cancelled_dates}), "$inc": {"change_version": 1}}
         )
 
         cancelled_date = tournament.dates[cancel_idx] if cancel_idx < len(tournament.dates) else "unknown"
@@ -1943,7 +1834,7 @@ def update_tournament_schedule():
 
         mongo.db.tournaments.update_one(
             {"_id": tournament._id},
-            {"$set": {"dates": dates}}
+            {"$set": touch({"dates": dates}), "$inc": {"change_version": 1}}
         )
 
         return jsonify({
@@ -1957,55 +1848,72 @@ def update_tournament_schedule():
 @bp.route('/admin/db/backup', methods=['GET'])
 @jwt_required()
 def full_db_backup():
-    """Export the entire database (all 4 collections) as a JSON file download."""
+    """Stream the entire database (all 4 collections) as a file download.
+
+    Query params:
+    - format: 'json' (default), 'ndjson', or 'bson' (mongodump-style tar archive)
+    - compress: 'gzip' to gzip a JSON/NDJSON stream on the fly into a .gz file.
+      Without it, a JSON/NDJSON stream is still sent with Content-Encoding
+      br/gzip when the client accepts one (the saved file is plain JSON).
+    - since: backup marker (the meta.created_at of an earlier backup); exports
+      only documents created, modified or deleted since then
+    """
     current_user_id = get_jwt_identity()
     current_user = User.find_by_id(mongo, current_user_id)
     if not current_user or current_user.role != 'admin':
         return jsonify({"error": "Admin access required"}), 403
 
-    def serialize_doc(doc):
-        """Convert MongoDB document to JSON-serializable dict."""
-        d = dict(doc)
-        if '_id' in d:
-            d['_id'] = str(d['_id'])
-        # Handle datetime fields
-        for key, val in d.items():
-            if isinstance(val, datetime):
-                d[key] = val.isoformat()
-        return d
-
-    backup = {
-        "meta": {
-            "version": "1.0",
-            "created_at": datetime.utcnow().isoformat(),
-            "created_by": current_user.name,
-            "source": "bags_brats_db_backup"
-        },
-        "collections": {
-            "users": [serialize_doc(u) for u in mongo.db.users.find()],
-            "tournaments": [serialize_doc(t) for t in mongo.db.tournaments.find()],
-            "games": [serialize_doc(g) for g in mongo.db.games.find()],
-            "teams": [serialize_doc(t) for t in mongo.db.teams.find()]
-        }
-    }
+    from app.backup import BACKUP_FORMATS, build_meta, stream_backup
+
+    fmt = request.args.get('format', 'json')
+    if fmt not in BACKUP_FORMATS:
+        return jsonify({"error": f"Unsupported backup format '{fmt}'"}), 400
+    compress = request.args.get('compress') == 'gzip'
+
+    since = None
+    if request.args.get('since'):
+        try:
+            since = datetime.fromisoformat(request.args['since'].replace('Z', ''))
+        except ValueError:
+            return jsonify({"error": "Invalid 'since' marker. Use the created_at of a previous backup."}), 400
+        if fmt == 'bson':
+            return jsonify({"error": "Incremental backups are only available in json or ndjson format"}), 400
+
+    meta = build_meta(current_user.name, since=since)
+    chunks, mimetype, ext = stream_backup(
+        mongo, meta, fmt=fmt, compress=compress,
+        batch_size=Config.BACKUP_BATCH_SIZE
+    )
 
     timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-    filename = f"bags_brats_full_backup_{timestamp}.json"
+    kind = 'incremental' if since else 'full'
+    filename = f"bags_brats_{kind}_backup_{timestamp}.{ext}"
+    headers = {'Content-Disposition': f'attachment; filename="{filename}"'}
+
+    if fmt != 'bson' and not compress and Config.COMPRESSION_MIN_BYTES >= 0:
+        from app.compression import iter_compressed, negotiate
+        headers['Vary'] = 'Accept-Encoding'
+        encoding = negotiate()
+        if encoding:
+            chunks = iter_compressed(chunks, encoding)
+            headers['Content-Encoding'] = encoding
 
     return Response(
-        json.dumps(backup, indent=2, default=str),
-        mimetype='application/json',
-        headers={
-            'Content-Disposition': f'attachment; filename="{filename}"'
-        }
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers=headers
     )
 
 
 @bp.route('/admin/db/restore', methods=['POST'])
 @jwt_required()
 def full_db_restore():
-    """Restore the entire database from a JSON backup file.
+    """Restore the entire database from a JSON/NDJSON backup file (optionally gzipped) or BSON archive.
     
+    Several 'file' parts may be uploaded: a full backup followed by the
+    incremental backups taken after it, in order. The uploads are parsed
+    incrementally into staging collections which are only swapped in once
+    every file has loaded, so a failed restore leaves the live data untouched.
     The requesting admin's account is always preserved to prevent lockout.
     """
     current_user_id = get_jwt_identity()
@@ -2016,88 +1924,27 @@ def full_db_restore():
     if 'file' not in request.files:
         return jsonify({"error": "No backup file provided"}), 400
 
-    file = request.files['file']
-    if not file.filename.endswith('.json'):
-        return jsonify({"error": "Backup file must be a .json file"}), 400
-
-    try:
-        backup_data = json.loads(file.read().decode('utf-8'))
-    except (json.JSONDecodeError, UnicodeDecodeError) as e:
-        return jsonify({"error": f"Invalid JSON file: {str(e)}"}), 400
-
-    # Validate structure
-    if 'collections' not in backup_data:
-        return jsonify({"error": "Invalid backup format: missing 'collections' key"}), 400
-
-    meta = backup_data.get('meta', {})
-    if meta.get('source') != 'bags_brats_db_backup':
-        return jsonify({"error": "Invalid backup format: not a Bags & Brats backup file"}), 400
+    from app.backup import is_backup_filename, iter_backup_records, restore_backup
 
-    collections = backup_data['collections']
-    stats = {}
+    files = request.files.getlist('file')
+    for file in files:
+        if not is_backup_filename(file.filename):
+            return jsonify({"error": "Backup file must be a .json or .ndjson file (optionally .gz) or a .tar archive"}), 400
 
     try:
-        # 1. Restore users — preserve the current admin
-        if 'users' in collections:
-            # Delete all users EXCEPT the requesting admin
-            mongo.db.users.delete_many({"_id": {"$ne": ObjectId(current_user_id)}})
-            
-            users_to_insert = []
-            for u in collections['users']:
-                uid = u.pop('_id', None)
-                # Skip the current admin from the backup — we keep the live one
-                if uid == current_user_id:
-                    continue
-                if uid:
-                    u['_id'] = ObjectId(uid)
-                users_to_insert.append(u)
-            
-            if users_to_insert:
-                mongo.db.users.insert_many(users_to_insert)
-            stats['users'] = len(users_to_insert) + 1  # +1 for preserved admin
-
-        # 2. Restore tournaments
-        if 'tournaments' in collections:
-            mongo.db.tournaments.delete_many({})
-            tournaments_to_insert = []
-            for t in collections['tournaments']:
-                tid = t.pop('_id', None)
-                if tid:
-                    t['_id'] = ObjectId(tid)
-                tournaments_to_insert.append(t)
-            if tournaments_to_insert:
-                mongo.db.tournaments.insert_many(tournaments_to_insert)
-            stats['tournaments'] = len(tournaments_to_insert)
-
-        # 3. Restore games
-        if 'games' in collections:
-            mongo.db.games.delete_many({})
-            games_to_insert = []
-            for g in collections['games']:
-                gid = g.pop('_id', None)
-                if gid:
-                    g['_id'] = ObjectId(gid)
-                games_to_insert.append(g)
-            if games_to_insert:
-                mongo.db.games.insert_many(games_to_insert)
-            stats['games'] = len(games_to_insert)
-
-        # 4. Restore teams
-        if 'teams' in collections:
-            mongo.db.teams.delete_many({})
-            teams_to_insert = []
-            for t in collections['teams']:
-                tid = t.pop('_id', None)
-                if tid:
-                    t['_id'] = ObjectId(tid)
-                teams_to_insert.append(t)
-            if teams_to_insert:
-                mongo.db.teams.insert_many(teams_to_insert)
-            stats['teams'] = len(teams_to_insert)
-
+        meta, stats = restore_backup(
+            mongo, [iter_backup_records(file) for file in files], current_user_id,
+            batch_size=Config.RESTORE_BATCH_SIZE
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": f"Restore failed: {str(e)}"}), 500
 
+    # Career rollups are derived from the restored tournaments, not backed up
+    from app.career import rebuild_career_stats
+    rebuild_career_stats(mongo)
+
     backup_date = meta.get('created_at', 'unknown')
     return jsonify({
         "msg": f"Database restored from backup ({backup_date})",
@@ -2,25 +2,48 @@
 Scheduler for tournament tasks.
 - Reset user presence/paid status at midnight
 - Manage check-in windows
+
+Every process builds a scheduler; jobs only run in the one holding the
+scheduler lease (see app.leader).
 """
+import atexit
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from datetime import datetime
 import pytz
 from config import Config
+from app.models import Tournament, Game, Team, touch
+from app import leader
+
+SCHEDULER_LEASE = 'scheduler'
 
 
 def create_scheduler(mongo):
     """Create and configure the scheduler with tournament jobs."""
     scheduler = BackgroundScheduler()
     tz = pytz.timezone(Config.TOURNAMENT_TIMEZONE)
+    lease = leader.Lease(mongo, SCHEDULER_LEASE, Config.SCHEDULER_LEASE_TTL_SECONDS)
+    leader.current_lease = lease
+    # Take the lease now if it is free, so jobs run from the first tick
+    lease.refresh()
+    atexit.register(lease.release)
+    
+    scheduler.add_job(
+        lease.refresh,
+        trigger='interval',
+        seconds=Config.SCHEDULER_LEASE_RENEW_SECONDS,
+        id='scheduler_lease',
+        name='Acquire or renew the scheduler lease',
+        replace_existing=True
+    )
     
+    @lease.leader_only
     def reset_daily_status():
         """Reset all users' checked_in and has_paid status at midnight."""
         try:
             result = mongo.db.users.update_many(
-                {},
-                {"$set": {"checked_in": False, "has_paid": False, "checked_in_at": None}}
+                {"$or": [{"checked_in": True}, {"has_paid": True}, {"checked_in_at": {"$ne": None}}]},
+                {"$set": touch({"checked_in": False, "has_paid": False, "checked_in_at": None})}
             )
             print(f"[Scheduler] Midnight reset: {result.modified_count} users reset")
         except Exception as e:
@@ -35,33 +58,39 @@ def create_scheduler(mongo):
         replace_existing=True
     )
     
+    @lease.leader_only
     def auto_finalize_expired_games():
-        """Automatically finalize active games if end_time + 60 seconds has elapsed."""
+        """Automatically finalize active games once their end_time plus the score lock grace has passed."""
         try:
-            from datetime import datetime, timedelta
-            now = datetime.utcnow()
-            cutoff = (now - timedelta(seconds=60)).strftime('%Y-%m-%dT%H:%M:%SZ')
+            now = datetime.utcnow().replace(microsecond=0)
+            # Served by the (status, end_time) index
             expired_games = list(mongo.db.games.find({
                 "status": "active",
-                "end_time": {"$lte": cutoff}
+                "end_time": {"$lte": now - Game.SCORE_LOCK_GRACE}
             }))
             
             if expired_games:
                 for g in expired_games:
                     mongo.db.games.update_one(
                         {"_id": g["_id"]},
-                        {"$set": {
+                        {"$set": touch({
                             "status": "finalized",
-                            "end_time": now.strftime('%Y-%m-%dT%H:%M:%SZ')
-                        }}
+                            "end_time": now
+                        })}
                     )
                     print(f"[Scheduler] Auto-finalized game {g['_id']} on Station {g.get('court') or g.get('game_number')}")
+                Team.refresh_stats_for_games(mongo, expired_games)
+                for t_id in {g["tournament_id"] for g in expired_games}:
+                    Tournament.bump_version(mongo, t_id)
                 
                 # Broadcast standings update since games were finalized
                 try:
                     t_id = str(expired_games[0]["tournament_id"])
-                    from app.events import broadcast_standings_update
+                    from app.events import broadcast_standings_update, broadcast_games
                     broadcast_standings_update(t_id)
+                    broadcast_games(mongo, [
+                        dict(g, status="finalized", end_time=now) for g in expired_games
+                    ])
                 except Exception as e:
                     print(f"[Scheduler] Auto-finalize broadcast failed: {e}")
         except Exception as e:
@@ -80,9 +109,10 @@ def create_scheduler(mongo):
     return scheduler
 
 
-def is_checkin_window_open(mongo):
+def is_checkin_window_open(mongo, tournament=None):
     """Check if the check-in window is currently open.
     
+    Pass the active Tournament if the caller already loaded it, to skip the lookup.
     Returns (is_open, message):
     - (True, None) if check-in is allowed
     - (False, reason) if check-in is not allowed
@@ -91,15 +121,18 @@ def is_checkin_window_open(mongo):
     now = datetime.now(tz)
     check_in_hour = Config.CHECK_IN_HOUR
     
+    if tournament is None:
+        data = mongo.db.tournaments.find_one({"status": {"$in": ["upcoming", "active", "blackout"]}})
+        tournament = Tournament(data) if data else None
+    
     # Check if admin has manually opened check-in
-    tournament = mongo.db.tournaments.find_one({"status": {"$in": ["upcoming", "active", "blackout"]}})
-    if tournament and tournament.get('check_in_open'):
+    if tournament and tournament.check_in_open:
         return True, None
     
     # Check if it's a tournament day
     if tournament:
         today = now.strftime('%Y-%m-%d')
-        if today in tournament.get('dates', []):
+        if today in (tournament.dates or []):
             # On a tournament day, check-in opens at CHECK_IN_HOUR
             if now.hour >= check_in_hour:
                 return True, None
@@ -0,0 +1,76 @@
+"""
+Tournament snapshots for socket clients joining (or rejoining) a tournament room.
+
+When venue Wi-Fi drops, every client reconnects at once. Rather than each one
+refetching the tournament, games and standings over REST, handle_join_tournament
+replies with a snapshot: the tournament's status and round, the games of its
+current round, and the change_version that standings are keyed on.
+
+A snapshot's version is [change_version, score_version], since its games carry
+in-progress scores. Snapshots are cached per version, so a reconnect storm
+builds one. A client that sends the last_seen_version from its previous
+snapshot gets a diff against that version's snapshot (while it is still
+cached): only the tournament fields and games that changed, plus the ids of
+games that are gone.
+"""
+from app.cache import named_cache
+from app.models import Tournament
+from app.utils import enrich_games
+
+TOURNAMENT_FIELDS = ['_id', 'name', 'status', 'dates', 'current_day_index', 'current_round', 'rounds_per_day']
+
+
+def _snapshots():
+    return named_cache('snapshots')
+
+
+def build_snapshot(mongo, tournament):
+    games = mongo.db.games.find({
+        "tournament_id": str(tournament._id),
+        "day_index": tournament.current_day_index,
+        "round_number": tournament.current_round
+    })
+    data = tournament.to_dict()
+    return {
+        "version": [tournament.change_version, tournament.score_version],
+        "tournament": {field: data.get(field) for field in TOURNAMENT_FIELDS},
+        "games": enrich_games(mongo, list(games)),
+        "standings_version": tournament.change_version
+    }
+
+
+def diff_snapshot(base, snapshot):
+    """What changed from base to snapshot."""
+    base_games = {g['_id']: g for g in base['games']}
+    current_ids = {g['_id'] for g in snapshot['games']}
+    return {
+        "full": False,
+        "version": snapshot['version'],
+        "since_version": base['version'],
+        "tournament": {
+            field: value for field, value in snapshot['tournament'].items()
+            if base['tournament'].get(field) != value
+        },
+        "games": [g for g in snapshot['games'] if base_games.get(g['_id']) != g],
+        "removed_game_ids": [gid for gid in base_games if gid not in current_ids],
+        "standings_version": snapshot['standings_version']
+    }
+
+
+def tournament_snapshot(mongo, last_seen_version=None):
+    """The active tournament's snapshot, or a diff from last_seen_version when that is still cached."""
+    tournament = Tournament.find_active(mongo, persist=False)
+    if not tournament:
+        return {"full": True, "version": None, "tournament": None, "games": [], "standings_version": None}
+
+    key = (str(tournament._id), tournament.restored_at)
+    version = (tournament.change_version, tournament.score_version)
+    cache = _snapshots()
+    snapshot = cache.get_or_compute(key + version, lambda: build_snapshot(mongo, tournament))
+    if (isinstance(last_seen_version, list) and len(last_seen_version) == 2
+            and all(isinstance(v, int) for v in last_seen_version)
+            and tuple(last_seen_version) <= version):
+        base = cache.get(key + tuple(last_seen_version))
+        if base is not None:
+            return diff_snapshot(base, snapshot)
+    return dict(snapshot, full=True)
@@ -0,0 +1,58 @@
+"""
+Spectator read routing.
+
+Tournament nights are dominated by public refreshes from TVs and phones, which
+can tolerate slightly stale data. Routes tagged @spectator_read read through
+spectator_mongo, a second client using SPECTATOR_READ_PREFERENCE and
+SPECTATOR_MAX_STALENESS_SECONDS. On a replica set, that keeps them off the
+primary that takes score writes. Everything else keeps using mongo.
+
+Reads that must agree with each other (a cached body and the version it is
+keyed on, see app.response_cache) pass session=read_session(), a causally
+consistent session, so a later read never sees older data than an earlier one.
+
+A spectator route must not write with data it read from the spectator client:
+a lagging secondary could write old values back over newer ones.
+"""
+from functools import wraps
+from flask import g
+from config import Config
+
+
+def init_spectator_reads(app, client):
+    """Connect client (a PyMongo) with the spectator read preference."""
+    options = {"readPreference": Config.SPECTATOR_READ_PREFERENCE}
+    if Config.SPECTATOR_READ_PREFERENCE != 'primary' and Config.SPECTATOR_MAX_STALENESS_SECONDS != -1:
+        options["maxStalenessSeconds"] = Config.SPECTATOR_MAX_STALENESS_SECONDS
+    client.init_app(app, uri=Config.SPECTATOR_MONGO_URI or app.config.get('MONGO_URI'), **options)
+    print(f"✅ Spectator reads: {Config.SPECTATOR_READ_PREFERENCE}"
+          + (f", max staleness {options['maxStalenessSeconds']}s" if 'maxStalenessSeconds' in options else ""))
+
+
+def spectator_read(view):
+    """Tag a view as a spectator read; reader() then returns the spectator client."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.spectator_read = True
+        return view(*args, **kwargs)
+    wrapper.spectator_read = True
+    return wrapper
+
+
+def primary(client):
+    """client, unless it is the spectator client, in which case the primary mongo client."""
+    from app import mongo, spectator_mongo
+    return mongo if client is spectator_mongo else client
+
+
+def reader():
+    """The client the current request should read from."""
+    from app import mongo, spectator_mongo
+    if g.get('spectator_read') and spectator_mongo.db is not None:
+        return spectator_mongo
+    return mongo
+
+
+def read_session():
+    """The causally consistent session the current request reads in, or None."""
+    return g.get('read_session')
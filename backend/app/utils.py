@@ -1,6 +1,8 @@
 import random
 from datetime import datetime, timedelta
-from app.models import Game, User, Tournament, Team
+import numpy as np
+from app.models import Game, User, Tournament, Team, touch
+from app.analytics import game_columns
 from bson import ObjectId
 
 
@@ -55,7 +57,7 @@ def select_power_players(mongo, count):
         # Reset all power_player_used flags
         mongo.db.users.update_many(
             {"is_power_player": True},
-            {"$set": {"power_player_used": False}}
+            {"$set": touch({"power_player_used": False})}
         )
         # Shuffle and select
         random.shuffle(power_players)
@@ -69,7 +71,7 @@ def select_power_players(mongo, count):
     for p in selected:
         mongo.db.users.update_one(
             {"_id": p['_id']},
-            {"$set": {"power_player_used": True}}
+            {"$set": touch({"power_player_used": True})}
         )
     
     return selected
@@ -149,6 +151,132 @@ def create_teams_for_day(mongo, tournament_id, day_index):
     return teams
 
 
+def get_attendance_by_day(mongo, tournament):
+    """Map each past day_index of the tournament to the set of player IDs who played that day.
+    
+    A single aggregation over the tournament's games, grouped by day_index.
+    """
+    if not tournament.current_day_index:
+        return {}
+    pipeline = [
+        {"$match": {
+            "tournament_id": str(tournament._id),
+            "day_index": {"$lt": tournament.current_day_index}
+        }},
+        {"$project": {"day_index": 1, "player_ids": 1}},
+        {"$unwind": "$player_ids"},
+        {"$group": {"_id": "$day_index", "player_ids": {"$addToSet": "$player_ids"}}}
+    ]
+    return {
+        row['_id']: {str(pid) for pid in row['player_ids']}
+        for row in mongo.db.games.aggregate(pipeline)
+    }
+
+
+def get_user_names(mongo, player_ids, session=None):
+    """Map player ID strings to names with a single query."""
+    ids = [ObjectId(pid) for pid in set(player_ids) if ObjectId.is_valid(pid)]
+    if not ids:
+        return {}
+    return {
+        str(u['_id']): User(u).name
+        for u in mongo.db.users.find({"_id": {"$in": ids}}, {"name": 1, "first_name": 1, "last_name": 1}, session=session)
+    }
+
+
+def enrich_games(mongo, games, session=None):
+    """Game dicts with team1_player_names/team2_player_names, resolving names in one query."""
+    names = get_user_names(mongo, [pid for g in games for pid in g.get('player_ids', [])], session)
+    enriched = []
+    for g in games:
+        game_obj = Game(g).to_dict()
+        game_obj['team1_player_names'] = [names.get(pid, "Unknown") for pid in g.get('team1_player_ids', [])]
+        game_obj['team2_player_names'] = [names.get(pid, "Unknown") for pid in g.get('team2_player_ids', [])]
+        enriched.append(game_obj)
+    return enriched
+
+
+def compute_standings(mongo, tournament, session=None):
+    """Tournament standings from finalized games, best first.
+    
+    Sorted by total_points desc, wins desc, margin desc, fewest games asc.
+    """
+    columns = game_columns(mongo, tournament)
+    totals = columns.player_totals()
+    daily = columns.daily_totals()
+    
+    played = np.flatnonzero(totals["games_played"])
+    # lexsort sorts by its last key first; it is stable, so full ties keep a fixed order
+    order = played[np.lexsort((
+        totals["games_played"][played],
+        -totals["margin"][played],
+        -totals["wins"][played],
+        -totals["total_points"][played]
+    ))]
+    
+    names = get_user_names(mongo, [columns.player_ids[i] for i in order.tolist()], session)
+    
+    sorted_standings = []
+    for i in order.tolist():
+        pid = columns.player_ids[i]
+        daily_list = [
+            {
+                "day_index": day,
+                "wins": int(daily["wins"][i, day]),
+                "games_played": int(daily["games_played"][i, day]),
+                "total_points": int(daily["total_points"][i, day]),
+                "margin": int(daily["margin"][i, day])
+            }
+            for day in np.flatnonzero(daily["games_played"][i]).tolist()
+        ]
+        sorted_standings.append({
+            "user_id": pid,
+            "name": names.get(pid, "Unknown"),
+            "wins": int(totals["wins"][i]),
+            "games_played": int(totals["games_played"][i]),
+            "total_points": int(totals["total_points"][i]),
+            "margin": int(totals["margin"][i]),
+            "daily_stats": daily_list
+        })
+    
+    return sorted_standings
+
+
+def summarize_rounds(mongo, tournament, day_index):
+    """Per-round game counts and status for a tournament day, from one $group on (round, status)."""
+    counts = {}
+    for row in mongo.db.games.aggregate([
+        {"$match": {"tournament_id": str(tournament._id), "day_index": day_index}},
+        {"$group": {"_id": {"round": "$round_number", "status": "$status"}, "count": {"$sum": 1}}}
+    ]):
+        counts.setdefault(row['_id'].get('round'), {})[row['_id'].get('status')] = row['count']
+    
+    rounds = []
+    for r in range(1, tournament.rounds_per_day + 1):
+        by_status = counts.get(r, {})
+        total = sum(by_status.values())
+        finalized = by_status.get('finalized', 0)
+        active = by_status.get('active', 0)
+        
+        if total == 0:
+            status = "pending"
+        elif finalized == total:
+            status = "complete"
+        elif active:
+            status = "active"
+        else:
+            status = "ready"  # Pairings generated but not started
+        
+        rounds.append({
+            "round_number": r,
+            "status": status,
+            "total_games": total,
+            "finalized_games": finalized,
+            "active_games": active
+        })
+    return rounds
+
+
 def get_previous_matchups(mongo, tournament_id, day_index):
     """Get set of team matchups that have already occurred today."""
     games = list(mongo.db.games.find({
@@ -228,6 +356,8 @@ def generate_round_pairings(mongo, tournament_id, day_index, round_number):
                 "round_number": round_number,
                 "team1_player_ids": power_team.player_ids,
                 "team2_player_ids": normal_team.player_ids,
+                "team1_id": str(power_team._id),
+                "team2_id": str(normal_team._id),
                 "status": "upcoming",
                 "is_power_game": True,
                 "court": game_number # Assign default Station matching game number
@@ -277,6 +407,8 @@ def generate_round_pairings(mongo, tournament_id, day_index, round_number):
                 "round_number": round_number,
                 "team1_player_ids": team1.player_ids,
                 "team2_player_ids": team2.player_ids,
+                "team1_id": str(team1._id),
+                "team2_id": str(team2._id),
                 "status": "upcoming",
                 "is_power_game": False,
                 "court": game_number
@@ -326,6 +458,8 @@ def generate_round_pairings(mongo, tournament_id, day_index, round_number):
                 "round_number": round_number,
                 "team1_player_ids": team1.player_ids,
                 "team2_player_ids": team2.player_ids,
+                "team1_id": str(team1._id),
+                "team2_id": str(team2._id),
                 "status": "upcoming",
                 "is_power_game": False,
                 "court": game_number # Assign default Station matching game number
@@ -353,7 +487,7 @@ def generate_round_pairings(mongo, tournament_id, day_index, round_number):
     expected_games = len(teams) // 2
     if len(pairings) < expected_games and len(teams) >= 2:
         # Delete any partially saved games from the database for this round first
-        mongo.db.games.delete_many({
+        Game.delete_where(mongo, {
             "tournament_id": str(tournament_id),
             "day_index": day_index,
             "round_number": round_number
@@ -380,6 +514,8 @@ def generate_round_pairings(mongo, tournament_id, day_index, round_number):
                     "round_number": round_number,
                     "team1_player_ids": power_team.player_ids,
                     "team2_player_ids": normal_team.player_ids,
+                    "team1_id": str(power_team._id),
+                    "team2_id": str(normal_team._id),
                     "status": "upcoming",
                     "is_power_game": True,
                     "court": game_number
@@ -415,6 +551,8 @@ def generate_round_pairings(mongo, tournament_id, day_index, round_number):
                     "round_number": round_number,
                     "team1_player_ids": team1.player_ids,
                     "team2_player_ids": team2.player_ids,
+                    "team1_id": str(team1._id),
+                    "team2_id": str(team2._id),
                     "status": "upcoming",
                     "is_power_game": False,
                     "court": game_number
@@ -0,0 +1,77 @@
+"""
+Measure how long a write takes to come out of the event bus as a socket event.
+
+Starts an EventBus on the configured database, then updates a scratch game's
+live score --writes times, one per batch window so none are coalesced, and
+reports the time from each write to its live_score_updated event. Change
+streams need a replica set; a single-node one is enough:
+
+    docker run -d --name bb-rs -p 27017:27017 mongo:7 --replSet rs0
+    docker exec bb-rs mongosh --quiet --eval 'rs.initiate()'
+    MONGO_URI='mongodb://localhost:27017/bags_brats?directConnection=true' \\
+        python benchmarks/event_bus_latency.py --writes 50
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from app import create_app, mongo, socketio
+from app.event_bus import start_event_bus
+from app.models import touch
+from login_benchmark import percentile
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time writes through the change-stream event bus.")
+    parser.add_argument('--writes', type=int, default=50)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        emitted = {}
+        emit = socketio.emit
+
+        def recording_emit(event, data=None, **kwargs):
+            if event == 'live_score_updated':
+                emitted[data['score1']] = time.perf_counter()
+            return emit(event, data, **kwargs)
+        socketio.emit = recording_emit
+
+        bus = start_event_bus(mongo)
+        deadline = time.time() + 10
+        while not bus.running and time.time() < deadline:
+            socketio.sleep(0.1)
+        if not bus.running:
+            print("Event bus did not start; is MONGO_URI a replica set?")
+            return
+
+        game_id = mongo.db.games.insert_one(touch({
+            "tournament_id": "event-bus-latency", "status": "active", "court": 1,
+            "team1_player_ids": [], "team2_player_ids": [], "score1": -1, "score2": 0
+        })).inserted_id
+        written = {}
+        try:
+            for score in range(args.writes):
+                written[score] = time.perf_counter()
+                mongo.db.games.update_one({"_id": game_id}, {"$set": touch({"score1": score})})
+                socketio.sleep(Config.EVENT_BUS_BATCH_SECONDS * 2)
+            deadline = time.time() + 5
+            while len(emitted) < args.writes and time.time() < deadline:
+                socketio.sleep(0.1)
+        finally:
+            mongo.db.games.delete_one({"_id": game_id})
+            socketio.emit = emit
+
+        latencies = sorted(emitted[s] - written[s] for s in written if s in emitted)
+        print(f"{len(latencies)}/{args.writes} writes emitted (batch window {Config.EVENT_BUS_BATCH_SECONDS}s)")
+        if latencies:
+            for p in (50, 95, 99):
+                print(f"  p{p}: {percentile(latencies, p) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""
+JSON encoding benchmark: the previous stdlib path against app.fastjson.
+
+Encodes the largest payloads the API produces (a full JSON backup, the admin
+games list, the admin users list, and a round's pairings broadcast) both ways
+and reports milliseconds per encode and throughput. The "stdlib" column
+reproduces the old behaviour:
+- Flask's default provider (sorted keys, a default hook per datetime);
+- the recursive serialize_for_json walk before socket emits;
+- per-document datetime conversion in backups.
+
+By default the payloads come from an in-memory synthetic league (the same
+generator as generate_dataset.py); --db reads them from the configured database:
+
+    python benchmarks/json_benchmark.py --players 2000 --days 10
+    python benchmarks/json_benchmark.py --db
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId
+from werkzeug.http import http_date
+from app import fastjson
+from app.models import Game, User
+
+COLLECTIONS = ['users', 'tournaments', 'games', 'teams']
+
+
+class MemoryCollection:
+    def __init__(self):
+        self.docs = []
+
+    def insert_many(self, docs, ordered=True):
+        self.docs.extend(docs)
+
+    def find(self, *args, **kwargs):
+        return list(self.docs)
+
+
+class MemoryDB(dict):
+    """Just enough of a database for DatasetGenerator.run to write into."""
+
+    def __missing__(self, name):
+        collection = self[name] = MemoryCollection()
+        return collection
+
+
+def generated_docs(args):
+    import generate_dataset
+    options = argparse.Namespace(
+        players=args.players, tournaments=1, days=args.days, rounds=3, power_ratio=0.08,
+        weeks_between=4, start_date='2024-04-02', password='password', seed=1,
+        batch_size=1000, active=True, drop=False
+    )
+    db = MemoryDB()
+    generate_dataset.DatasetGenerator(options).run(db)
+    return {name: db[name].docs for name in COLLECTIONS}
+
+
+def database_docs():
+    from app import create_app, mongo
+    app = create_app()
+    with app.app_context():
+        return {name: list(mongo.db[name].find()) for name in COLLECTIONS}
+
+
+def build_payloads(docs):
+    names = {str(u['_id']): User(u).name for u in docs['users']}
+    games = []
+    for g in docs['games']:
+        game = Game(g).to_dict()
+        game['team1_player_names'] = [names.get(pid, "Unknown") for pid in g.get('team1_player_ids', [])]
+        game['team2_player_names'] = [names.get(pid, "Unknown") for pid in g.get('team2_player_ids', [])]
+        games.append(game)
+    users = []
+    for u in docs['users']:
+        user = User(u).to_dict()
+        user.pop('password_hash', None)
+        users.append(user)
+    last_round = max(((g.get('day_index', 0), g.get('round_number', 0)) for g in docs['games']), default=None)
+    pairings = [g for g in games if (g.get('day_index', 0), g.get('round_number', 0)) == last_round]
+    return {"backup": docs, "games list": games, "users list": users, "pairings emit": pairings}
+
+
+# --- The previous encoders -------------------------------------------------
+
+def flask_default(o):
+    if isinstance(o, datetime):
+        return http_date(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def serialize_for_json(data):
+    if isinstance(data, dict):
+        return {k: serialize_for_json(v) for k, v in data.items()}
+    elif isinstance(data, list):
+        return [serialize_for_json(v) for v in data]
+    elif isinstance(data, datetime):
+        return data.isoformat() + 'Z'
+    elif isinstance(data, ObjectId):
+        return str(data)
+    return data
+
+
+def serialize_doc(doc):
+    d = dict(doc)
+    if '_id' in d:
+        d['_id'] = str(d['_id'])
+    for key, val in d.items():
+        if isinstance(val, datetime):
+            d[key] = val.isoformat()
+    return d
+
+
+def stdlib_encode(name, payload):
+    if name == "backup":
+        return ''.join(
+            json.dumps(serialize_doc(doc), default=str, separators=(',', ':'))
+            for docs in payload.values() for doc in docs
+        ).encode()
+    if name == "pairings emit":
+        return json.dumps(serialize_for_json(payload), separators=(',', ':')).encode()
+    return json.dumps(payload, default=flask_default, sort_keys=True).encode()
+
+
+def fast_encode(name, payload):
+    if name == "backup":
+        return b''.join(fastjson.dumpb(doc) for docs in payload.values() for doc in docs)
+    return fastjson.dumpb(payload)
+
+
+def bench(encode, name, payload, repeat):
+    size = len(encode(name, payload))
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encode(name, payload)
+        timings.append(time.perf_counter() - start)
+    return min(timings), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare stdlib and orjson encoding of large API payloads.")
+    parser.add_argument('--players', type=int, default=2000)
+    parser.add_argument('--days', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5, help="encodes per payload (best is reported)")
+    parser.add_argument('--db', action='store_true', help="use the configured database instead of generated data")
+    args = parser.parse_args()
+
+    docs = database_docs() if args.db else generated_docs(args)
+    payloads = build_payloads(docs)
+    print(f"{'payload':<15}{'size':>10}{'stdlib ms':>12}{'fast ms':>10}{'speedup':>9}{'fast MB/s':>11}")
+    for name, payload in payloads.items():
+        slow, _ = bench(stdlib_encode, name, payload, args.repeat)
+        fast, size = bench(fast_encode, name, payload, args.repeat)
+        print(f"{name:<15}{size / 1e6:>8.2f}MB{slow * 1000:>12.1f}{fast * 1000:>10.1f}"
+              f"{slow / fast:>8.1f}x{size / 1e6 / fast:>11.0f}")
+
+
+if __name__ == '__main__':
+    main()
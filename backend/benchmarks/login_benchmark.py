@@ -0,0 +1,119 @@
+"""
+Login throughput benchmark: a simulated check-in rush.
+
+Many players log in at once when check-in opens. This fires --logins logins
+from --concurrency simultaneous clients and reports logins/sec and latency
+percentiles.
+
+By default it exercises the password hasher in-process, through the same
+bounded pool the API uses, so different settings can be compared without a
+server:
+
+    PASSWORD_HASHER=bcrypt PASSWORD_BCRYPT_ROUNDS=10 python benchmarks/login_benchmark.py
+
+With --url it instead POSTs to /auth/login on a running server. It uses the
+seeded test players (npm run seed) unless --account is given:
+
+    python benchmarks/login_benchmark.py --url http://localhost:5001 --concurrency 50
+"""
+import argparse
+import os
+import string
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def seeded_accounts():
+    return [(f"{c}@{c}.com", c) for c in string.ascii_lowercase[:24]]
+
+
+def make_in_process_login(accounts):
+    from app.passwords import hash_password, verify_password
+    print(f"Hashing {len(accounts)} passwords with {Config.PASSWORD_HASHER}...")
+    hashes = {email: hash_password(password) for email, password in accounts}
+
+    def login(account):
+        email, password = account
+        if not verify_password(hashes[email], password):
+            raise RuntimeError(f"verification failed for {email}")
+    return login
+
+
+def make_http_login(url):
+    import requests
+    session = requests.Session()
+
+    def login(account):
+        email, password = account
+        res = session.post(f"{url.rstrip('/')}/auth/login", json={"email": email, "password": password})
+        if res.status_code != 200:
+            raise RuntimeError(f"login failed for {email}: HTTP {res.status_code}")
+    return login
+
+
+def run(login, accounts, total, concurrency):
+    latencies = []
+    errors = []
+
+    def timed(i):
+        start = time.perf_counter()
+        try:
+            login(accounts[i % len(accounts)])
+        except Exception as e:
+            errors.append(str(e))
+            return
+        latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as clients:
+        list(clients.map(timed, range(total)))
+    elapsed = time.perf_counter() - started
+    return sorted(latencies), errors, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark login throughput during a check-in rush.")
+    parser.add_argument('--logins', type=int, default=200, help="total logins to perform")
+    parser.add_argument('--concurrency', type=int, default=24, help="simultaneous clients")
+    parser.add_argument('--url', help="base URL of a running API; omit to benchmark in-process")
+    parser.add_argument('--account', action='append', metavar='EMAIL:PASSWORD',
+                        help="account to log in as (repeatable); defaults to the seeded players")
+    args = parser.parse_args()
+
+    accounts = [tuple(a.split(':', 1)) for a in args.account] if args.account else seeded_accounts()
+    if args.url:
+        login = make_http_login(args.url)
+        target = args.url
+    else:
+        login = make_in_process_login(accounts)
+        target = "in-process"
+
+    print(f"Target: {target} | hasher: {Config.PASSWORD_HASHER} | "
+          f"workers: {Config.PASSWORD_HASH_WORKERS} | clients: {args.concurrency} | logins: {args.logins}")
+    latencies, errors, elapsed = run(login, accounts, args.logins, args.concurrency)
+
+    print(f"Completed {len(latencies)} logins in {elapsed:.2f}s ({len(latencies) / elapsed:.1f} logins/sec)")
+    if latencies:
+        print("Latency: p50 {:.1f} ms | p95 {:.1f} ms | p99 {:.1f} ms | max {:.1f} ms".format(
+            percentile(latencies, 50) * 1000, percentile(latencies, 95) * 1000,
+            percentile(latencies, 99) * 1000, latencies[-1] * 1000
+        ))
+    if errors:
+        print(f"❌ {len(errors)} failed logins, e.g. {errors[0]}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
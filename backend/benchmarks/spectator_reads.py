@@ -0,0 +1,58 @@
+"""
+Check where spectator reads are served and how fast.
+
+Runs the public standings/games queries --reads times through both the
+primary client and the spectator client, then prints which replica-set member
+answered each and their latency percentiles. Against the local replica set
+(docker-compose.replica.yml) the spectator column should name a secondary:
+
+    docker compose -f docker-compose.yml -f docker-compose.replica.yml exec backend \\
+        python benchmarks/spectator_reads.py
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from app import create_app, mongo, spectator_mongo
+from app.models import Tournament
+from login_benchmark import percentile
+
+
+def timed_reads(client, tournament_id, reads):
+    latencies = []
+    members = set()
+    for _ in range(reads):
+        start = time.perf_counter()
+        cursor = client.db.games.find({"tournament_id": tournament_id, "status": "finalized"})
+        list(cursor)
+        latencies.append(time.perf_counter() - start)
+        if cursor.address:
+            members.add(f"{cursor.address[0]}:{cursor.address[1]}")
+    return sorted(latencies), members
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare primary and spectator read routing.")
+    parser.add_argument('--reads', type=int, default=200)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        tournament = Tournament.find_active(spectator_mongo, persist=False)
+        if not tournament:
+            print("❌ No active tournament; generate one with generate_dataset.py --active")
+            sys.exit(1)
+        print(f"Spectator read preference: {Config.SPECTATOR_READ_PREFERENCE} "
+              f"(max staleness {Config.SPECTATOR_MAX_STALENESS_SECONDS}s)")
+        for label, client in (("primary", mongo), ("spectator", spectator_mongo)):
+            latencies, members = timed_reads(client, str(tournament._id), args.reads)
+            print(f"{label:>9}: served by {', '.join(sorted(members)) or 'unknown'} | "
+                  f"p50 {percentile(latencies, 50) * 1000:.1f} ms | p95 {percentile(latencies, 95) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,8 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+SPECTATOR_READ_PREFERENCES = ('primary', 'primaryPreferred', 'secondary', 'secondaryPreferred', 'nearest')
+
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY')
     MONGO_URI = os.environ.get('MONGO_URI')
@@ -11,6 +13,59 @@ class Config:
     # Tournament timezone for scheduled tasks and check-in windows
     TOURNAMENT_TIMEZONE = os.environ.get('TOURNAMENT_TIMEZONE', 'America/Chicago')
     CHECK_IN_HOUR = int(os.environ.get('CHECK_IN_HOUR', 17))  # 5pm default
+
+    # Documents fetched per cursor batch when streaming full-database backups
+    BACKUP_BATCH_SIZE = int(os.environ.get('BACKUP_BATCH_SIZE', 500))
+    # Documents per insert_many batch when restoring into staging collections
+    RESTORE_BATCH_SIZE = int(os.environ.get('RESTORE_BATCH_SIZE', 1000))
+    # Deletion tombstones older than this can no longer be replayed by incremental backups
+    DELETION_TOMBSTONE_TTL_DAYS = int(os.environ.get('DELETION_TOMBSTONE_TTL_DAYS', 90))
+    # Documents per bulk_write batch in data migrations
+    MIGRATION_BATCH_SIZE = int(os.environ.get('MIGRATION_BATCH_SIZE', 1000))
+    # Admin roster page size (default, and the most a client may request)
+    ADMIN_USERS_PAGE_SIZE = int(os.environ.get('ADMIN_USERS_PAGE_SIZE', 100))
+    ADMIN_USERS_MAX_PAGE_SIZE = int(os.environ.get('ADMIN_USERS_MAX_PAGE_SIZE', 500))
+
+    # Spectator reads (public standings/games/tournament routes tagged @spectator_read) use a
+    # second client with its own read preference. Defaults to MONGO_URI; on a replica set the
+    # default secondaryPreferred keeps them off the primary that takes score writes.
+    SPECTATOR_MONGO_URI = os.environ.get('SPECTATOR_MONGO_URI') or MONGO_URI
+    SPECTATOR_READ_PREFERENCE = os.environ.get('SPECTATOR_READ_PREFERENCE', 'secondaryPreferred')
+    # Skip secondaries lagging more than this (MongoDB requires at least 90); -1 disables the check
+    SPECTATOR_MAX_STALENESS_SECONDS = int(os.environ.get('SPECTATOR_MAX_STALENESS_SECONDS', 90))
+
+    # Entries per in-process derived-data cache (keyed by tournament change_version)
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 256))
+    # Encoded public GET responses kept per process (see app.response_cache)
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 128))
+    # Live scores reach station rooms immediately; big-screen feeds get them batched at this interval
+    SCORE_FEED_INTERVAL_SECONDS = float(os.environ.get('SCORE_FEED_INTERVAL_SECONDS', 2))
+    # Compress JSON responses at least this large with brotli/gzip (see app.compression); -1 disables
+    COMPRESSION_MIN_BYTES = int(os.environ.get('COMPRESSION_MIN_BYTES', 1024))
+    COMPRESSION_GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL', 6))
+    # Brotli quality 0-11; 11 is far too slow for per-change dynamic responses
+    COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 5))
+
+    # Emit socket events from a MongoDB change stream instead of per-route broadcasts (see
+    # app.event_bus). Needs a replica set; falls back to route broadcasts when there is none.
+    EVENT_BUS_ENABLED = os.environ.get('EVENT_BUS_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    EVENT_BUS_BATCH_SECONDS = float(os.environ.get('EVENT_BUS_BATCH_SECONDS', 0.25))
+    EVENT_BUS_RETRY_SECONDS = float(os.environ.get('EVENT_BUS_RETRY_SECONDS', 5))
+
+    # Only the process holding the scheduler lease runs scheduled jobs (see app.leader).
+    # The holder renews it every RENEW seconds; it passes to another process after TTL seconds without renewal.
+    SCHEDULER_LEASE_TTL_SECONDS = int(os.environ.get('SCHEDULER_LEASE_TTL_SECONDS', 30))
+    SCHEDULER_LEASE_RENEW_SECONDS = int(os.environ.get('SCHEDULER_LEASE_RENEW_SECONDS', 10))
+
+    # Password hashing: 'scrypt' or 'bcrypt'. Changing the hasher or its cost
+    # upgrades each stored hash on that user's next successful login.
+    PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', 'scrypt')
+    PASSWORD_SCRYPT_N = int(os.environ.get('PASSWORD_SCRYPT_N', 32768))
+    PASSWORD_SCRYPT_R = int(os.environ.get('PASSWORD_SCRYPT_R', 8))
+    PASSWORD_SCRYPT_P = int(os.environ.get('PASSWORD_SCRYPT_P', 1))
+    PASSWORD_BCRYPT_ROUNDS = int(os.environ.get('PASSWORD_BCRYPT_ROUNDS', 12))
+    # Hashes computed concurrently; extra logins wait for a free worker
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 4))
     
     # Validate required secrets at startup
     @classmethod
@@ -24,6 +79,17 @@ class Config:
             missing.append('JWT_SECRET_KEY')
         if missing:
             raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
+        if cls.SPECTATOR_READ_PREFERENCE not in SPECTATOR_READ_PREFERENCES:
+            raise ValueError(
+                f"SPECTATOR_READ_PREFERENCE must be one of {', '.join(SPECTATOR_READ_PREFERENCES)}, "
+                f"got '{cls.SPECTATOR_READ_PREFERENCE}'"
+            )
+        if cls.SPECTATOR_MAX_STALENESS_SECONDS != -1 and cls.SPECTATOR_MAX_STALENESS_SECONDS < 90:
+            raise ValueError("SPECTATOR_MAX_STALENESS_SECONDS must be -1 or at least 90")
+        if cls.SCHEDULER_LEASE_RENEW_SECONDS >= cls.SCHEDULER_LEASE_TTL_SECONDS:
+            raise ValueError("SCHEDULER_LEASE_RENEW_SECONDS must be less than SCHEDULER_LEASE_TTL_SECONDS")
+        if cls.PASSWORD_HASHER not in ('scrypt', 'bcrypt'):
+            raise ValueError(f"PASSWORD_HASHER must be 'scrypt' or 'bcrypt', got '{cls.PASSWORD_HASHER}'")
     
     # JWT token expires in 8 hours (for tournament-day sessions)
     from datetime import timedelta
@@ -0,0 +1,298 @@
+"""
+Generate a large, reproducible synthetic dataset for scale and load testing.
+
+Creates players, weekly tournaments, daily teams and fully scored games. The
+same --seed always produces the same documents and ObjectIds; only the
+password hash salt differs between runs. Documents are built through the
+models and bulk inserted with insert_many. All players share one password,
+hashed once up front.
+
+    python generate_dataset.py --players 2000 --tournaments 3 --days 10 --seed 7
+    python generate_dataset.py --players 500 --active --drop
+
+Generated players have emails ending in @generated.example.org and generated
+tournaments carry generated: true. --drop deletes those players and
+tournaments, plus the teams, games and career rollups that belong to them,
+before generating. Everything else is kept. Completed tournaments are rolled
+into career stats afterwards. The app is built without the scheduler or the
+event bus, so nothing else runs against the database meanwhile.
+"""
+import argparse
+import math
+import random
+import struct
+from calendar import timegm
+from datetime import datetime, timedelta
+from bson import ObjectId
+from app import create_app, mongo
+from app.career import rebuild_career_stats
+from app.models import User, Tournament, Game, Team
+from app.passwords import hash_password
+from app.utils import calculate_game_distribution
+
+EMAIL_DOMAIN = 'generated.example.org'
+
+FIRST_NAMES = [
+    'James', 'Mary', 'John', 'Patricia', 'Robert', 'Jennifer', 'Michael', 'Linda',
+    'William', 'Elizabeth', 'David', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica',
+    'Thomas', 'Sarah', 'Charles', 'Karen', 'Daniel', 'Nancy', 'Matthew', 'Lisa',
+    'Anthony', 'Betty', 'Mark', 'Margaret', 'Paul', 'Sandra', 'Steven', 'Ashley',
+    'Andrew', 'Emily', 'Joshua', 'Donna', 'Kevin', 'Michelle', 'Brian', 'Carol',
+]
+LAST_NAMES = [
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis',
+    'Rodriguez', 'Martinez', 'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson', 'Thomas',
+    'Taylor', 'Moore', 'Jackson', 'Martin', 'Lee', 'Perez', 'Thompson', 'White',
+    'Harris', 'Sanchez', 'Clark', 'Ramirez', 'Lewis', 'Robinson', 'Walker', 'Young',
+    'Allen', 'King', 'Wright', 'Scott', 'Torres', 'Nguyen', 'Hill', 'Flores',
+]
+
+GAME_MINUTES = 20
+WINNING_SCORE = 21
+
+
+class BulkWriter:
+    """Buffers documents per collection and writes them with insert_many."""
+
+    def __init__(self, db, batch_size):
+        self.db = db
+        self.batch_size = batch_size
+        self.buffers = {}
+        self.counts = {}
+
+    def add(self, collection_name, model, **extra):
+        doc = model.to_document()
+        doc['_id'] = model._id
+        doc.update(extra)
+        buffer = self.buffers.setdefault(collection_name, [])
+        buffer.append(doc)
+        if len(buffer) >= self.batch_size:
+            self.flush(collection_name)
+
+    def flush(self, collection_name=None):
+        names = [collection_name] if collection_name else list(self.buffers)
+        for name in names:
+            buffer = self.buffers.get(name)
+            if buffer:
+                self.db[name].insert_many(buffer, ordered=False)
+                self.counts[name] = self.counts.get(name, 0) + len(buffer)
+                self.buffers[name] = []
+
+
+class DatasetGenerator:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        # Per-player hidden traits: skill drives game outcomes, attendance how often they show up
+        self.skills = {}
+        self.attendance = {}
+
+    def object_id(self, when):
+        # Timestamp prefix from simulated time, remaining 8 bytes from the seeded RNG
+        return ObjectId(struct.pack('>I', timegm(when.utctimetuple())) + self.rng.getrandbits(64).to_bytes(8, 'big'))
+
+    def stamp(self, model, when):
+        model._id = self.object_id(when)
+        model.created_at = when
+        model.updated_at = when
+        return model
+
+    def build_players(self, writer, password_hash, joined_at):
+        players = []
+        for n in range(self.args.players):
+            first = self.rng.choice(FIRST_NAMES)
+            last = self.rng.choice(LAST_NAMES)
+            is_power = self.rng.random() < self.args.power_ratio
+            user = self.stamp(User({
+                "first_name": first,
+                "last_name": last,
+                "email": f"{first.lower()}.{last.lower()}.{n}@{EMAIL_DOMAIN}",
+                "phone": f"555{self.rng.randrange(10 ** 7):07d}",
+                "role": "player",
+                "is_proxy": self.rng.random() < 0.05,
+                "is_power_player": is_power,
+                "password_hash": password_hash,
+            }), joined_at + timedelta(minutes=n))
+            # Power Players volunteer to play solo, so they skew stronger
+            self.skills[str(user._id)] = self.rng.gauss(0.6 if is_power else 0.0, 1.0)
+            self.attendance[str(user._id)] = self.rng.betavariate(2.5, 1.5)
+            writer.add('users', user)
+            players.append(user)
+        return players
+
+    def pick_day_roster(self, players):
+        """Sample attendees and the Power Players needed for a valid pairing."""
+        attendees = [p for p in players if self.rng.random() < self.attendance[str(p._id)]]
+        self.rng.shuffle(attendees)
+        while len(attendees) >= 3:
+            distribution = calculate_game_distribution(len(attendees))
+            if distribution:
+                normal_games, power_games = distribution
+                power = [p for p in attendees if p.is_power_player][:power_games]
+                if len(power) == power_games:
+                    power_ids = {p._id for p in power}
+                    regular = [p for p in attendees if p._id not in power_ids]
+                    return power, regular
+            # Not enough Power Players (or an impossible count): someone stays home
+            attendees.pop()
+        return [], []
+
+    def score_game(self, team1, team2):
+        strength1 = sum(self.skills[pid] for pid in team1) / len(team1)
+        strength2 = sum(self.skills[pid] for pid in team2) / len(team2)
+        team1_wins = self.rng.random() < 1 / (1 + math.exp(strength2 - strength1))
+        winner = WINNING_SCORE + (self.rng.randrange(1, 4) if self.rng.random() < 0.1 else 0)
+        loser = int(self.rng.triangular(0, WINNING_SCORE - 1, 15))
+        return (winner, loser) if team1_wins else (loser, winner)
+
+    def build_day(self, writer, tournament, day_index, day_start, players):
+        power, regular = self.pick_day_roster(players)
+        if not power and not regular:
+            return 0
+        tournament_id = str(tournament._id)
+        teams = []
+        for p in power:
+            teams.append(Team({"player_ids": [str(p._id)], "is_power_team": True}))
+        for i in range(0, len(regular) - 1, 2):
+            teams.append(Team({"player_ids": [str(regular[i]._id), str(regular[i + 1]._id)]}))
+        for number, team in enumerate(teams, 1):
+            team.tournament_id = tournament_id
+            team.day_index = day_index
+            team.team_number = number
+            self.stamp(team, day_start)
+
+        power_teams = [t for t in teams if t.is_power_team]
+        normal_teams = [t for t in teams if not t.is_power_team]
+        games = 0
+        for round_number in range(1, tournament.rounds_per_day + 1):
+            round_start = day_start + timedelta(minutes=(round_number - 1) * (GAME_MINUTES + 10))
+            self.rng.shuffle(normal_teams)
+            matchups = list(zip(power_teams, normal_teams))
+            rest = normal_teams[len(power_teams):]
+            matchups += list(zip(rest[0::2], rest[1::2]))
+            for game_number, (team1, team2) in enumerate(matchups, 1):
+                score1, score2 = self.score_game(team1.player_ids, team2.player_ids)
+                start = round_start + timedelta(seconds=15)
+                end = start + timedelta(minutes=GAME_MINUTES)
+                finished = start + timedelta(minutes=self.rng.randrange(8, GAME_MINUTES))
+                game = self.stamp(Game({
+                    "tournament_id": tournament_id,
+                    "date": round_start.isoformat(),
+                    "game_number": game_number,
+                    "court": game_number,
+                    "team1_player_ids": team1.player_ids,
+                    "team2_player_ids": team2.player_ids,
+                    "team1_id": str(team1._id),
+                    "team2_id": str(team2._id),
+                    "score1": score1,
+                    "score2": score2,
+                    "status": "finalized",
+                    "start_time": start,
+                    "end_time": end,
+                    "submitted_by": self.rng.choice(team1.player_ids + team2.player_ids),
+                    "is_power_game": team1.is_power_team,
+                    "day_index": day_index,
+                    "round_number": round_number,
+                }), finished)
+                writer.add('games', game)
+                games += 1
+                for team, own, opp in ((team1, score1, score2), (team2, score2, score1)):
+                    team.games_played += 1
+                    team.total_points += own
+                    team.margin_of_victory += own - opp
+                    team.wins += own > opp
+        # Teams are written last so they carry the day's totals, as Team.refresh_stats would leave them
+        for team in teams:
+            writer.add('teams', team)
+        return games
+
+    def run(self, db):
+        args = self.args
+        writer = BulkWriter(db, args.batch_size)
+        start_date = datetime.strptime(args.start_date, '%Y-%m-%d')
+
+        print("Hashing the shared player password...")
+        password_hash = hash_password(args.password)
+        players = self.build_players(writer, password_hash, start_date - timedelta(days=30))
+
+        day_date = start_date
+        for t in range(args.tournaments):
+            is_active = args.active and t == args.tournaments - 1
+            dates = [(day_date + timedelta(weeks=d)).strftime('%Y-%m-%d') for d in range(args.days)]
+            tournament = self.stamp(Tournament({
+                "name": f"Bags & Brats Season {t + 1}",
+                "dates": dates,
+                "start_times": ["18:00"] * args.days,
+                "status": "active" if is_active else "completed",
+                "completed_at": None if is_active else day_date + timedelta(weeks=args.days),
+                "rounds_per_day": args.rounds,
+                "current_day_index": args.days - 1,
+                "current_round": args.rounds,
+            }), day_date - timedelta(days=7))
+            writer.add('tournaments', tournament, generated=True)
+
+            games = 0
+            for day_index, date in enumerate(dates):
+                # 18:00 local start, stored in UTC like the live app (Central time, UTC-5)
+                day_start = datetime.strptime(date, '%Y-%m-%d') + timedelta(hours=23)
+                games += self.build_day(writer, tournament, day_index, day_start, players)
+            print(f"  {tournament.name}: {args.days} days, {games} games")
+            day_date += timedelta(weeks=args.days + args.weeks_between)
+
+        writer.flush()
+        return writer.counts
+
+
+def drop_generated(db):
+    """Delete generated players and tournaments and everything belonging to them."""
+    user_query = {"email": {"$regex": f"@{EMAIL_DOMAIN.replace('.', '[.]')}$"}}
+    user_ids = [str(doc['_id']) for doc in db.users.find(user_query, {"_id": 1})]
+    tournament_ids = [str(doc['_id']) for doc in db.tournaments.find({"generated": True}, {"_id": 1})]
+    for name in ['teams', 'games', 'tournament_results']:
+        result = db[name].delete_many({"tournament_id": {"$in": tournament_ids}})
+        print(f"Dropped {result.deleted_count} generated {name}")
+    result = db.career_stats.delete_many({"_id": {"$in": user_ids}})
+    print(f"Dropped {result.deleted_count} generated career_stats")
+    result = db.tournaments.delete_many({"generated": True})
+    print(f"Dropped {result.deleted_count} generated tournaments")
+    result = db.users.delete_many(user_query)
+    print(f"Dropped {result.deleted_count} generated players")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic dataset.")
+    parser.add_argument('--players', type=int, default=2000)
+    parser.add_argument('--tournaments', type=int, default=3)
+    parser.add_argument('--days', type=int, default=10, help="days per tournament (one per week)")
+    parser.add_argument('--rounds', type=int, default=2, help="rounds per day")
+    parser.add_argument('--power-ratio', type=float, default=0.08, help="fraction of players who are Power Players")
+    parser.add_argument('--weeks-between', type=int, default=4, help="break between tournaments")
+    parser.add_argument('--start-date', default='2024-04-02', help="first tournament day (YYYY-MM-DD)")
+    parser.add_argument('--password', default='password', help="password shared by all generated players")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--batch-size', type=int, default=1000, help="documents per insert_many")
+    parser.add_argument('--active', action='store_true',
+                        help="leave the last tournament active instead of completed")
+    parser.add_argument('--drop', action='store_true',
+                        help="delete previously generated players and tournaments (with their teams and games) first")
+    args = parser.parse_args()
+
+    app = create_app(background_services=False)
+    with app.app_context():
+        if args.drop:
+            drop_generated(mongo.db)
+        if args.active and mongo.db.tournaments.find_one({"status": {"$in": ["upcoming", "active", "blackout"]}}):
+            parser.error("an active tournament already exists; use --drop (if it was generated) or omit --active")
+
+        started = datetime.utcnow()
+        counts = DatasetGenerator(args).run(mongo.db)
+        print("Rolling completed tournaments into career stats...")
+        rebuild_career_stats(mongo)
+        elapsed = (datetime.utcnow() - started).total_seconds()
+        summary = ', '.join(f"{n} {name}" for name, n in counts.items())
+        print(f"✅ Generated {summary} in {elapsed:.1f}s (seed {args.seed})")
+        print(f"   Players log in as <email> / {args.password}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,4 @@
-from app import create_app, mongo, bcrypt
+from app import create_app, mongo
 from app.models import User
 import string
 
@@ -0,0 +1,34 @@
+"""
+Shared fixtures. Tests run against mongomock, an in-memory MongoDB, so no
+server is needed:
+
+    pip install -r requirements-dev.txt
+    python -m pytest
+"""
+import inspect
+from types import SimpleNamespace
+import mongomock
+import mongomock.collection
+import pytest
+
+
+def _accept_sort(add):
+    # pymongo 4.11 passes sort= to the bulk update/replace builders; mongomock 4.x has no such argument
+    def wrapper(self, *args, sort=None, **kwargs):
+        return add(self, *args, **kwargs)
+    return wrapper
+
+
+for _name in ('add_update', 'add_replace'):
+    _add = getattr(mongomock.collection.BulkOperationBuilder, _name)
+    if 'sort' not in inspect.signature(_add).parameters:
+        setattr(mongomock.collection.BulkOperationBuilder, _name, _accept_sort(_add))
+
+
+@pytest.fixture
+def mongo():
+    """Stands in for the app's flask_pymongo client, which the code only uses through .db."""
+    client = mongomock.MongoClient()
+    yield SimpleNamespace(db=client.bags_brats)
+    # mongomock clients share data per host, so each test starts from an empty database
+    client.drop_database('bags_brats')
@@ -0,0 +1,137 @@
+import io
+import time
+from datetime import datetime
+import pytest
+from app import backup
+from app.models import User, Game, Tournament, touch
+
+
+class Upload:
+    """The parts of werkzeug's FileStorage that iter_backup_records reads."""
+
+    def __init__(self, filename, data):
+        self.filename = filename
+        self.stream = io.BytesIO(data)
+
+
+def take_backup(mongo, fmt='json', compress=False, since=None):
+    # Markers are whole milliseconds, and writes in a marker's millisecond are repeated in the
+    # next incremental by design; keep each backup in a millisecond of its own
+    time.sleep(0.002)
+    meta = backup.build_meta('admin', since=since)
+    time.sleep(0.002)
+    chunks, _, ext = backup.stream_backup(mongo, meta, fmt, compress, batch_size=2)
+    return meta, Upload(f"backup.{ext}", b''.join(chunks))
+
+
+def restore(mongo, admin, *uploads):
+    return backup.restore_backup(
+        mongo, [backup.iter_backup_records(u) for u in uploads], str(admin._id), batch_size=2
+    )
+
+
+def contents(mongo):
+    return {
+        name: sorted((doc for doc in mongo.db[name].find()), key=lambda d: str(d['_id']))
+        for name in backup.BACKUP_COLLECTIONS
+    }
+
+
+@pytest.fixture
+def league(mongo):
+    admin = User({'name': 'Admin', 'email': 'admin@example.com', 'role': 'admin'})
+    admin.save(mongo)
+    players = [User({'name': f'Player {i}', 'checked_in_at': datetime(2026, 5, 1, 18, i)}) for i in range(4)]
+    for player in players:
+        player.save(mongo)
+    tournament = Tournament({'name': 'Spring', 'status': 'completed', 'completed_at': datetime(2026, 5, 8)})
+    tournament.save(mongo)
+    game = Game({
+        'tournament_id': str(tournament._id), 'status': 'finalized', 'score1': 21, 'score2': 15,
+        'team1_player_ids': [str(players[0]._id)], 'team2_player_ids': [str(players[1]._id)],
+        'start_time': datetime(2026, 5, 1, 18, 0, 15), 'end_time': datetime(2026, 5, 1, 18, 20, 15),
+    })
+    game.save(mongo)
+    return admin, players, game
+
+
+@pytest.mark.parametrize('fmt,compress', [('json', False), ('json', True), ('ndjson', False), ('ndjson', True)])
+def test_full_backup_round_trip(mongo, league, fmt, compress):
+    admin, players, game = league
+    expected = contents(mongo)
+    _, full = take_backup(mongo, fmt, compress)
+
+    mongo.db.users.delete_one({'_id': players[0]._id})
+    mongo.db.games.update_one({'_id': game._id}, {'$set': {'score1': 0}})
+    meta, stats = restore(mongo, admin, full)
+
+    assert meta['kind'] == 'full'
+    assert stats['games'] == 1
+    restored = contents(mongo)
+    # Restores jump change_version and stamp restored_at; everything else comes back as it was
+    for doc in restored['tournaments'] + expected['tournaments']:
+        doc.pop('change_version')
+        doc.pop('restored_at', None)
+    assert restored == expected
+    # JSON carries datetimes as strings; the restore turns them back
+    assert isinstance(mongo.db.users.find_one({'_id': players[1]._id})['checked_in_at'], datetime)
+    assert isinstance(mongo.db.games.find_one()['end_time'], datetime)
+    assert not [n for n in mongo.db.list_collection_names() if n.startswith('_restore_')]
+
+
+def test_incremental_chain_replays_changes_and_deletions(mongo, league):
+    admin, players, game = league
+    meta0, full = take_backup(mongo)
+
+    players[2].name = 'Renamed'
+    players[2].save(mongo)
+    User.delete_where(mongo, {'_id': players[1]._id})
+    mongo.db.games.update_one({'_id': game._id}, {'$set': touch({'score2': 19})})
+    meta1, first = take_backup(mongo, 'ndjson', True, since=datetime.fromisoformat(meta0['created_at']))
+
+    late = User({'name': 'Late Signup'})
+    late.save(mongo)
+    _, second = take_backup(mongo, since=datetime.fromisoformat(meta1['created_at']))
+
+    expected_users = sorted(str(d['_id']) for d in mongo.db.users.find())
+    mongo.db.users.delete_many({'_id': {'$ne': admin._id}})
+    mongo.db.games.delete_many({})
+
+    meta, _ = restore(mongo, admin, full, first, second)
+
+    assert meta['kind'] == 'incremental'
+    assert sorted(str(d['_id']) for d in mongo.db.users.find()) == expected_users
+    assert mongo.db.users.find_one({'_id': players[1]._id}) is None
+    assert mongo.db.users.find_one({'_id': players[2]._id})['name'] == 'Renamed'
+    assert mongo.db.users.find_one({'_id': late._id}) is not None
+    assert mongo.db.games.find_one({'_id': game._id})['score2'] == 19
+
+
+def test_incremental_backup_only_holds_changes(mongo, league):
+    admin, players, _ = league
+    meta0, _ = take_backup(mongo)
+    players[3].name = 'Changed'
+    players[3].save(mongo)
+    _, incremental = take_backup(mongo, 'ndjson', since=datetime.fromisoformat(meta0['created_at']))
+
+    docs = [r for r in backup.iter_backup_records(incremental) if r[0] == 'doc']
+    assert [(name, str(doc['_id'])) for _, name, doc in docs] == [('users', str(players[3]._id))]
+
+
+def test_restore_rejects_broken_chains(mongo, league):
+    admin, players, _ = league
+    meta0, full = take_backup(mongo)
+    players[0].save(mongo)
+    meta1, first = take_backup(mongo, since=datetime.fromisoformat(meta0['created_at']))
+    players[0].save(mongo)
+    _, second = take_backup(mongo, since=datetime.fromisoformat(meta1['created_at']))
+    before = contents(mongo)
+
+    with pytest.raises(ValueError, match='full backup'):
+        restore(mongo, admin, first)
+    for upload in (full, second):
+        upload.stream.seek(0)
+    with pytest.raises(ValueError, match='gap in the chain'):
+        restore(mongo, admin, full, second)
+    # A rejected chain leaves live data alone
+    assert contents(mongo) == before
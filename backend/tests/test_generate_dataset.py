@@ -0,0 +1,67 @@
+import argparse
+import pytest
+from config import Config
+from app.models import Tournament, User
+from generate_dataset import DatasetGenerator, drop_generated
+
+COLLECTIONS = ['users', 'tournaments', 'teams', 'games']
+
+
+@pytest.fixture(autouse=True)
+def fast_hashing(monkeypatch):
+    monkeypatch.setattr(Config, 'PASSWORD_HASHER', 'bcrypt')
+    monkeypatch.setattr(Config, 'PASSWORD_BCRYPT_ROUNDS', 4)
+
+
+def generate(mongo, seed=3):
+    args = argparse.Namespace(players=60, tournaments=2, days=3, rounds=3, power_ratio=0.1, weeks_between=1,
+                              start_date='2026-04-07', password='pw', seed=seed, batch_size=100, active=True)
+    return DatasetGenerator(args).run(mongo.db)
+
+
+def dump(mongo):
+    # Password hashes are salted per run; everything else follows from the seed
+    return {name: list(mongo.db[name].find({}, {"password_hash": 0}).sort("_id")) for name in COLLECTIONS}
+
+
+def test_league_shape(mongo):
+    counts = generate(mongo)
+
+    for name in COLLECTIONS:
+        assert mongo.db[name].count_documents({}) == counts[name]
+    assert counts['users'] == 60
+    tournament = Tournament.find_active(mongo, persist=False)
+    assert tournament.name == 'Bags & Brats Season 2'
+    assert mongo.db.tournaments.count_documents({"status": "completed", "generated": True}) == 1
+
+    players = {str(u['_id']) for u in mongo.db.users.find({}, {"_id": 1})}
+    for game in mongo.db.games.find():
+        assert game['status'] == 'finalized'
+        assert set(game['team1_player_ids'] + game['team2_player_ids']) <= players
+        assert game['score1'] != game['score2'] and max(game['score1'], game['score2']) >= 21
+        assert game['start_time'] < game['end_time']
+
+
+def test_same_seed_same_documents(mongo):
+    generate(mongo)
+    first = dump(mongo)
+    drop_generated(mongo.db)
+    generate(mongo)
+
+    assert dump(mongo) == first
+
+
+def test_drop_keeps_real_data(mongo):
+    user = User({"name": "Real Player", "email": "real@example.com"})
+    user.save(mongo)
+    tournament = Tournament({"name": "Real League", "status": "completed"})
+    tournament.save(mongo)
+    mongo.db.games.insert_one({"tournament_id": str(tournament._id), "status": "finalized"})
+    generate(mongo)
+
+    drop_generated(mongo.db)
+
+    assert [u['email'] for u in mongo.db.users.find()] == ['real@example.com']
+    assert [t['name'] for t in mongo.db.tournaments.find()] == ['Real League']
+    assert mongo.db.games.count_documents({}) == 1
+    assert mongo.db.teams.count_documents({}) == 0
@@ -0,0 +1,94 @@
+import time
+from app import leader
+from app.leader import Lease
+
+TTL = 0.2  # seconds
+
+
+def expire():
+    time.sleep(TTL + 0.05)
+
+
+def test_first_process_takes_the_lease_and_others_wait(mongo):
+    a, b = Lease(mongo, 'scheduler', TTL), Lease(mongo, 'scheduler', TTL)
+
+    assert a.refresh() is True
+    assert b.refresh() is False
+    assert a.is_leader() and not b.is_leader()
+    stored = mongo.db.leases.find_one({"_id": 'scheduler'})
+    assert stored['holder'] == a.holder
+    assert stored['acquired_at'] == stored['renewed_at']
+
+
+def test_holder_renews_without_reacquiring(mongo):
+    a = Lease(mongo, 'scheduler', TTL)
+    a.refresh()
+    acquired_at = mongo.db.leases.find_one()['acquired_at']
+
+    assert a.refresh() is True
+    assert a.counters['acquired'] == 1 and a.counters['renewed'] == 1
+    assert mongo.db.leases.find_one()['acquired_at'] == acquired_at
+
+
+def test_expired_lease_passes_to_another_process(mongo):
+    a, b = Lease(mongo, 'scheduler', TTL), Lease(mongo, 'scheduler', TTL)
+    a.refresh()
+    b.refresh()
+
+    expire()
+    assert not a.is_leader()  # a's own view lapses even without reaching the database
+    assert b.refresh() is True
+    assert a.refresh() is False
+    assert a.counters['lost'] == 1
+    assert mongo.db.leases.find_one()['holder'] == b.holder
+
+
+def test_release_hands_over_immediately(mongo):
+    a, b = Lease(mongo, 'scheduler', TTL), Lease(mongo, 'scheduler', TTL)
+    a.refresh()
+
+    b.release()  # not the holder: no effect
+    assert b.refresh() is False
+    a.release()
+    assert not a.is_leader()
+    assert b.refresh() is True
+
+
+def test_leases_are_independent_by_name(mongo):
+    a, b = Lease(mongo, 'scheduler', TTL), Lease(mongo, 'reports', TTL)
+
+    assert a.refresh() and b.refresh()
+
+
+def test_leader_only_runs_jobs_on_the_holder(mongo):
+    a, b = Lease(mongo, 'scheduler', TTL), Lease(mongo, 'scheduler', TTL)
+    a.refresh()
+    b.refresh()
+    ran = []
+    job_a = a.leader_only(lambda: ran.append('a'))
+    job_b = b.leader_only(lambda: ran.append('b'))
+
+    job_a()
+    job_b()
+    assert ran == ['a']
+    assert (a.counters['jobs_run'], b.counters['jobs_skipped']) == (1, 1)
+
+    expire()
+    b.refresh()
+    job_a()
+    job_b()
+    assert ran == ['a', 'b']
+
+
+def test_lease_status_reports_holder_and_expiry(mongo, monkeypatch):
+    a = Lease(mongo, 'scheduler', TTL)
+    a.refresh()
+    monkeypatch.setattr(leader, 'current_lease', a)
+
+    status = leader.lease_status(mongo, 'scheduler')
+    assert status['lease']['holder'] == a.holder
+    assert status['lease']['expired'] is False
+    assert status['this_process']['is_leader'] is True
+
+    expire()
+    assert leader.lease_status(mongo, 'scheduler')['lease']['expired'] is True
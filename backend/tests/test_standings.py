@@ -0,0 +1,83 @@
+import pytest
+from app.models import Tournament, Game
+from app.utils import compute_standings
+
+
+def reference_standings(mongo, tournament):
+    """Standings reduced game by game, as /tournaments/standings computed them before the game store."""
+    standings = {}
+    for game in mongo.db.games.find({"tournament_id": str(tournament._id), "status": "finalized"}):
+        team1 = [str(pid) for pid in game['team1_player_ids']]
+        for pid in team1 + [str(pid) for pid in game['team2_player_ids']]:
+            own, opp = (game['score1'], game['score2']) if pid in team1 else (game['score2'], game['score1'])
+            row = standings.setdefault(pid, {"user_id": pid, "wins": 0, "games_played": 0, "total_points": 0,
+                                             "margin": 0, "daily_stats": {}})
+            day = row["daily_stats"].setdefault(game.get('day_index', 0), {
+                "day_index": game.get('day_index', 0), "wins": 0, "games_played": 0, "total_points": 0, "margin": 0
+            })
+            for totals in (row, day):
+                totals["games_played"] += 1
+                totals["total_points"] += own
+                totals["margin"] += own - opp
+                totals["wins"] += own > opp
+    for row in standings.values():
+        row["daily_stats"] = sorted(row["daily_stats"].values(), key=lambda d: d["day_index"])
+    return sorted(standings.values(),
+                  key=lambda x: (x['total_points'], x['wins'], x['margin'], -x['games_played']), reverse=True)
+
+
+def sort_key(row):
+    return (row['total_points'], row['wins'], row['margin'], -row['games_played'])
+
+
+def assert_same_standings(actual, expected):
+    # Players tied on every key may come back in either order; the keys must line up and the rows match
+    assert [sort_key(r) for r in actual] == [sort_key(r) for r in expected]
+    by_id = {r['user_id']: r for r in expected}
+    for row in actual:
+        assert {k: v for k, v in row.items() if k != 'name'} == by_id[row['user_id']]
+
+
+def add_game(mongo, tournament, team1, team2, score1, score2, day_index=0, status='finalized'):
+    Game({
+        "tournament_id": str(tournament._id), "team1_player_ids": team1, "team2_player_ids": team2,
+        "score1": score1, "score2": score2, "day_index": day_index, "status": status,
+    }).save(mongo)
+
+
+@pytest.fixture
+def tournament(mongo):
+    tournament = Tournament({"name": "Spring", "status": "active", "dates": ["2026-05-01", "2026-05-08"]})
+    tournament.save(mongo)
+    return tournament
+
+
+def test_tiebreaks_points_then_wins_then_margin_then_fewest_games(mongo, tournament):
+    # a: 21 points, 1 win. b: 21 points, 0 wins. c/d: 21 points and 1 win each, c with the better margin.
+    add_game(mongo, tournament, ['a'], ['x'], 21, 20)
+    add_game(mongo, tournament, ['b'], ['y'], 21, 21)
+    add_game(mongo, tournament, ['c'], ['z'], 21, 0)
+    add_game(mongo, tournament, ['d'], ['w'], 21, 10)
+    # e matches c's points, wins and margin over two games; the fewer games ranks first
+    add_game(mongo, tournament, ['e'], ['v'], 21, 0, day_index=1)
+    add_game(mongo, tournament, ['e'], ['u'], 0, 0, day_index=1)
+    # Active games do not count
+    add_game(mongo, tournament, ['b'], ['a'], 21, 0, status='active')
+
+    standings = compute_standings(mongo, Tournament.find_active(mongo))
+
+    assert [r['user_id'] for r in standings][:5] == ['c', 'e', 'd', 'a', 'b']
+    assert_same_standings(standings, reference_standings(mongo, tournament))
+
+
+def test_standings_follow_corrections(mongo, tournament):
+    add_game(mongo, tournament, ['a'], ['b'], 21, 5)
+    assert compute_standings(mongo, Tournament.find_active(mongo))[0]['user_id'] == 'a'
+
+    game = mongo.db.games.find_one()
+    Game(dict(game, score1=5, score2=21)).save(mongo)
+    standings = compute_standings(mongo, Tournament.find_active(mongo))
+
+    assert standings[0]['user_id'] == 'b'
+    assert_same_standings(standings, reference_standings(mongo, tournament))
+
@@ -0,0 +1,65 @@
+import pytest
+from app.models import User
+
+
+def page_through(mongo, query, limit):
+    pages = []
+    cursor = None
+    while True:
+        docs, cursor = User.list_page(mongo, query, {"name": 1}, limit, cursor)
+        pages.append([d['name'] for d in docs])
+        if cursor is None:
+            return pages
+
+
+def page_through_from(mongo, cursor, limit):
+    names = []
+    while cursor:
+        docs, cursor = User.list_page(mongo, {}, {"name": 1}, limit, cursor)
+        names += [d['name'] for d in docs]
+    return names
+
+
+@pytest.fixture
+def roster(mongo):
+    # Duplicate names force the _id tiebreak at page boundaries
+    names = ['Avery', 'Blake', 'Blake', 'Blake', 'Casey', 'Drew', 'Drew', 'Emery', 'Finley']
+    for name in names:
+        mongo.db.users.insert_one({"name": name, "role": "player" if name != 'Casey' else "admin"})
+    return sorted(names)
+
+
+@pytest.mark.parametrize('limit', [1, 2, 3, 4, 9, 10])
+def test_pages_cover_every_user_once_in_name_order(mongo, roster, limit):
+    pages = page_through(mongo, {}, limit)
+
+    assert [name for page in pages for name in page] == roster
+    assert all(len(page) == limit for page in pages[:-1])
+    assert 0 < len(pages[-1]) <= limit
+
+
+def test_last_page_has_no_cursor(mongo, roster):
+    docs, cursor = User.list_page(mongo, {}, {"name": 1}, len(roster), None)
+
+    assert len(docs) == len(roster)
+    assert cursor is None
+
+
+def test_cursor_pages_respect_the_filter(mongo, roster):
+    pages = page_through(mongo, {"role": "player"}, 2)
+
+    assert [name for page in pages for name in page] == [n for n in roster if n != 'Casey']
+
+
+def test_cursor_stays_stable_when_earlier_users_are_added(mongo, roster):
+    first, cursor = User.list_page(mongo, {}, {"name": 1}, 3, None)
+    mongo.db.users.insert_one({"name": "Aaron"})
+    rest = page_through_from(mongo, cursor, 3)
+
+    assert [d['name'] for d in first] + rest == roster
+
+
+@pytest.mark.parametrize('cursor', ['not-a-cursor', 'W10', 'WyJCbGFrZSIsICJ4Il0'])
+def test_malformed_cursor_raises_value_error(mongo, roster, cursor):
+    with pytest.raises(ValueError):
+        User.list_page(mongo, {}, {"name": 1}, 2, cursor)
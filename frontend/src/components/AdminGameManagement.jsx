@@ -71,13 +71,21 @@ const AdminGameManagement = () => {
     const [editingGame, setEditingGame] = useState(null);
     const [editData, setEditData] = useState({ score1: 0, score2: 0, status: '' });
 
+    // The swap picker only needs names, so page through a minimal projection
     const fetchAllUsers = async () => {
         try {
             const token = localStorage.getItem('token');
-            const res = await axios.get(`${API_URL}/admin/users`, {
-                headers: { Authorization: `Bearer ${token}` }
-            });
-            setAllUsers(res.data);
+            const users = [];
+            let cursor = null;
+            do {
+                const res = await axios.get(`${API_URL}/admin/users`, {
+                    headers: { Authorization: `Bearer ${token}` },
+                    params: { fields: 'name', limit: 500, ...(cursor ? { cursor } : {}) }
+                });
+                users.push(...res.data.users);
+                cursor = res.data.next_cursor;
+            } while (cursor);
+            setAllUsers(users);
         } catch (err) {
             console.error('Failed to fetch users for swap', err);
         }
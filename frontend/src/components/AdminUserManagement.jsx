@@ -19,6 +19,10 @@ const AdminUserManagement = () => {
     const [editSaving, setEditSaving] = useState(false);
     const [historyLoading, setHistoryLoading] = useState(false);
     const [printUsers, setPrintUsers] = useState(false);
+    const [search, setSearch] = useState('');
+    const [filters, setFilters] = useState({ checked_in: '', has_paid: '', is_power_player: '', role: '' });
+    const [nextCursor, setNextCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     useEffect(() => {
         const handleAfterPrint = () => {
@@ -100,19 +104,51 @@ const AdminUserManagement = () => {
         return `${formattedDate} (Future) — ${planText}`;
     };
 
-    const fetchUsers = async () => {
+    const PAGE_SIZE = 100;
+
+    const buildUserParams = () => {
+        const params = {};
+        if (search.trim()) params.q = search.trim();
+        Object.entries(filters).forEach(([key, value]) => {
+            if (value !== '') params[key] = value;
+        });
+        return params;
+    };
+
+    // Reloads from the first page; by default keeps as many rows as are already shown
+    const fetchUsers = async (keepLoaded = true) => {
         try {
             const token = localStorage.getItem('token');
             const res = await axios.get(`${API_URL}/admin/users`, {
-                headers: { Authorization: `Bearer ${token}` }
+                headers: { Authorization: `Bearer ${token}` },
+                params: { ...buildUserParams(), limit: keepLoaded ? Math.max(users.length, PAGE_SIZE) : PAGE_SIZE }
             });
-            setUsers(res.data);
+            setUsers(res.data.users);
+            setNextCursor(res.data.next_cursor);
             setLoading(false);
         } catch (err) {
             console.error("Failed to fetch users", err);
         }
     };
 
+    const fetchMoreUsers = async () => {
+        if (!nextCursor) return;
+        setLoadingMore(true);
+        try {
+            const token = localStorage.getItem('token');
+            const res = await axios.get(`${API_URL}/admin/users`, {
+                headers: { Authorization: `Bearer ${token}` },
+                params: { ...buildUserParams(), limit: PAGE_SIZE, cursor: nextCursor }
+            });
+            setUsers(prev => [...prev, ...res.data.users]);
+            setNextCursor(res.data.next_cursor);
+        } catch (err) {
+            console.error("Failed to fetch more users", err);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const fetchPlayerHistory = async (user) => {
         setSelectedPlayer(user);
         setHistoryLoading(true);
@@ -163,10 +199,15 @@ const AdminUserManagement = () => {
     };
 
     useEffect(() => {
-        fetchUsers();
         fetchActiveTournament();
     }, []);
 
+    // Search and filters run server-side; debounce typing before refetching
+    useEffect(() => {
+        const timer = setTimeout(() => fetchUsers(false), 300);
+        return () => clearTimeout(timer);
+    }, [search, filters]);
+
     const toggleCheckIn = async (userId, currentStatus) => {
         try {
             const token = localStorage.getItem('token');
@@ -424,6 +465,35 @@ const AdminUserManagement = () => {
                 </div>
             </div>
 
+            <div style={{ display: 'flex', gap: '12px', flexWrap: 'wrap', marginBottom: '16px' }}>
+                <input
+                    type="text"
+                    className="input-field"
+                    placeholder="Search name or email..."
+                    value={search}
+                    onChange={(e) => setSearch(e.target.value)}
+                    style={{ marginBottom: 0, flex: '1 1 240px' }}
+                />
+                {[
+                    { key: 'checked_in', label: 'Status', options: [['true', 'Present'], ['false', 'Absent']] },
+                    { key: 'has_paid', label: 'Paid', options: [['true', 'Paid'], ['false', 'Unpaid']] },
+                    { key: 'is_power_player', label: 'Power', options: [['true', 'Power Players'], ['false', 'Regular']] },
+                    { key: 'role', label: 'Role', options: [['player', 'Players'], ['admin', 'Admins']] }
+                ].map(({ key, label, options }) => (
+                    <select
+                        key={key}
+                        value={filters[key]}
+                        onChange={(e) => setFilters({ ...filters, [key]: e.target.value })}
+                        style={{ padding: '8px 12px', background: 'rgba(255,255,255,0.05)', color: 'var(--text)', border: '1px solid var(--border)', borderRadius: '8px', fontSize: '13px' }}
+                    >
+                        <option value="" style={{ background: 'var(--bg)' }}>{label}: All</option>
+                        {options.map(([value, text]) => (
+                            <option key={value} value={value} style={{ background: 'var(--bg)' }}>{text}</option>
+                        ))}
+                    </select>
+                ))}
+            </div>
+
             <div style={{ overflowX: 'auto' }}>
                 <table style={{ width: '100%', borderCollapse: 'collapse' }}>
                     <thead>
@@ -635,6 +705,14 @@ const AdminUserManagement = () => {
                 </table>
             </div>
 
+            {nextCursor && (
+                <div style={{ textAlign: 'center', marginTop: '16px' }}>
+                    <button onClick={fetchMoreUsers} disabled={loadingMore} className="btn-secondary" style={{ padding: '8px 16px', fontSize: '13px' }}>
+                        {loadingMore ? 'Loading...' : 'Load More'}
+                    </button>
+                </div>
+            )}
+
             {/* Player History Modal */}
             {selectedPlayer && (
                 <div
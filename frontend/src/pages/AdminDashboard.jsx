@@ -44,31 +44,14 @@ const AdminDashboard = () => {
     const handleDownloadCSV = async (dayIndex) => {
         try {
             const token = localStorage.getItem('token');
-            const res = await axios.get(`${API_URL}/admin/tournament/daily-backup?day_index=${dayIndex}`, {
-                headers: { Authorization: `Bearer ${token}` }
-            });
-            const data = res.data;
-            
-            // Build CSV rows
-            const csvRows = [];
-            // Header information
-            csvRows.push(`"Bags & Brats Cornhole Tournament Day ${data.day_number} Record Backup"`);
-            csvRows.push(`"Date: ${data.date}"`);
-            csvRows.push(`"Exported: ${new Date().toLocaleString()}"`);
-            csvRows.push(""); // Empty line
-            
-            // Table headers
-            csvRows.push("Rank,Player Name,Round 1,Round 2,Day Wins,Day Points,Aggregate Wins,Aggregate Games Played,Aggregate Points");
-            
-            // Table rows
-            data.players.forEach((p, idx) => {
-                const r1 = p.daily_scores[0]?.score || "-";
-                const r2 = p.daily_scores[1]?.score || "-";
-                csvRows.push(`${idx + 1},"${p.name}",${r1},${r2},${p.daily_wins},${p.daily_points},${p.aggregate_wins},${p.aggregate_games_played},${p.aggregate_points}`);
+            // The server streams the finished CSV sheet (all rounds included)
+            const res = await axios.get(`${API_URL}/admin/tournament/daily-backup?day_index=${dayIndex}&format=csv`, {
+                headers: { Authorization: `Bearer ${token}` },
+                responseType: 'blob'
             });
             
             // Trigger browser download via blob
-            const blob = new Blob([csvRows.join("\n")], { type: 'text/csv;charset=utf-8;' });
+            const blob = new Blob([res.data], { type: 'text/csv;charset=utf-8;' });
             const url = URL.createObjectURL(blob);
             const link = document.createElement("a");
             link.setAttribute("href", url);
@@ -76,6 +59,7 @@ const AdminDashboard = () => {
             document.body.appendChild(link);
             link.click();
             document.body.removeChild(link);
+            URL.revokeObjectURL(url);
             showToast("Daily backup CSV exported successfully!", "success");
         } catch (err) {
             console.error("Failed to download CSV", err);
@@ -134,8 +118,8 @@ const AdminDashboard = () => {
         // Reset so the same file can be re-selected
         e.target.value = '';
 
-        if (!file.name.endsWith('.json')) {
-            showToast('Please select a .json backup file.', 'error');
+        if (!/\.((json|ndjson)(\.gz)?|tar)$/.test(file.name)) {
+            showToast('Please select a .json, .ndjson, .gz or .tar backup file.', 'error');
             return;
         }
 
@@ -674,7 +658,7 @@ const AdminDashboard = () => {
 
                                 <input
                                     type="file"
-                                    accept=".json"
+                                    accept=".json,.ndjson,.gz,.tar"
                                     ref={restoreFileRef}
                                     onChange={handleDbRestore}
                                     style={{ display: 'none' }}
@@ -144,6 +144,8 @@ const DisplayView = () => {
     });
 
     const serverOffsetRef = useRef(0);
+    const tournamentRef = useRef(null);
+    useEffect(() => { tournamentRef.current = tournament; }, [tournament]);
 
     const playDoubleBeep = () => {
         try {
@@ -285,6 +287,7 @@ const DisplayView = () => {
                     serverOffsetRef.current = serverTimeMs - clientTimeMs;
                 }
                 SocketService.connect(tRes.data._id);
+                SocketService.joinScoreFeed(tRes.data._id);
                 const gRes = await axios.get(`${API_URL}/tournaments/active/games`);
                 setGames(gRes.data);
             }
@@ -303,11 +306,39 @@ const DisplayView = () => {
         SocketService.on('standings_updated', fetchData);
         SocketService.on('pairings_revealed', fetchData);
         
-        SocketService.on('live_score_updated', (data) => {
+        // Sent on (re)joining the tournament room: everything, or only what changed since our last one.
+        // A snapshot only holds the current round's games, so it never touches games of other rounds.
+        const handleSnapshot = (snapshot) => {
+            if (!snapshot.tournament) return;
+            setTournament(prev => prev ? { ...prev, ...snapshot.tournament } : prev);
+            const round = { ...tournamentRef.current, ...snapshot.tournament };
+            const inRound = (g) =>
+                g.day_index === round.current_day_index && g.round_number === round.current_round;
+            const updated = Object.fromEntries(snapshot.games.map(g => [g._id, g]));
+            const removed = new Set(snapshot.removed_game_ids || []);
+            setGames(prevGames => {
+                // A full snapshot replaces the round's games; a diff removes only the round's deleted ones
+                const kept = prevGames.filter(g =>
+                    !updated[g._id] && !(inRound(g) && (snapshot.full || removed.has(g._id)))
+                );
+                return [...kept, ...snapshot.games];
+            });
+        };
+        SocketService.on('tournament_snapshot', handleSnapshot);
+
+        // Just the tournament fields that changed (sent when the event bus is enabled)
+        const handleTournamentUpdated = (fields) => {
+            setTournament(prev => prev && prev._id === fields._id ? { ...prev, ...fields } : prev);
+        };
+        SocketService.on('tournament_updated', handleTournamentUpdated);
+
+        // Every station's latest scores, batched every couple of seconds
+        SocketService.on('live_scores', (scores) => {
+            const byGame = Object.fromEntries(scores.map(s => [s.game_id, s]));
             setGames(prevGames => 
                 prevGames.map(g => 
-                    g._id === data.game_id 
-                        ? { ...g, score1: data.score1, score2: data.score2 } 
+                    byGame[g._id] 
+                        ? { ...g, score1: byGame[g._id].score1, score2: byGame[g._id].score2 } 
                         : g
                 )
             );
@@ -317,7 +348,9 @@ const DisplayView = () => {
             clearInterval(pollInterval);
             SocketService.off('standings_updated', fetchData);
             SocketService.off('pairings_revealed', fetchData);
-            SocketService.off('live_score_updated');
+            SocketService.off('live_scores');
+            SocketService.off('tournament_snapshot', handleSnapshot);
+            SocketService.off('tournament_updated', handleTournamentUpdated);
         };
     }, []);
 
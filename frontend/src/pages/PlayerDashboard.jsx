@@ -203,104 +203,88 @@ const PlayerDashboard = () => {
     };
 
     useEffect(() => {
+        let socketTournamentId = null;
+
+        const handleLiveScore = (data) => {
+            // Keep teammates in sync without re-fetching the API
+            const currentG = currentGameRef.current;
+            const currentUser = userRef.current;
+            if (currentG && data.game_id === currentG._id) {
+                // Update currentGame locally in state
+                setCurrentGame(prev => prev ? { ...prev, score1: data.score1, score2: data.score2 } : null);
+
+                // Sync local user track scores if they haven't tapped recently
+                if (Date.now() - lastTapRef.current >= 2000) {
+                    const userId = currentUser.id || currentUser._id;
+                    const isOnTeam1 = currentG.team1_player_ids?.includes(userId);
+                    const serverScore1 = isOnTeam1 ? data.score1 : data.score2;
+                    const serverScore2 = isOnTeam1 ? data.score2 : data.score1;
+
+                    setScore1(serverScore1);
+                    setScore2(serverScore2);
+                    sessionStorage.setItem('bb_score1', serverScore1.toString());
+                    sessionStorage.setItem('bb_score2', serverScore2.toString());
+                }
+            }
+        };
+
+        // The server sends this player's own game on pairing, round start and finalize
+        const handlePlayerGame = (game) => {
+            if (!game || game.status === 'finalized') {
+                // Game over (or removed): refresh stats and day summary
+                fetchData();
+                return;
+            }
+            if (game.server_time) {
+                serverOffsetRef.current = new Date(game.server_time).getTime() - Date.now();
+            }
+            setCurrentGame(game);
+            if (game.status === 'active') {
+                setActiveTab('live');
+            }
+        };
+
+        // One round trip for user, tournament, current game, day summary and standings
         const fetchData = async () => {
             try {
                 const token = localStorage.getItem('token');
-
-                // Fetch fresh user data to sync check-in status
-                const uRes = await axios.get(`${API_URL}/auth/me`, {
+                const res = await axios.get(`${API_URL}/player/dashboard`, {
                     headers: { Authorization: `Bearer ${token}` }
                 });
-                setUser(uRes.data);
-                setCheckedIn(uRes.data.checked_in);
-                setSchedule(uRes.data.attendance_schedule || {});
-
-                const tRes = await axios.get(`${API_URL}/tournaments/active`, {
-                    headers: { Authorization: `Bearer ${token}` }
-                });
-                setTournament(tRes.data);
-                if (tRes.data && tRes.data.server_time) {
-                    const serverTimeMs = new Date(tRes.data.server_time).getTime();
-                    const clientTimeMs = Date.now();
-                    serverOffsetRef.current = serverTimeMs - clientTimeMs;
-                }
-
-                if (tRes.data) {
-                    SocketService.connect(tRes.data._id);
-                    SocketService.on('pairings_revealed', (pairings) => {
-                        const userId = uRes.data.id || uRes.data._id;
-                        const myPair = pairings.find(p =>
-                            p.team1_player_ids.includes(userId) ||
-                            p.team2_player_ids.includes(userId)
-                        );
-                        if (myPair) {
-                            setCurrentGame(myPair);
-                            if (myPair.status === 'active') {
-                                setActiveTab('live');
-                            }
-                        }
-                    });
+                const { user: me, tournament: activeTournament, current_game: game, day_summary: summary, standings } = res.data;
+
+                userRef.current = me;
+                setUser(me);
+                setCheckedIn(me.checked_in);
+                setSchedule(me.attendance_schedule || {});
+                setTournament(activeTournament);
+                serverOffsetRef.current = new Date(res.data.server_time).getTime() - Date.now();
+
+                if (activeTournament && socketTournamentId !== activeTournament._id) {
+                    socketTournamentId = activeTournament._id;
+                    SocketService.connect(activeTournament._id, localStorage.getItem('token'));
+                    SocketService.on('player_game', handlePlayerGame);
+                    SocketService.on('live_score_updated', handleLiveScore);
                 }
 
-                // Fetch current game (active or upcoming)
-                const gRes = await axios.get(`${API_URL}/player/current-game`, {
-                    headers: { Authorization: `Bearer ${token}` }
-                });
-                if (gRes.data) {
-                    setCurrentGame(gRes.data);
-                    if (gRes.data.server_time) {
-                        const serverTimeMs = new Date(gRes.data.server_time).getTime();
-                        const clientTimeMs = Date.now();
-                        serverOffsetRef.current = serverTimeMs - clientTimeMs;
-                    }
-                    if (gRes.data.status === 'active') {
+                // Current game (active or upcoming)
+                if (game) {
+                    setCurrentGame(game);
+                    if (game.status === 'active') {
                         setActiveTab('live');
                     }
                 } else {
                     setCurrentGame(null);
                 }
 
+                setDaySummary(summary);
 
-                // Fetch day summary for session state
-                const dsRes = await axios.get(`${API_URL}/player/day-summary`, {
-                    headers: { Authorization: `Bearer ${token}` }
-                });
-                setDaySummary(dsRes.data);
-
-                // Fetch stats for personal view
-                const sRes = await axios.get(`${API_URL}/tournaments/standings`);
-                const userId = uRes.data.id || uRes.data._id;
-                const me = sRes.data.find(s => s.user_id === userId);
-                if (me) {
-                    setMyStats({ wins: me.wins, points: me.total_points });
+                // Stats for personal view
+                const userId = me.id || me._id;
+                const myRow = standings.rows.find(s => s.user_id === userId);
+                if (myRow) {
+                    setMyStats({ wins: myRow.wins, points: myRow.total_points });
                 }
-
-                // Listen for updates to refresh data
-                SocketService.on('standings_updated', fetchData);
-
-                // Listen for real-time live score updates to keep teammates in sync without re-fetching API
-                SocketService.on('live_score_updated', (data) => {
-                    const currentG = currentGameRef.current;
-                    const currentUser = userRef.current;
-                    if (currentG && data.game_id === currentG._id) {
-                        // Update currentGame locally in state
-                        setCurrentGame(prev => prev ? { ...prev, score1: data.score1, score2: data.score2 } : null);
-
-                        // Sync local user track scores if they haven't tapped recently
-                        if (Date.now() - lastTapRef.current >= 2000) {
-                            const userId = currentUser.id || currentUser._id;
-                            const isOnTeam1 = currentG.team1_player_ids?.includes(userId);
-                            const serverScore1 = isOnTeam1 ? data.score1 : data.score2;
-                            const serverScore2 = isOnTeam1 ? data.score2 : data.score1;
-
-                            setScore1(serverScore1);
-                            setScore2(serverScore2);
-                            sessionStorage.setItem('bb_score1', serverScore1.toString());
-                            sessionStorage.setItem('bb_score2', serverScore2.toString());
-                        }
-                    }
-                });
-
             } catch (err) {
                 console.error("Dashboard fetch error", err);
             }
@@ -308,12 +292,19 @@ const PlayerDashboard = () => {
         fetchData();
 
         return () => {
-            SocketService.off('standings_updated', fetchData);
-            SocketService.off('live_score_updated');
+            SocketService.off('player_game', handlePlayerGame);
+            SocketService.off('live_score_updated', handleLiveScore);
             SocketService.disconnect();
         };
     }, []);
 
+    // Teammates' live scores arrive through the game's station room
+    useEffect(() => {
+        if (tournament && currentGame) {
+            SocketService.joinStation(tournament._id, currentGame.court || currentGame.game_number);
+        }
+    }, [tournament?._id, currentGame?._id]);
+
     // Show Power Player toast after 12 seconds for non-Power Players if not dismissed
     useEffect(() => {
         if (user && !user.is_power_player) {
@@ -137,10 +137,13 @@ const SpectatorView = () => {
         SocketService.on('standings_updated', fetchData);
         SocketService.on('pairings_revealed', fetchData);
         SocketService.on('blackout_status', (data) => setBlackout(data.is_blackout));
+        // Schedule, round and status changes (sent when the event bus is enabled)
+        SocketService.on('tournament_updated', fetchData);
 
         return () => {
             SocketService.off('standings_updated', fetchData);
             SocketService.off('pairings_revealed', fetchData);
+            SocketService.off('tournament_updated', fetchData);
         };
     }, []);
 
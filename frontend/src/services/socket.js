@@ -6,29 +6,65 @@ const SOCKET_URL = API_URL;
 class SocketService {
     constructor() {
         this.socket = null;
+        this.station = null;
+        this.scoreFeed = null;
+        this.version = null;
+        this.pending = [];
     }
 
-    connect(tournamentId) {
+    // Pass the player's JWT to also receive their own game ('player_game') in their user room.
+    // Spectator screens connect anonymously.
+    connect(tournamentId, token = null) {
         if (this.socket) return;
 
-        this.socket = io(SOCKET_URL);
+        this.socket = io(SOCKET_URL, token ? { auth: { token } } : {});
 
         this.socket.on('connect', () => {
             console.log('Connected to socket server');
-            this.socket.emit('join_tournament', { tournament_id: tournamentId });
+            // The server replies with a tournament_snapshot; after a reconnect, only what changed
+            this.socket.emit('join_tournament', { tournament_id: tournamentId, last_seen_version: this.version });
+            // Rooms are lost on reconnect; rejoin the ones asked for
+            if (this.station) this.socket.emit('join_station', this.station);
+            if (this.scoreFeed) this.socket.emit('join_score_feed', this.scoreFeed);
+        });
+
+        this.socket.on('tournament_snapshot', (snapshot) => {
+            this.version = snapshot.version;
         });
 
         this.socket.on('disconnect', () => {
             console.log('Disconnected from socket server');
         });
+
+        this.pending.forEach(([event, callback]) => this.socket.on(event, callback));
+        this.pending = [];
+    }
+
+    // Follow one station's live score and start/finalize ('live_score_updated', 'station_game')
+    joinStation(tournamentId, station) {
+        const next = { tournament_id: tournamentId, station };
+        if (this.station && this.station.tournament_id === tournamentId && this.station.station === station) return;
+        this.station = next;
+        if (this.socket && this.socket.connected) this.socket.emit('join_station', next);
     }
 
+    // Batched live scores for every station ('live_scores'), for big-screen displays
+    joinScoreFeed(tournamentId) {
+        this.scoreFeed = { tournament_id: tournamentId };
+        if (this.socket && this.socket.connected) this.socket.emit('join_score_feed', this.scoreFeed);
+    }
+
+    // Listeners added before connect() are attached once the socket exists
     on(event, callback) {
-        if (!this.socket) return;
+        if (!this.socket) {
+            this.pending.push([event, callback]);
+            return;
+        }
         this.socket.on(event, callback);
     }
 
     off(event, callback) {
+        this.pending = this.pending.filter(([e, cb]) => e !== event || (callback && cb !== callback));
         if (!this.socket) return;
         this.socket.off(event, callback);
     }
@@ -37,6 +73,9 @@ class SocketService {
         if (this.socket) {
             this.socket.disconnect();
             this.socket = null;
+            this.station = null;
+            this.scoreFeed = null;
+            this.version = null;
         }
     }
 }